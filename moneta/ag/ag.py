@@ -1,6 +1,8 @@
 import pandas as pd
 import numpy as np
 from ces.ces import ces_retornos, ces_riscos, ces_fitnesses
+from ag.selecao import selecionar_pares
+from ag.perfilador import Perfilador, PERFILADOR_NULO
 from sklearn import preprocessing
 
 
@@ -52,20 +54,22 @@ def gerar_nova_geracao(acoes: list, medias: pd.Series, matriz_covariancia: pd.Da
     return df_nova_geracao
 
 
-def mutacao_dois(acoes: list, cromossomo_filho: pd.Series) -> pd.Series:
+def mutacao_dois(acoes: list, cromossomo_filho: pd.Series,
+                 gerador: np.random.Generator) -> pd.Series:
     """
     Função que realiza a mutação do tipo dois em um cromossomo filho.
 
     Args:
     - acoes: lista com os nomes dos ativos
     - cromossomo_filho: cromossomo filho gerado no cruzamento
+    - gerador: gerador de números aleatórios (np.random.Generator)
 
     Returns:
     - mutante_a: cromossomo mutante gerado na mutação
     - mutante_b: outro cromossomo mutante gerado na mutação
     """
 
-    genes_sorteados = np.random.choice(acoes, size=2, replace=False)
+    genes_sorteados = gerador.choice(acoes, size=2, replace=False)
     soma_genes = cromossomo_filho.loc[genes_sorteados].sum()
     mutante_a = cromossomo_filho.copy()
     mutante_a.loc[genes_sorteados[0]] = soma_genes
@@ -76,23 +80,26 @@ def mutacao_dois(acoes: list, cromossomo_filho: pd.Series) -> pd.Series:
     mutante_b.loc[genes_sorteados[1]] = soma_genes
     return mutante_a,mutante_b
 
-def mutacao_um(acoes: list, cromossomo_filho: pd.Series) -> pd.Series:
+def mutacao_um(acoes: list, cromossomo_filho: pd.Series,
+               gerador: np.random.Generator) -> pd.Series:
     """
     Função que realiza a mutação do tipo um em um cromossomo filho.
 
     Args:
     - acoes: lista com os nomes dos ativos
     - cromossomo_filho: cromossomo filho gerado no cruzamento
+    - gerador: gerador de números aleatórios (np.random.Generator)
     """
 
-    genes_sorteados = np.random.choice(acoes, size=2, replace=False)
+    genes_sorteados = gerador.choice(acoes, size=2, replace=False)
     mutante = cromossomo_filho.copy()
     mutante.loc[genes_sorteados] = \
                 cromossomo_filho.loc[genes_sorteados].iloc[::-1].values
         
     return mutante
 
-def crossover(acoes: list, cromossomo_pai: pd.Series, cromossomo_mae: pd.Series) -> pd.Series:
+def crossover(acoes: list, cromossomo_pai: pd.Series, cromossomo_mae: pd.Series,
+              gerador: np.random.Generator) -> pd.Series:
 
     """
     Função que realiza o cruzamento entre dois cromossomos.
@@ -101,72 +108,53 @@ def crossover(acoes: list, cromossomo_pai: pd.Series, cromossomo_mae: pd.Series)
     - acoes: lista com os nomes dos ativos
     - cromossomo_pai: cromossomo pai
     - cromossomo_mae: cromossomo mãe
+    - gerador: gerador de números aleatórios (np.random.Generator)
 
     Returns:
     - cromossomo_filho: cromossomo filho gerado no cruzamento
     """
 
-    al = np.random.rand()
+    al = gerador.random()
     parte_genes_pai = al * cromossomo_pai.loc[acoes]
     parte_genes_mae = (1 - al) * cromossomo_mae.loc[acoes]
     cromossomo_filho = parte_genes_mae + parte_genes_pai
     return cromossomo_filho
 
-def roda_do_acaso(cromossomos_sorteados: pd.DataFrame) -> tuple[pd.Series, pd.Series]:
+def roda_do_acaso(cromossomos_sorteados: pd.DataFrame, gerador: np.random.Generator,
+                  selecao: str = "roleta",
+                  tamanho_torneio: int = 3) -> tuple[pd.Series, pd.Series]:
     """
     Função que realiza a roda do acaso para selecionar os cromossomos pais.
 
     Args:
     - cromossomos_sorteados: DataFrame com os cromossomos sorteados
+    - gerador: gerador de números aleatórios (np.random.Generator)
+    - selecao: método de seleção ('roleta', 'torneio' ou 'sus'), ver ag.selecao
+    - tamanho_torneio: quantidade de cromossomos em cada torneio
 
     Returns:
     - cromossomo_pai: cromossomo pai
     - cromossomo_mae: cromossomo mãe
     """
 
-    # gera um series com as percentagens relativas
-    # 0.2, 0.45, 0.05, 0.10, 0.15, 0.05
-    percentagens_relativas_fitnesses = \
-                cromossomos_sorteados.loc[:, "Fitnesses"] / \
-                    cromossomos_sorteados.loc[:, "Fitnesses"].sum()
-
-    # gera um series com as percentagens acumuladas
-    # 0.2, 0.65, 0.70, 0.80, 0.95, 1.00
-    percentagens_acumuladas_fitnesses = \
-                percentagens_relativas_fitnesses.cumsum()
-                
-    # esse comando gera um aleatorio de 0 até 1
-    # ex. 0.68
-    al = np.random.rand()
-
-    # retorna a posição do cromossomo sorteado
-    # no exemplo acima seria o cromossomo de índice
-    # 2 (terceiro cromossomo)
-    posicao_cromossomo_sorteado = \
-                (al > percentagens_acumuladas_fitnesses).sum()
-
-    # retorna o cromossomo pai
-    cromossomo_pai = cromossomos_sorteados.iloc[posicao_cromossomo_sorteado]
-
-    # o cromossomo mãe começa igual ao cromossomo pai
-    cromossomo_mae = cromossomo_pai.copy()
-
-    # enquanto o cromossomo mãe for igual ao cromossomo pai
-    # sorteie novos aleatórios até que o cromossomo mãe seja
-    # diferente do cromossomo pai
-    while (cromossomo_mae == cromossomo_pai).all():
-        al = np.random.rand()
-        posicao_cromossomo_sorteado = \
-                    (al > percentagens_acumuladas_fitnesses).sum()
-
-        cromossomo_mae = cromossomos_sorteados.iloc[posicao_cromossomo_sorteado]
-    
+    # sorteia as posições do pai e da mãe de uma só vez. A mãe é sorteada
+    # com a fatia do pai retirada da roda, então nunca é o próprio pai e
+    # não há laço de rejeição (que não terminava quando os cromossomos
+    # sorteados convergiam para o mesmo vetor)
+    posicoes_pais, posicoes_maes = selecionar_pares(
+        cromossomos_sorteados.loc[:, "Fitnesses"].to_numpy(), qtd_pares=1,
+        gerador=gerador, metodo=selecao, tamanho_torneio=tamanho_torneio)
+
     # retorna o cromossomo pai e mãe
+    cromossomo_pai = cromossomos_sorteados.iloc[posicoes_pais[0]]
+    cromossomo_mae = cromossomos_sorteados.iloc[posicoes_maes[0]]
+
     return cromossomo_pai, cromossomo_mae
 
 def gerar_cromossomos_base(qtd_croms_populacao_geral: int, 
                            acoes: list, medias: pd.Series, 
-                           matriz_covariancia: pd.DataFrame) -> pd.DataFrame:
+                           matriz_covariancia: pd.DataFrame,
+                           gerador: np.random.Generator) -> pd.DataFrame:
     
     """
     Função que gera os cromossomos base da população inicial.
@@ -176,6 +164,7 @@ def gerar_cromossomos_base(qtd_croms_populacao_geral: int,
     - acoes: lista com os nomes dos ativos
     - medias: médias dos retornos dos ativos
     - matriz_covariancia: matriz de covariância dos retornos dos ativos
+    - gerador: gerador de números aleatórios (np.random.Generator)
 
     Returns:
     - cromossomos: DataFrame com os cromossomos da população inicial
@@ -183,8 +172,8 @@ def gerar_cromossomos_base(qtd_croms_populacao_geral: int,
 
     qtd_genes = len(acoes)
 
-    carteiras = np.random.randint(low=0, high=10, 
-                                size=(qtd_croms_populacao_geral, qtd_genes))
+    carteiras = gerador.integers(low=0, high=10, 
+                                 size=(qtd_croms_populacao_geral, qtd_genes))
     cromossomos = preprocessing.normalize(carteiras, norm="l1", axis=1)
     cromossomos = pd.DataFrame(data=cromossomos, columns=acoes)
 
@@ -194,4 +183,113 @@ def gerar_cromossomos_base(qtd_croms_populacao_geral: int,
     cromossomos["Fitnesses"] = ces_fitnesses(cromossomos.loc[:, "Retornos"],
                                             cromossomos.loc[:, "Riscos"])
                                             
-    return cromossomos
\ No newline at end of file
+    return cromossomos
+
+def executar_ag_pandas(acoes: list, medias: pd.Series, matriz_covariancia: pd.DataFrame,
+                       qtd_iteracoes: int, qtd_epocas: int,
+                       qtd_croms_populacao_geral: int, selecao: str = "roleta",
+                       tamanho_torneio: int = 3, seed=None,
+                       perfilador: Perfilador = None) -> pd.DataFrame:
+    """
+    Função que executa o algoritmo genético com a população em um DataFrame
+    (implementação original, mantida como referência do motor numpy).
+
+    Args:
+    - acoes: lista com os nomes dos ativos
+    - medias: médias dos retornos dos ativos
+    - matriz_covariancia: matriz de covariância dos retornos dos ativos
+    - qtd_iteracoes: quantidade de iterações para cada época
+    - qtd_epocas: quantidade de épocas
+    - qtd_croms_populacao_geral: quantidade de cromossomos na população inicial
+    - selecao: método de seleção dos pais ('roleta', 'torneio' ou 'sus')
+    - tamanho_torneio: quantidade de cromossomos em cada torneio
+    - seed: semente (int, np.random.SeedSequence ou np.random.Generator)
+    - perfilador: perfilador que mede o tempo de cada etapa (ver ag.perfilador.Perfilador)
+
+    Returns:
+    - cromossomos: DataFrame com a população final
+    """
+
+    gerador = np.random.default_rng(seed)
+
+    if perfilador is None:
+        perfilador = PERFILADOR_NULO
+
+    # gera os cromossomos iniciais da população
+    with perfilador.etapa("populacao_inicial"):
+        cromossomos = gerar_cromossomos_base(qtd_croms_populacao_geral, acoes, medias, 
+                                             matriz_covariancia, gerador)
+
+    for _ in range(qtd_epocas):
+
+        # sorteia 6 cromossomos para a roda do acaso
+        indices_cromossomos_sorteados = \
+            gerador.choice(cromossomos.index, size=6, replace=False)
+
+        # resgata os cromossomos sorteados da população
+        cromossomos_sorteados = cromossomos.loc[indices_cromossomos_sorteados]
+
+        for _ in range(qtd_iteracoes):
+
+            # RODA DO ACASO -------------------------------------
+            # retorna os cromossomos pai e mãe sorteados
+            with perfilador.etapa("selecao"):
+                cromossomo_pai, cromossomo_mae = roda_do_acaso(cromossomos_sorteados, gerador,
+                                                               selecao, tamanho_torneio)
+            
+            # RODA DO ACASO -------------------------------------
+
+            # CROSSOVER -----------------------------------------
+            # retorna os cromossomos filhos
+            with perfilador.etapa("crossover"):
+                cromossomo_filho_um = crossover(acoes, cromossomo_pai, cromossomo_mae, gerador)
+                cromossomo_filho_dois = crossover(acoes, cromossomo_pai, cromossomo_mae, gerador)
+
+            # CROSSOVER -----------------------------------------
+
+            # MUTAÇÃO DO TIPO 1 ---------------------------------
+            # retorna os cromossomos mutantes do tipo um
+            with perfilador.etapa("mutacao_um"):
+                mutante_um = mutacao_um(acoes, cromossomo_filho_um, gerador)
+                mutante_dois = mutacao_um(acoes, cromossomo_filho_dois, gerador)
+            # MUTAÇÃO DO TIPO 1 ---------------------------------
+
+            # MUTAÇÃO DO TIPO 2 ---------------------------------
+            # retorna os cromossomos mutantes do tipo dois
+            with perfilador.etapa("mutacao_dois"):
+                mutante_tres, mutante_quatro = mutacao_dois(acoes, cromossomo_filho_um, gerador)
+                mutante_cinco, mutante_seis = mutacao_dois(acoes, cromossomo_filho_dois, gerador)
+            # MUTAÇÃO DO TIPO 2 --------------------------------
+
+            # GERAÇÃO DA NOVA GERAÇÃO --------------------------
+            # retorna a nova geração de cromossomos filhos/mutantes
+            with perfilador.etapa("avaliacao"):
+                df_nova_geracao = gerar_nova_geracao(acoes, medias, matriz_covariancia, 
+                                                     cromossomo_filho_um, cromossomo_filho_dois, 
+                                                     mutante_um, mutante_dois, mutante_tres, 
+                                                     mutante_quatro, mutante_cinco, mutante_seis)
+            # GERAÇÃO DA NOVA GERAÇÃO --------------------------
+
+            with perfilador.etapa("substituicao"):
+                # recupera o indice do cromossomo com o pior fitness entre os 'pais'
+                nome_cromossomo_ruim = cromossomos_sorteados["Fitnesses"].idxmin()
+
+                # recupera o indice do cromossomo com o melhor fitness entre os 'filhos/mutantes'
+                nome_cromossomo_bom = df_nova_geracao["Fitnesses"].idxmax()
+
+                # recupera o fitness do pior pai e do melhor filho
+                fitness_pior_pai = cromossomos_sorteados.loc[nome_cromossomo_ruim].loc["Fitnesses"]
+                fitness_melhor_filho = df_nova_geracao.loc[nome_cromossomo_bom].loc["Fitnesses"]
+
+                # se o fitness do melhor filho for maior que o fitness do pior pai
+                # então o cromossomo do pior pai é substituído pelo cromossomo do melhor filho
+                if fitness_melhor_filho > fitness_pior_pai:
+                    cromossomos_sorteados.loc[nome_cromossomo_ruim] = \
+                        df_nova_geracao.loc[nome_cromossomo_bom].values
+
+        # atualiza a população com os cromossomos sorteados iterados/melhorados
+        with perfilador.etapa("atualizacao_populacao"):
+            cromossomos.loc[indices_cromossomos_sorteados] = \
+                cromossomos_sorteados.values
+
+    return cromossomos
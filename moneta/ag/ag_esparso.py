@@ -0,0 +1,322 @@
+import numpy as np
+from ces.ces import ces_fitnesses
+from ces.ces_esparso import ces_retornos_esparsos, ces_riscos_esparsos
+from ag.ag_numpy import sortear_genes_lote, mutacao_dois_lote, selecionar_sobreviventes
+from ag.selecao import selecionar_pares
+from ag.convergencia import CriterioParada, HistoricoAG
+from ag.perfilador import Perfilador, PERFILADOR_NULO
+
+
+def esparsos_para_densos(indices: np.ndarray, pesos: np.ndarray,
+                         qtd_genes: int) -> np.ndarray:
+    """
+    Função que converte cromossomos esparsos (posições e pesos dos K ativos) para
+    o formato denso do motor numpy, com um gene para cada ativo do universo.
+
+    Args:
+    - indices: array (qtd_cromossomos, K) com as posições dos ativos de cada cromossomo
+    - pesos: array (qtd_cromossomos, K) com os pesos desses ativos
+    - qtd_genes: quantidade de ativos do universo
+
+    Returns:
+    - cromossomos: array (qtd_cromossomos, qtd_genes) com os pesos de todos os ativos
+    """
+
+    cromossomos = np.zeros((indices.shape[0], qtd_genes), dtype=pesos.dtype)
+    np.put_along_axis(cromossomos, indices, pesos, axis=1)
+
+    return cromossomos
+
+
+def avaliar_esparsos(indices: np.ndarray, pesos: np.ndarray, medias: np.ndarray,
+                     matriz_covariancia: np.ndarray) -> tuple[np.ndarray, np.ndarray,
+                                                              np.ndarray]:
+    """
+    Função que calcula os retornos, riscos e fitnesses de um bloco de cromossomos
+    esparsos. O risco usa apenas o bloco K×K da matriz de covariância de cada
+    cromossomo, então o custo depende de K e não do tamanho do universo.
+
+    Args:
+    - indices: array (qtd_cromossomos, K) com as posições dos ativos de cada cromossomo
+    - pesos: array (qtd_cromossomos, K) com os pesos desses ativos
+    - medias: array com as médias dos retornos dos ativos
+    - matriz_covariancia: array com a matriz de covariância dos retornos dos ativos
+
+    Returns:
+    - retornos: array com os retornos dos cromossomos
+    - riscos: array com os riscos dos cromossomos
+    - fitnesses: array com os fitnesses dos cromossomos
+    """
+
+    retornos = ces_retornos_esparsos(indices, pesos, medias)
+    riscos = ces_riscos_esparsos(indices, pesos, matriz_covariancia)
+    fitnesses = ces_fitnesses(retornos=retornos, riscos=riscos)
+
+    return retornos, riscos, fitnesses
+
+
+def gerar_cromossomos_base_esparsos(qtd_croms_populacao_geral: int, cardinalidade: int,
+                                    medias: np.ndarray, matriz_covariancia: np.ndarray,
+                                    gerador: np.random.Generator) -> tuple[np.ndarray, ...]:
+    """
+    Função que gera a população inicial esparsa: cada cromossomo recebe K ativos
+    distintos sorteados do universo, com pesos inteiros de 1 a 9 normalizados.
+
+    Args:
+    - qtd_croms_populacao_geral: quantidade de cromossomos na população inicial
+    - cardinalidade: quantidade máxima K de ativos em cada cromossomo
+    - medias: array com as médias dos retornos dos ativos
+    - matriz_covariancia: array com a matriz de covariância dos retornos dos ativos
+    - gerador: gerador de números aleatórios (np.random.Generator)
+
+    Returns:
+    - indices: array (qtd_croms_populacao_geral, K) com as posições dos ativos
+    - pesos: array (qtd_croms_populacao_geral, K) com os pesos dos ativos
+    - retornos: array com os retornos dos cromossomos
+    - riscos: array com os riscos dos cromossomos
+    - fitnesses: array com os fitnesses dos cromossomos
+    """
+
+    qtd_genes = medias.shape[0]
+
+    # as K menores chaves aleatórias de cada linha formam um sorteio sem reposição
+    chaves = gerador.random((qtd_croms_populacao_geral, qtd_genes))
+    indices = np.argpartition(chaves, cardinalidade - 1, axis=1)[:, :cardinalidade]
+
+    # ao contrário da população densa, os pesos começam em 1: com poucos genes, uma
+    # carteira toda zerada (risco nulo) deixaria de ser improvável
+    pesos = gerador.integers(low=1, high=10,
+                             size=(qtd_croms_populacao_geral, cardinalidade)).astype(medias.dtype)
+    pesos /= pesos.sum(axis=1, keepdims=True)
+
+    retornos, riscos, fitnesses = avaliar_esparsos(indices, pesos, medias, matriz_covariancia)
+
+    return indices, pesos, retornos, riscos, fitnesses
+
+
+def crossover_esparso_lote(indices_pais: np.ndarray, pesos_pais: np.ndarray,
+                           indices_maes: np.ndarray, pesos_maes: np.ndarray,
+                           als: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Função que realiza o cruzamento de vários pares de cromossomos esparsos. O filho
+    é a mesma combinação convexa al * pai + (1 - al) * mãe do crossover denso,
+    feita sobre a união dos ativos dos pais (até 2K ativos); quando a união passa
+    de K ativos, ficam os K maiores pesos, renormalizados para somar 1.
+
+    Args:
+    - indices_pais: array (qtd_pares, K) com as posições dos ativos dos pais
+    - pesos_pais: array (qtd_pares, K) com os pesos dos pais
+    - indices_maes: array (qtd_pares, K) com as posições dos ativos das mães
+    - pesos_maes: array (qtd_pares, K) com os pesos das mães
+    - als: array (qtd_pares,) com os coeficientes de cruzamento
+
+    Returns:
+    - indices_filhos: array (qtd_pares, K) com as posições dos ativos dos filhos
+    - pesos_filhos: array (qtd_pares, K) com os pesos dos filhos
+    """
+
+    cardinalidade = indices_pais.shape[1]
+    als = als[:, np.newaxis].astype(pesos_pais.dtype, copy=False)
+
+    indices = np.concatenate([indices_pais, indices_maes], axis=1)
+    pesos = np.concatenate([als * pesos_pais, (1 - als) * pesos_maes], axis=1)
+
+    # ordenados pela posição, os ativos comuns aos dois pais ficam lado a lado
+    ordem = np.argsort(indices, axis=1, kind="stable")
+    indices = np.take_along_axis(indices, ordem, axis=1)
+    pesos = np.take_along_axis(pesos, ordem, axis=1)
+
+    # cada ativo aparece no máximo duas vezes: o peso da segunda ocorrência vai para
+    # a primeira e a segunda recebe peso -1, para nunca ficar entre os K maiores
+    # (a união tem pelo menos K ativos distintos, todos com peso >= 0)
+    repetidos = indices[:, 1:] == indices[:, :-1]
+    pesos[:, :-1] += np.where(repetidos, pesos[:, 1:], 0.0)
+    pesos[:, 1:][repetidos] = -1.0
+
+    maiores = np.argpartition(-pesos, cardinalidade - 1, axis=1)[:, :cardinalidade]
+    indices_filhos = np.take_along_axis(indices, maiores, axis=1)
+    pesos_filhos = np.take_along_axis(pesos, maiores, axis=1)
+    pesos_filhos /= pesos_filhos.sum(axis=1, keepdims=True)
+
+    return indices_filhos, pesos_filhos
+
+
+def mutacao_um_esparsa_lote(indices: np.ndarray, pesos: np.ndarray,
+                            posicoes: np.ndarray,
+                            ativos: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Função que realiza a mutação do tipo um (troca de dois genes) em um bloco de
+    cromossomos esparsos. Cada cromossomo troca o gene da posição sorteada com um
+    ativo sorteado do universo: se o ativo já está na carteira, os dois pesos
+    trocam de lugar; se não está, o ativo entra com o peso da posição e o ativo
+    antigo sai (é a troca densa com um gene zerado). É por esta mutação que
+    ativos de fora da carteira entram na busca.
+
+    Args:
+    - indices: array (qtd_cromossomos, K) com as posições dos ativos
+    - pesos: array (qtd_cromossomos, K) com os pesos dos ativos
+    - posicoes: array (qtd_cromossomos,) com a posição (0 a K - 1) trocada em cada cromossomo
+    - ativos: array (qtd_cromossomos,) com o ativo do universo sorteado para cada cromossomo
+
+    Returns:
+    - indices_mutantes: array (qtd_cromossomos, K) com as posições dos ativos dos mutantes
+    - pesos_mutantes: array (qtd_cromossomos, K) com os pesos dos mutantes
+    """
+
+    linhas = np.arange(indices.shape[0])
+
+    iguais = indices == ativos[:, np.newaxis]
+    presentes = iguais.any(axis=1)
+    posicoes_ativos = iguais.argmax(axis=1)
+
+    indices_mutantes = indices.copy()
+    pesos_mutantes = pesos.copy()
+
+    linhas_presentes = linhas[presentes]
+    pesos_mutantes[linhas_presentes, posicoes[presentes]] = \
+        pesos[linhas_presentes, posicoes_ativos[presentes]]
+    pesos_mutantes[linhas_presentes, posicoes_ativos[presentes]] = \
+        pesos[linhas_presentes, posicoes[presentes]]
+
+    indices_mutantes[linhas[~presentes], posicoes[~presentes]] = ativos[~presentes]
+
+    return indices_mutantes, pesos_mutantes
+
+
+def montar_descendentes_esparsos(indices_pais: np.ndarray, pesos_pais: np.ndarray,
+                                 indices_maes: np.ndarray, pesos_maes: np.ndarray,
+                                 als: np.ndarray, posicoes_um: np.ndarray,
+                                 ativos_um: np.ndarray,
+                                 genes_dois: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Função que gera os 8 descendentes de cada par de pais esparsos, na mesma ordem
+    de 'montar_descendentes': 2 filhos do crossover, 2 mutantes do tipo um e
+    4 mutantes do tipo dois.
+
+    Args:
+    - indices_pais: array (qtd_pares, K) com as posições dos ativos dos pais
+    - pesos_pais: array (qtd_pares, K) com os pesos dos pais
+    - indices_maes: array (qtd_pares, K) com as posições dos ativos das mães
+    - pesos_maes: array (qtd_pares, K) com os pesos das mães
+    - als: array (2, qtd_pares) com os coeficientes de cruzamento
+    - posicoes_um: array (2 * qtd_pares,) com as posições da mutação do tipo um
+    - ativos_um: array (2 * qtd_pares,) com os ativos sorteados na mutação do tipo um
+    - genes_dois: array (2 * qtd_pares, 2) com as posições da mutação do tipo dois
+
+    Returns:
+    - indices: array (8 * qtd_pares, K) com as posições dos ativos dos descendentes
+    - pesos: array (8 * qtd_pares, K) com os pesos dos descendentes
+    """
+
+    indices_filhos, pesos_filhos = crossover_esparso_lote(
+        np.concatenate([indices_pais, indices_pais]), np.concatenate([pesos_pais, pesos_pais]),
+        np.concatenate([indices_maes, indices_maes]), np.concatenate([pesos_maes, pesos_maes]),
+        np.concatenate([als[0], als[1]]))
+
+    indices_um, pesos_um = mutacao_um_esparsa_lote(indices_filhos, pesos_filhos,
+                                                   posicoes_um, ativos_um)
+
+    # a mutação dois só move pesos entre posições da carteira; os ativos não mudam
+    pesos_dois_a, pesos_dois_b = mutacao_dois_lote(pesos_filhos, genes_dois)
+
+    indices = np.concatenate([indices_filhos, indices_um, indices_filhos, indices_filhos])
+    pesos = np.concatenate([pesos_filhos, pesos_um, pesos_dois_a, pesos_dois_b])
+
+    return indices, pesos
+
+
+def executar_ag_esparso(medias: np.ndarray, matriz_covariancia: np.ndarray,
+                        qtd_iteracoes: int, qtd_epocas: int,
+                        qtd_croms_populacao_geral: int, cardinalidade: int,
+                        selecao: str = "roleta", tamanho_torneio: int = 3, seed=None,
+                        parada: CriterioParada = None,
+                        historico: HistoricoAG = None,
+                        perfilador: Perfilador = None) -> tuple[np.ndarray, ...]:
+    """
+    Função que executa o algoritmo genético no modo geracional com cromossomos
+    esparsos: cada cromossomo guarda no máximo K ativos (posições e pesos), e
+    todos os operadores e a avaliação custam O(K) ou O(K²) por cromossomo, em vez
+    de O(n) ou O(n²). Indicado para varrer universos de milhares de ativos quando
+    a carteira final tem poucas ações.
+
+    Args:
+    - medias: array com as médias dos retornos dos ativos
+    - matriz_covariancia: array com a matriz de covariância dos retornos dos ativos
+      (ou modelo fatorial, ver ces.covariancia.CovarianciaFatorial)
+    - qtd_iteracoes: quantidade de pares de pais (iterações) em cada época
+    - qtd_epocas: quantidade de épocas
+    - qtd_croms_populacao_geral: quantidade de cromossomos na população
+    - cardinalidade: quantidade máxima K de ativos em cada cromossomo
+    - selecao: método de seleção dos pais ('roleta', 'torneio' ou 'sus')
+    - tamanho_torneio: quantidade de cromossomos em cada torneio
+    - seed: semente (int, np.random.SeedSequence ou np.random.Generator)
+    - parada: critério de parada antecipada (ver ag.convergencia.CriterioParada);
+      None executa todas as épocas
+    - historico: objeto que recebe o melhor fitness, o fitness médio e a
+      diversidade de cada época (ver ag.convergencia.HistoricoAG)
+    - perfilador: perfilador que mede o tempo de cada etapa (ver ag.perfilador.Perfilador)
+
+    Returns:
+    - indices: array (qtd_croms_populacao_geral, K) com as posições dos ativos
+    - pesos: array (qtd_croms_populacao_geral, K) com os pesos dos ativos
+    - retornos: array com os retornos da população final
+    - riscos: array com os riscos da população final
+    - fitnesses: array com os fitnesses da população final
+    """
+
+    qtd_genes = medias.shape[0]
+
+    if not 2 <= cardinalidade <= qtd_genes:
+        raise ValueError(f"A cardinalidade máxima deve ficar entre 2 e {qtd_genes} ativos.")
+
+    gerador = np.random.default_rng(seed)
+
+    if perfilador is None:
+        perfilador = PERFILADOR_NULO
+
+    with perfilador.etapa("populacao_inicial"):
+        indices, pesos, retornos, riscos, fitnesses = \
+            gerar_cromossomos_base_esparsos(qtd_croms_populacao_geral, cardinalidade, medias,
+                                            matriz_covariancia, gerador)
+
+    for _ in range(qtd_epocas):
+
+        with perfilador.etapa("selecao"):
+            indices_pais, indices_maes = selecionar_pares(fitnesses, qtd_iteracoes, gerador,
+                                                          selecao, tamanho_torneio)
+
+            als = gerador.random((2, qtd_iteracoes))
+            posicoes_um = gerador.integers(0, cardinalidade, size=2 * qtd_iteracoes)
+            ativos_um = gerador.integers(0, qtd_genes, size=2 * qtd_iteracoes)
+            genes_dois = sortear_genes_lote(2 * qtd_iteracoes, cardinalidade, gerador)
+
+        with perfilador.etapa("descendentes"):
+            indices_descendentes, pesos_descendentes = montar_descendentes_esparsos(
+                indices[indices_pais], pesos[indices_pais],
+                indices[indices_maes], pesos[indices_maes],
+                als, posicoes_um, ativos_um, genes_dois)
+
+        with perfilador.etapa("avaliacao"):
+            retornos_descendentes, riscos_descendentes, fitnesses_descendentes = \
+                avaliar_esparsos(indices_descendentes, pesos_descendentes, medias,
+                                 matriz_covariancia)
+
+        with perfilador.etapa("substituicao"):
+            fitnesses_todos = np.concatenate([fitnesses, fitnesses_descendentes])
+            indices_sobreviventes = selecionar_sobreviventes(qtd_croms_populacao_geral,
+                                                             fitnesses_todos)
+
+            indices = np.concatenate([indices, indices_descendentes])[indices_sobreviventes]
+            pesos = np.concatenate([pesos, pesos_descendentes])[indices_sobreviventes]
+            retornos = np.concatenate([retornos, retornos_descendentes])[indices_sobreviventes]
+            riscos = np.concatenate([riscos, riscos_descendentes])[indices_sobreviventes]
+            fitnesses = fitnesses_todos[indices_sobreviventes]
+
+        if historico is not None:
+            # a diversidade é medida sobre os pesos de todos os ativos do universo
+            historico.registrar(esparsos_para_densos(indices, pesos, qtd_genes), fitnesses)
+
+        if parada is not None and parada.deve_parar(fitnesses.max()):
+            break
+
+    return indices, pesos, retornos, riscos, fitnesses
@@ -0,0 +1,264 @@
+import numpy as np
+from ag.ag_numpy import gerar_cromossomos_base_np
+from ag.convergencia import CriterioParada, HistoricoAG
+
+# o numba é opcional: sem ele o moneta_ag volta para o motor numpy
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+NUMBA_DISPONIVEL = njit is not None
+SELECOES_NUMBA = ["roleta", "torneio"]
+
+
+def _compilar(funcao):
+    """
+    Compila a função com numba.njit quando o numba está instalado. Sem o numba a
+    função continua em Python puro (correta, porém lenta), apenas para referência.
+    """
+
+    return njit(cache=True)(funcao) if NUMBA_DISPONIVEL else funcao
+
+
+@_compilar
+def _avaliar_cromossomo(cromossomo, medias, matriz_covariancia):
+    """
+    Calcula o retorno (2 ** w'μ), o risco (|w'Σw|) e o fitness de um cromossomo.
+    """
+
+    qtd_genes = cromossomo.shape[0]
+    retorno_log = 0.0
+    risco = 0.0
+
+    for i in range(qtd_genes):
+        retorno_log += cromossomo[i] * medias[i]
+
+        produto = 0.0
+        for j in range(qtd_genes):
+            produto += matriz_covariancia[i, j] * cromossomo[j]
+        risco += cromossomo[i] * produto
+
+    retorno = 2.0 ** retorno_log
+    risco = abs(risco)
+
+    return retorno, risco, retorno / risco
+
+
+@_compilar
+def _sortear_roleta(fitnesses, sorteio, posicao_excluida):
+    """
+    Sorteia uma posição pela roda do acaso a partir de um número uniforme em [0, 1).
+    Com 'posicao_excluida' >= 0 a fatia dessa posição é retirada da roda.
+    """
+
+    total = 0.0
+    for posicao in range(fitnesses.shape[0]):
+        if posicao != posicao_excluida:
+            total += fitnesses[posicao]
+
+    alvo = sorteio * total
+    acumulado = 0.0
+    ultima_posicao = -1
+
+    for posicao in range(fitnesses.shape[0]):
+        if posicao == posicao_excluida:
+            continue
+        acumulado += fitnesses[posicao]
+        ultima_posicao = posicao
+        if alvo < acumulado:
+            return posicao
+
+    # protege contra arredondamentos em que o sorteio cai sobre o acumulado final
+    return ultima_posicao
+
+
+@_compilar
+def _sortear_torneio(fitnesses, candidatos, posicao_excluida):
+    """
+    Retorna o candidato de maior fitness. Os candidatos são sorteados entre as
+    n - 1 posições restantes e deslocados quando passam da posição excluída.
+    """
+
+    vencedor = -1
+    for candidato in candidatos:
+        if posicao_excluida >= 0 and candidato >= posicao_excluida:
+            candidato += 1
+        if vencedor < 0 or fitnesses[candidato] > fitnesses[vencedor]:
+            vencedor = candidato
+
+    return vencedor
+
+
+@_compilar
+def _evoluir_epoca_numba(cromossomos, retornos, riscos, fitnesses, medias,
+                         matriz_covariancia, indices_sorteados, sorteios_pais,
+                         candidatos_pais, usar_torneio, als, genes):
+    """
+    Executa as iterações de uma época do modo estacionário sobre os cromossomos
+    sorteados: seleção, crossover, as duas mutações, avaliação dos 8 descendentes
+    e substituição do pior pai pelo melhor descendente. Todos os números
+    aleatórios chegam sorteados de fora, em arrays.
+    """
+
+    qtd_iteracoes = als.shape[0]
+    qtd_genes = cromossomos.shape[1]
+    qtd_sorteados = indices_sorteados.shape[0]
+
+    cromossomos_sorteados = cromossomos[indices_sorteados]
+    retornos_sorteados = retornos[indices_sorteados]
+    riscos_sorteados = riscos[indices_sorteados]
+    fitnesses_sorteados = fitnesses[indices_sorteados]
+
+    descendentes = np.empty((8, qtd_genes))
+
+    for iteracao in range(qtd_iteracoes):
+
+        # roda do acaso (ou torneio): a mãe nunca é o próprio pai
+        if usar_torneio:
+            posicao_pai = _sortear_torneio(fitnesses_sorteados, candidatos_pais[iteracao, 0], -1)
+            posicao_mae = _sortear_torneio(fitnesses_sorteados, candidatos_pais[iteracao, 1],
+                                           posicao_pai)
+        else:
+            posicao_pai = _sortear_roleta(fitnesses_sorteados, sorteios_pais[iteracao, 0], -1)
+            posicao_mae = _sortear_roleta(fitnesses_sorteados, sorteios_pais[iteracao, 1],
+                                          posicao_pai)
+
+        # crossover: 2 filhos com coeficientes independentes
+        for filho in range(2):
+            al = als[iteracao, filho]
+            for gene in range(qtd_genes):
+                descendentes[filho, gene] = \
+                    (1 - al) * cromossomos_sorteados[posicao_mae, gene] + \
+                    al * cromossomos_sorteados[posicao_pai, gene]
+
+        for filho in range(2):
+            # mutação um: troca dos genes sorteados
+            gene_a, gene_b = genes[iteracao, filho, 0], genes[iteracao, filho, 1]
+            descendentes[2 + filho] = descendentes[filho]
+            descendentes[2 + filho, gene_a] = descendentes[filho, gene_b]
+            descendentes[2 + filho, gene_b] = descendentes[filho, gene_a]
+
+            # mutação dois: a soma dos genes sorteados vai para um deles
+            gene_a, gene_b = genes[iteracao, 2 + filho, 0], genes[iteracao, 2 + filho, 1]
+            soma_genes = descendentes[filho, gene_a] + descendentes[filho, gene_b]
+            descendentes[4 + 2 * filho] = descendentes[filho]
+            descendentes[4 + 2 * filho, gene_a] = soma_genes
+            descendentes[4 + 2 * filho, gene_b] = 0.0
+            descendentes[5 + 2 * filho] = descendentes[filho]
+            descendentes[5 + 2 * filho, gene_a] = 0.0
+            descendentes[5 + 2 * filho, gene_b] = soma_genes
+
+        # melhor descendente
+        posicao_bom = -1
+        retorno_bom, risco_bom, fitness_bom = 0.0, 0.0, -np.inf
+        for descendente in range(8):
+            retorno, risco, fitness = _avaliar_cromossomo(descendentes[descendente], medias,
+                                                          matriz_covariancia)
+            if fitness > fitness_bom:
+                posicao_bom = descendente
+                retorno_bom, risco_bom, fitness_bom = retorno, risco, fitness
+
+        # pior pai entre os sorteados
+        posicao_ruim = 0
+        for posicao in range(1, qtd_sorteados):
+            if fitnesses_sorteados[posicao] < fitnesses_sorteados[posicao_ruim]:
+                posicao_ruim = posicao
+
+        if posicao_bom >= 0 and fitness_bom > fitnesses_sorteados[posicao_ruim]:
+            cromossomos_sorteados[posicao_ruim] = descendentes[posicao_bom]
+            retornos_sorteados[posicao_ruim] = retorno_bom
+            riscos_sorteados[posicao_ruim] = risco_bom
+            fitnesses_sorteados[posicao_ruim] = fitness_bom
+
+    # devolve os cromossomos sorteados iterados/melhorados à população
+    for posicao in range(qtd_sorteados):
+        indice = indices_sorteados[posicao]
+        cromossomos[indice] = cromossomos_sorteados[posicao]
+        retornos[indice] = retornos_sorteados[posicao]
+        riscos[indice] = riscos_sorteados[posicao]
+        fitnesses[indice] = fitnesses_sorteados[posicao]
+
+
+def executar_ag_numba(medias: np.ndarray, matriz_covariancia: np.ndarray,
+                      qtd_iteracoes: int, qtd_epocas: int,
+                      qtd_croms_populacao_geral: int, selecao: str = "roleta",
+                      tamanho_torneio: int = 3, seed=None,
+                      parada: CriterioParada = None,
+                      historico: HistoricoAG = None) -> tuple[np.ndarray, np.ndarray,
+                                                              np.ndarray, np.ndarray]:
+    """
+    Função que executa o algoritmo genético no modo estacionário com o laço interno
+    (seleção, crossover, mutações e avaliação) compilado pelo numba. Os números
+    aleatórios de cada época são sorteados pelo gerador numpy e entregues ao
+    núcleo compilado em arrays, então a execução é reprodutível pela semente.
+    Os sorteios não seguem a mesma ordem do motor numpy; o resultado é
+    estatisticamente equivalente, mas não idêntico.
+
+    Args:
+    - medias: array com as médias dos retornos dos ativos
+    - matriz_covariancia: array com a matriz de covariância dos retornos dos ativos
+    - qtd_iteracoes: quantidade de iterações para cada época
+    - qtd_epocas: quantidade de épocas
+    - qtd_croms_populacao_geral: quantidade de cromossomos na população
+    - selecao: método de seleção dos pais ('roleta' ou 'torneio')
+    - tamanho_torneio: quantidade de cromossomos em cada torneio
+    - seed: semente (int, np.random.SeedSequence ou np.random.Generator)
+    - parada: critério de parada antecipada (ver ag.convergencia.CriterioParada)
+    - historico: objeto que recebe os valores de cada época (ver ag.convergencia.HistoricoAG)
+
+    Returns:
+    - cromossomos: array (qtd_croms_populacao_geral, qtd_genes) da população final
+    - retornos: array com os retornos da população final
+    - riscos: array com os riscos da população final
+    - fitnesses: array com os fitnesses da população final
+    """
+
+    if selecao not in SELECOES_NUMBA:
+        raise ValueError(f"O motor numba suporta apenas as seleções {SELECOES_NUMBA}.")
+
+    gerador = np.random.default_rng(seed)
+    qtd_genes = medias.shape[0]
+    usar_torneio = selecao == "torneio"
+
+    # o núcleo compilado trabalha sempre em float64
+    medias = np.ascontiguousarray(medias, dtype=np.float64)
+    matriz_covariancia = np.ascontiguousarray(matriz_covariancia, dtype=np.float64)
+
+    cromossomos, retornos, riscos, fitnesses = \
+        gerar_cromossomos_base_np(qtd_croms_populacao_geral, medias, matriz_covariancia,
+                                  gerador)
+
+    # arrays vazios ocupam o lugar do método de seleção que não é usado
+    sorteios_pais = np.zeros((qtd_iteracoes, 2))
+    candidatos_pais = np.zeros((qtd_iteracoes, 2, tamanho_torneio), dtype=np.int64)
+
+    for _ in range(qtd_epocas):
+
+        indices_sorteados = gerador.choice(qtd_croms_populacao_geral, size=6, replace=False)
+
+        if usar_torneio:
+            # o torneio da mãe sorteia entre os 5 sorteados que não são o pai
+            candidatos_pais[:, 0] = gerador.integers(0, 6, size=(qtd_iteracoes, tamanho_torneio))
+            candidatos_pais[:, 1] = gerador.integers(0, 5, size=(qtd_iteracoes, tamanho_torneio))
+        else:
+            sorteios_pais = gerador.random((qtd_iteracoes, 2))
+
+        als = gerador.random((qtd_iteracoes, 2))
+
+        # 4 pares de genes distintos por iteração (2 da mutação um e 2 da mutação dois)
+        genes_a = gerador.integers(0, qtd_genes, size=(qtd_iteracoes, 4))
+        genes_b = (genes_a + gerador.integers(1, qtd_genes, size=(qtd_iteracoes, 4))) % qtd_genes
+        genes = np.stack([genes_a, genes_b], axis=2)
+
+        _evoluir_epoca_numba(cromossomos, retornos, riscos, fitnesses, medias,
+                             matriz_covariancia, indices_sorteados, sorteios_pais,
+                             candidatos_pais, usar_torneio, als, genes)
+
+        if historico is not None:
+            historico.registrar(cromossomos, fitnesses)
+
+        if parada is not None and parada.deve_parar(fitnesses.max()):
+            break
+
+    return cromossomos, retornos, riscos, fitnesses
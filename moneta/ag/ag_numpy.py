@@ -0,0 +1,1317 @@
+import pandas as pd
+import numpy as np
+from ces.ces import ces_retornos, ces_riscos, ces_fitnesses
+from ces.ces_incremental import (ces_produtos_covariancia, ces_riscos_crossover,
+                                 ces_riscos_transferencia)
+from ag.selecao import selecionar_pares
+from ag.convergencia import CriterioParada, HistoricoAG
+from ces.cache import CacheFitness
+from ag.perfilador import Perfilador, PERFILADOR_NULO
+from ag.operadores import OPERADORES, SelecaoOperadores
+from sklearn import preprocessing
+
+
+def avaliar_cromossomos(cromossomos: np.ndarray, medias: np.ndarray,
+                        matriz_covariancia: np.ndarray,
+                        cache: CacheFitness = None) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Função que calcula os retornos, riscos e fitnesses de um bloco de cromossomos.
+
+    Args:
+    - cromossomos: array (qtd_cromossomos, qtd_genes) com os pesos das carteiras
+    - medias: array com as médias dos retornos dos ativos
+    - matriz_covariancia: array com a matriz de covariância dos retornos dos ativos
+    - cache: cache de fitnesses (ver ces.cache.CacheFitness); None avalia tudo
+
+    Returns:
+    - retornos: array com os retornos dos cromossomos
+    - riscos: array com os riscos dos cromossomos
+    - fitnesses: array com os fitnesses dos cromossomos
+    """
+
+    if cache is not None:
+        return cache.avaliar(cromossomos)
+
+    retornos = ces_retornos(carteiras=cromossomos, medias=medias)
+    riscos = ces_riscos(carteiras=cromossomos, matriz_covariancia=matriz_covariancia)
+    fitnesses = ces_fitnesses(retornos=retornos, riscos=riscos)
+
+    return retornos, riscos, fitnesses
+
+
+def gerar_nova_geracao_np(medias: np.ndarray, matriz_covariancia: np.ndarray,
+                          descendentes: list,
+                          cache: CacheFitness = None) -> tuple[np.ndarray, np.ndarray,
+                                                               np.ndarray, np.ndarray]:
+    """
+    Função que empilha os cromossomos filhos e mutantes em um único array
+    e calcula os seus retornos, riscos e fitnesses de uma só vez.
+
+    Args:
+    - medias: array com as médias dos retornos dos ativos
+    - matriz_covariancia: array com a matriz de covariância dos retornos dos ativos
+    - descendentes: lista com os cromossomos filhos e mutantes (arrays 1-D)
+    - cache: cache de fitnesses (ver ces.cache.CacheFitness); None avalia tudo
+
+    Returns:
+    - cromossomos: array (qtd_descendentes, qtd_genes) da nova geração
+    - retornos: array com os retornos da nova geração
+    - riscos: array com os riscos da nova geração
+    - fitnesses: array com os fitnesses da nova geração
+    """
+
+    cromossomos = np.stack(descendentes)
+    retornos, riscos, fitnesses = avaliar_cromossomos(cromossomos, medias,
+                                                      matriz_covariancia, cache)
+
+    return cromossomos, retornos, riscos, fitnesses
+
+
+def mutacao_dois_np(cromossomo_filho: np.ndarray,
+                    gerador: np.random.Generator) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Função que realiza a mutação do tipo dois em um cromossomo filho.
+
+    Args:
+    - cromossomo_filho: array com os genes do cromossomo filho
+    - gerador: gerador de números aleatórios (np.random.Generator)
+
+    Returns:
+    - mutante_a: cromossomo mutante gerado na mutação
+    - mutante_b: outro cromossomo mutante gerado na mutação
+    """
+
+    genes_sorteados = gerador.choice(cromossomo_filho.shape[0], size=2, replace=False)
+    soma_genes = cromossomo_filho[genes_sorteados].sum()
+
+    mutante_a = cromossomo_filho.copy()
+    mutante_a[genes_sorteados[0]] = soma_genes
+    mutante_a[genes_sorteados[1]] = 0
+
+    mutante_b = cromossomo_filho.copy()
+    mutante_b[genes_sorteados[0]] = 0
+    mutante_b[genes_sorteados[1]] = soma_genes
+    return mutante_a, mutante_b
+
+
+def mutacao_um_np(cromossomo_filho: np.ndarray, gerador: np.random.Generator) -> np.ndarray:
+    """
+    Função que realiza a mutação do tipo um (troca de dois genes) em um cromossomo filho.
+
+    Args:
+    - cromossomo_filho: array com os genes do cromossomo filho
+    - gerador: gerador de números aleatórios (np.random.Generator)
+
+    Returns:
+    - mutante: cromossomo mutante gerado na mutação
+    """
+
+    genes_sorteados = gerador.choice(cromossomo_filho.shape[0], size=2, replace=False)
+    mutante = cromossomo_filho.copy()
+    mutante[genes_sorteados] = cromossomo_filho[genes_sorteados[::-1]]
+
+    return mutante
+
+
+def crossover_np(cromossomo_pai: np.ndarray, cromossomo_mae: np.ndarray,
+                 gerador: np.random.Generator) -> np.ndarray:
+    """
+    Função que realiza o cruzamento entre dois cromossomos.
+
+    Args:
+    - cromossomo_pai: array com os genes do cromossomo pai
+    - cromossomo_mae: array com os genes do cromossomo mãe
+    - gerador: gerador de números aleatórios (np.random.Generator)
+
+    Returns:
+    - cromossomo_filho: cromossomo filho gerado no cruzamento
+    """
+
+    al = gerador.random()
+    parte_genes_pai = al * cromossomo_pai
+    parte_genes_mae = (1 - al) * cromossomo_mae
+    cromossomo_filho = parte_genes_mae + parte_genes_pai
+    return cromossomo_filho
+
+
+def gerar_cromossomos_base_np(qtd_croms_populacao_geral: int, medias: np.ndarray,
+                              matriz_covariancia: np.ndarray,
+                              gerador: np.random.Generator) -> tuple[np.ndarray, np.ndarray,
+                                                                       np.ndarray, np.ndarray]:
+    """
+    Função que gera os cromossomos base da população inicial.
+
+    Args:
+    - qtd_croms_populacao_geral: quantidade de cromossomos na população inicial
+    - medias: array com as médias dos retornos dos ativos
+    - matriz_covariancia: array com a matriz de covariância dos retornos dos ativos
+    - gerador: gerador de números aleatórios (np.random.Generator)
+
+    Returns:
+    - cromossomos: array (qtd_croms_populacao_geral, qtd_genes) da população inicial
+    - retornos: array com os retornos dos cromossomos
+    - riscos: array com os riscos dos cromossomos
+    - fitnesses: array com os fitnesses dos cromossomos
+    """
+
+    qtd_genes = medias.shape[0]
+
+    carteiras = gerador.integers(low=0, high=10,
+                                 size=(qtd_croms_populacao_geral, qtd_genes))
+    cromossomos = preprocessing.normalize(carteiras, norm="l1", axis=1)
+    # a população segue a precisão das médias (float64 ou float32)
+    cromossomos = np.ascontiguousarray(cromossomos, dtype=medias.dtype)
+
+    retornos, riscos, fitnesses = avaliar_cromossomos(cromossomos, medias,
+                                                      matriz_covariancia)
+
+    return cromossomos, retornos, riscos, fitnesses
+
+
+def semear_populacao(cromossomos: np.ndarray, retornos: np.ndarray, riscos: np.ndarray,
+                     fitnesses: np.ndarray, cromossomos_semente: np.ndarray,
+                     medias: np.ndarray,
+                     matriz_covariancia: np.ndarray) -> tuple[np.ndarray, np.ndarray,
+                                                              np.ndarray, np.ndarray]:
+    """
+    Função que coloca cromossomos conhecidos (por exemplo, a carteira do gradiente
+    projetado) na população inicial, no lugar dos cromossomos de pior fitness.
+
+    Args:
+    - cromossomos: array (qtd_cromossomos, qtd_genes) com a população inicial
+    - retornos: array com os retornos da população inicial
+    - riscos: array com os riscos da população inicial
+    - fitnesses: array com os fitnesses da população inicial
+    - cromossomos_semente: array (qtd_sementes, qtd_genes) com os cromossomos a inserir
+    - medias: array com as médias dos retornos dos ativos
+    - matriz_covariancia: array com a matriz de covariância dos retornos dos ativos
+
+    Returns:
+    - cromossomos: array (qtd_cromossomos, qtd_genes) com a população semeada
+    - retornos: array com os retornos da população semeada
+    - riscos: array com os riscos da população semeada
+    - fitnesses: array com os fitnesses da população semeada
+    """
+
+    sementes = np.atleast_2d(np.asarray(cromossomos_semente, dtype=cromossomos.dtype))
+
+    if sementes.shape[1] != cromossomos.shape[1]:
+        raise ValueError("Os cromossomos semente devem ter um gene para cada ação.")
+
+    if sementes.shape[0] > cromossomos.shape[0]:
+        raise ValueError("Há mais cromossomos semente do que cromossomos na população.")
+
+    piores = np.argsort(fitnesses, kind="stable")[:sementes.shape[0]]
+    retornos_sementes, riscos_sementes, fitnesses_sementes = \
+        avaliar_cromossomos(sementes, medias, matriz_covariancia)
+
+    cromossomos[piores] = sementes
+    retornos[piores] = retornos_sementes
+    riscos[piores] = riscos_sementes
+    fitnesses[piores] = fitnesses_sementes
+
+    return cromossomos, retornos, riscos, fitnesses
+
+
+def sortear_genes_lote(qtd_cromossomos: int, qtd_genes: int,
+                       gerador: np.random.Generator) -> np.ndarray:
+    """
+    Função que sorteia dois genes distintos para cada cromossomo de um bloco.
+
+    Args:
+    - qtd_cromossomos: quantidade de cromossomos do bloco
+    - qtd_genes: quantidade de genes de cada cromossomo, ou array (qtd_cromossomos,)
+      com a quantidade de genes válidos (os primeiros) de cada cromossomo
+    - gerador: gerador de números aleatórios (np.random.Generator)
+
+    Returns:
+    - genes_sorteados: array (qtd_cromossomos, 2) com as posições dos genes
+    """
+
+    gene_a = gerador.integers(0, qtd_genes, size=qtd_cromossomos)
+
+    # o deslocamento entre 1 e qtd_genes - 1 garante que o segundo gene seja diferente
+    gene_b = (gene_a + gerador.integers(1, qtd_genes, size=qtd_cromossomos)) % qtd_genes
+
+    return np.stack([gene_a, gene_b], axis=1)
+
+
+def crossover_lote(cromossomos_pais: np.ndarray, cromossomos_maes: np.ndarray,
+                   als: np.ndarray) -> np.ndarray:
+    """
+    Função que realiza o cruzamento de vários pares de cromossomos de uma só vez.
+
+    Args:
+    - cromossomos_pais: array (qtd_pares, qtd_genes) com os cromossomos pais
+    - cromossomos_maes: array (qtd_pares, qtd_genes) com os cromossomos mães
+    - als: array (qtd_pares,) com os coeficientes de cruzamento
+
+    Returns:
+    - cromossomos_filhos: array (qtd_pares, qtd_genes) com os cromossomos filhos
+    """
+
+    # os coeficientes seguem o tipo dos cromossomos, para não promover float32 a float64
+    als = als[:, np.newaxis].astype(cromossomos_pais.dtype, copy=False)
+    return (1 - als) * cromossomos_maes + als * cromossomos_pais
+
+
+def mutacao_um_lote(cromossomos_filhos: np.ndarray,
+                    genes_sorteados: np.ndarray) -> np.ndarray:
+    """
+    Função que realiza a mutação do tipo um (troca de dois genes) em um bloco
+    de cromossomos filhos.
+
+    Args:
+    - cromossomos_filhos: array (qtd_filhos, qtd_genes) com os cromossomos filhos
+    - genes_sorteados: array (qtd_filhos, 2) com os genes a trocar em cada filho
+
+    Returns:
+    - mutantes: array (qtd_filhos, qtd_genes) com os cromossomos mutantes
+    """
+
+    linhas = np.arange(cromossomos_filhos.shape[0])
+    gene_a, gene_b = genes_sorteados[:, 0], genes_sorteados[:, 1]
+
+    mutantes = cromossomos_filhos.copy()
+    mutantes[linhas, gene_a] = cromossomos_filhos[linhas, gene_b]
+    mutantes[linhas, gene_b] = cromossomos_filhos[linhas, gene_a]
+
+    return mutantes
+
+
+def mutacao_dois_lote(cromossomos_filhos: np.ndarray,
+                      genes_sorteados: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Função que realiza a mutação do tipo dois (junção de dois genes) em um bloco
+    de cromossomos filhos.
+
+    Args:
+    - cromossomos_filhos: array (qtd_filhos, qtd_genes) com os cromossomos filhos
+    - genes_sorteados: array (qtd_filhos, 2) com os genes a juntar em cada filho
+
+    Returns:
+    - mutantes_a: mutantes com a soma no primeiro gene sorteado
+    - mutantes_b: mutantes com a soma no segundo gene sorteado
+    """
+
+    linhas = np.arange(cromossomos_filhos.shape[0])
+    gene_a, gene_b = genes_sorteados[:, 0], genes_sorteados[:, 1]
+    soma_genes = cromossomos_filhos[linhas, gene_a] + cromossomos_filhos[linhas, gene_b]
+
+    mutantes_a = cromossomos_filhos.copy()
+    mutantes_a[linhas, gene_a] = soma_genes
+    mutantes_a[linhas, gene_b] = 0
+
+    mutantes_b = cromossomos_filhos.copy()
+    mutantes_b[linhas, gene_a] = 0
+    mutantes_b[linhas, gene_b] = soma_genes
+
+    return mutantes_a, mutantes_b
+
+
+def sortear_operacoes_lote(fitnesses: np.ndarray, qtd_pares: int, qtd_genes: int,
+                           gerador: np.random.Generator, selecao: str = "roleta",
+                           tamanho_torneio: int = 3) -> tuple[np.ndarray, np.ndarray, np.ndarray,
+                                                    np.ndarray, np.ndarray]:
+    """
+    Função que sorteia, em arrays, tudo o que é aleatório em uma época do modo
+    geracional: os pares de pais, os coeficientes de cruzamento e os genes das
+    mutações.
+
+    Args:
+    - fitnesses: array com os fitnesses da população
+    - qtd_pares: quantidade de pares de pais da época
+    - qtd_genes: quantidade de genes de cada cromossomo
+    - gerador: gerador de números aleatórios (np.random.Generator)
+    - selecao: método de seleção dos pais ('roleta', 'torneio' ou 'sus')
+    - tamanho_torneio: quantidade de cromossomos em cada torneio
+
+    Returns:
+    - indices_pais: array com as posições dos cromossomos pais
+    - indices_maes: array com as posições dos cromossomos mães
+    - als: array (2, qtd_pares) com os coeficientes de cruzamento dos dois filhos
+    - genes_um: array (2 * qtd_pares, 2) com os genes da mutação do tipo um
+    - genes_dois: array (2 * qtd_pares, 2) com os genes da mutação do tipo dois
+    """
+
+    indices_pais, indices_maes = selecionar_pares(fitnesses, qtd_pares, gerador,
+                                                  selecao, tamanho_torneio)
+
+    # os dois filhos de cada par usam coeficientes de cruzamento independentes
+    als = gerador.random((2, qtd_pares))
+
+    genes_um = sortear_genes_lote(2 * qtd_pares, qtd_genes, gerador)
+    genes_dois = sortear_genes_lote(2 * qtd_pares, qtd_genes, gerador)
+
+    return indices_pais, indices_maes, als, genes_um, genes_dois
+
+
+def montar_descendentes(cromossomos_pais: np.ndarray, cromossomos_maes: np.ndarray,
+                        als: np.ndarray, genes_um: np.ndarray,
+                        genes_dois: np.ndarray) -> np.ndarray:
+    """
+    Função que gera todos os descendentes de um bloco de pares de pais. Cada par
+    gera os mesmos 8 descendentes de uma iteração do modo estacionário:
+    2 filhos do crossover, 2 mutantes do tipo um e 4 mutantes do tipo dois.
+
+    Args:
+    - cromossomos_pais: array (qtd_pares, qtd_genes) com os cromossomos pais
+    - cromossomos_maes: array (qtd_pares, qtd_genes) com os cromossomos mães
+    - als: array (2, qtd_pares) com os coeficientes de cruzamento
+    - genes_um: array (2 * qtd_pares, 2) com os genes da mutação do tipo um
+    - genes_dois: array (2 * qtd_pares, 2) com os genes da mutação do tipo dois
+
+    Returns:
+    - descendentes: array (8 * qtd_pares, qtd_genes) com os filhos e mutantes
+    """
+
+    cromossomos_filhos = np.concatenate(
+        [crossover_lote(cromossomos_pais, cromossomos_maes, als[0]),
+         crossover_lote(cromossomos_pais, cromossomos_maes, als[1])])
+
+    mutantes_um = mutacao_um_lote(cromossomos_filhos, genes_um)
+    mutantes_dois_a, mutantes_dois_b = mutacao_dois_lote(cromossomos_filhos, genes_dois)
+
+    return np.concatenate([cromossomos_filhos, mutantes_um,
+                           mutantes_dois_a, mutantes_dois_b])
+
+
+def montar_descendentes_incremental(cromossomos_pais: np.ndarray, cromossomos_maes: np.ndarray,
+                                    riscos_pais: np.ndarray, riscos_maes: np.ndarray,
+                                    produtos_pais: np.ndarray, produtos_maes: np.ndarray,
+                                    matriz_covariancia: np.ndarray, als: np.ndarray,
+                                    genes_um: np.ndarray,
+                                    genes_dois: np.ndarray) -> tuple[np.ndarray, np.ndarray,
+                                                                     np.ndarray]:
+    """
+    Função que gera os mesmos descendentes de 'montar_descendentes', mas calcula os
+    seus riscos em O(n) a partir dos produtos Σw guardados para os pais, em vez de
+    refazer a forma quadrática w'Σw em O(n²) para cada descendente.
+
+    Args:
+    - cromossomos_pais: array (qtd_pares, qtd_genes) com os cromossomos pais
+    - cromossomos_maes: array (qtd_pares, qtd_genes) com os cromossomos mães
+    - riscos_pais: array com os riscos dos pais
+    - riscos_maes: array com os riscos das mães
+    - produtos_pais: array (qtd_pares, qtd_genes) com os produtos Σw dos pais
+    - produtos_maes: array (qtd_pares, qtd_genes) com os produtos Σw das mães
+    - matriz_covariancia: array com a matriz de covariância dos retornos dos ativos
+    - als: array (2, qtd_pares) com os coeficientes de cruzamento
+    - genes_um: array (2 * qtd_pares, 2) com os genes da mutação do tipo um
+    - genes_dois: array (2 * qtd_pares, 2) com os genes da mutação do tipo dois
+
+    Returns:
+    - descendentes: array (8 * qtd_pares, qtd_genes) com os filhos e mutantes
+    - riscos: array com os riscos dos descendentes
+    - produtos: array (8 * qtd_pares, qtd_genes) com os produtos Σw dos descendentes
+    """
+
+    # termo cruzado p'Σm de cada par, em O(n) com o produto Σm já guardado
+    termos_cruzados = np.einsum("ij,ij->i", cromossomos_pais, produtos_maes)
+
+    # os dois filhos de cada par ficam empilhados na mesma ordem de 'montar_descendentes'
+    als_filhos = np.concatenate([als[0], als[1]])
+    pais = np.concatenate([cromossomos_pais, cromossomos_pais])
+    maes = np.concatenate([cromossomos_maes, cromossomos_maes])
+
+    cromossomos_filhos = crossover_lote(pais, maes, als_filhos)
+    riscos_filhos = ces_riscos_crossover(als_filhos,
+                                         np.concatenate([riscos_pais, riscos_pais]),
+                                         np.concatenate([riscos_maes, riscos_maes]),
+                                         np.concatenate([termos_cruzados, termos_cruzados]))
+
+    # Σc também é a mesma combinação convexa dos produtos dos pais
+    produtos_filhos = crossover_lote(np.concatenate([produtos_pais, produtos_pais]),
+                                     np.concatenate([produtos_maes, produtos_maes]),
+                                     als_filhos)
+
+    linhas = np.arange(cromossomos_filhos.shape[0])
+
+    # mutação um: os genes i e j trocam de valor (delta = w_j - w_i)
+    mutantes_um = mutacao_um_lote(cromossomos_filhos, genes_um)
+    deltas_um = cromossomos_filhos[linhas, genes_um[:, 1]] - \
+                cromossomos_filhos[linhas, genes_um[:, 0]]
+    riscos_um, produtos_um = ces_riscos_transferencia(riscos_filhos, produtos_filhos,
+                                                      matriz_covariancia, genes_um, deltas_um)
+
+    # mutação dois: a soma vai para o gene i (delta = w_j) ou para o gene j (delta = -w_i)
+    mutantes_dois_a, mutantes_dois_b = mutacao_dois_lote(cromossomos_filhos, genes_dois)
+    riscos_dois_a, produtos_dois_a = ces_riscos_transferencia(
+        riscos_filhos, produtos_filhos, matriz_covariancia, genes_dois,
+        cromossomos_filhos[linhas, genes_dois[:, 1]])
+    riscos_dois_b, produtos_dois_b = ces_riscos_transferencia(
+        riscos_filhos, produtos_filhos, matriz_covariancia, genes_dois,
+        -cromossomos_filhos[linhas, genes_dois[:, 0]])
+
+    descendentes = np.concatenate([cromossomos_filhos, mutantes_um,
+                                   mutantes_dois_a, mutantes_dois_b])
+    riscos = np.concatenate([riscos_filhos, riscos_um, riscos_dois_a, riscos_dois_b])
+    produtos = np.concatenate([produtos_filhos, produtos_um,
+                               produtos_dois_a, produtos_dois_b])
+
+    return descendentes, riscos, produtos
+
+
+def montar_descendentes_adaptativos(cromossomos_pais: np.ndarray, cromossomos_maes: np.ndarray,
+                                    operadores: np.ndarray,
+                                    gerador: np.random.Generator) -> np.ndarray:
+    """
+    Função que gera um descendente por par de pais com o operador sorteado para ele:
+    todo descendente parte de um filho do crossover, que recebe a mutação um (troca
+    de dois genes) ou a mutação dois (soma de dois genes em um deles) conforme o
+    operador (ver ag.operadores.SelecaoOperadores).
+
+    Args:
+    - cromossomos_pais: array (qtd_descendentes, qtd_genes) com os cromossomos pais
+    - cromossomos_maes: array (qtd_descendentes, qtd_genes) com os cromossomos mães
+    - operadores: array (qtd_descendentes,) com a posição (em OPERADORES) do operador
+      de cada descendente (ver ag.operadores.OPERADORES)
+    - gerador: gerador de números aleatórios (np.random.Generator)
+
+    Returns:
+    - descendentes: array (qtd_descendentes, qtd_genes) com os descendentes
+    """
+
+    qtd_descendentes, qtd_genes = cromossomos_pais.shape
+
+    als = gerador.random(qtd_descendentes)
+    descendentes = crossover_lote(cromossomos_pais, cromossomos_maes, als)
+
+    # um único sorteio de genes para o bloco; cada mutação usa as linhas dos seus descendentes
+    genes = sortear_genes_lote(qtd_descendentes, qtd_genes, gerador)
+
+    mutacao_um = operadores == OPERADORES.index("mutacao_um")
+    descendentes[mutacao_um] = mutacao_um_lote(descendentes[mutacao_um], genes[mutacao_um])
+
+    # a ordem dos dois genes já é aleatória, então basta a soma no primeiro deles
+    mutacao_dois = operadores == OPERADORES.index("mutacao_dois")
+    descendentes[mutacao_dois] = mutacao_dois_lote(descendentes[mutacao_dois],
+                                                   genes[mutacao_dois])[0]
+
+    return descendentes
+
+
+def selecionar_sobreviventes(qtd_sobreviventes: int, fitnesses: np.ndarray) -> np.ndarray:
+    """
+    Função que escolhe os cromossomos com os maiores fitnesses entre pais e
+    descendentes (substituição elitista).
+
+    Args:
+    - qtd_sobreviventes: quantidade de cromossomos que seguem para a próxima época
+    - fitnesses: array com os fitnesses dos pais e dos descendentes
+
+    Returns:
+    - indices_sobreviventes: array com as posições dos sobreviventes
+    """
+
+    return np.argpartition(-fitnesses, qtd_sobreviventes - 1)[:qtd_sobreviventes]
+
+
+def executar_ag_numpy(medias: np.ndarray, matriz_covariancia: np.ndarray,
+                      qtd_iteracoes: int, qtd_epocas: int,
+                      qtd_croms_populacao_geral: int,
+                      risco_incremental: bool = False, selecao: str = "roleta",
+                      tamanho_torneio: int = 3, seed=None,
+                      parada: CriterioParada = None,
+                      historico: HistoricoAG = None,
+                      cache: CacheFitness = None,
+                      perfilador: Perfilador = None,
+                      cromossomos_semente: np.ndarray = None,
+                      selecao_operadores: SelecaoOperadores = None) -> tuple[np.ndarray,
+                                                                             np.ndarray,
+                                                                             np.ndarray,
+                                                                             np.ndarray]:
+    """
+    Função que executa o algoritmo genético (substituição do pior pai pelo melhor
+    filho) com a população inteira mantida em arrays contíguos.
+
+    Args:
+    - medias: array com as médias dos retornos dos ativos
+    - matriz_covariancia: array com a matriz de covariância dos retornos dos ativos
+    - qtd_iteracoes: quantidade de iterações para cada época
+    - qtd_epocas: quantidade de épocas
+    - qtd_croms_populacao_geral: quantidade de cromossomos na população
+    - risco_incremental: se True, guarda Σw de cada cromossomo e calcula os riscos
+      dos descendentes em O(n) (ver 'montar_descendentes_incremental'). Os
+      descendentes sorteados são os mesmos; apenas a avaliação muda
+    - selecao: método de seleção dos pais ('roleta', 'torneio' ou 'sus')
+    - tamanho_torneio: quantidade de cromossomos em cada torneio
+    - seed: semente (int, np.random.SeedSequence ou np.random.Generator); todo o
+      sorteio da execução sai de um único gerador criado a partir dela
+    - parada: critério de parada antecipada (ver ag.convergencia.CriterioParada);
+      None executa todas as épocas
+    - historico: objeto que recebe o melhor fitness, o fitness médio e a
+      diversidade de cada época (ver ag.convergencia.HistoricoAG)
+    - cache: cache de fitnesses dos descendentes (ver ces.cache.CacheFitness); usado
+      apenas na avaliação completa, sem o risco incremental
+    - perfilador: perfilador que mede o tempo de cada etapa (ver ag.perfilador.Perfilador)
+    - cromossomos_semente: array (qtd_sementes, qtd_genes) com cromossomos que entram na
+      população inicial no lugar dos piores (ver 'semear_populacao')
+    - selecao_operadores: seleção adaptativa dos operadores (ver
+      ag.operadores.SelecaoOperadores); None usa a sequência fixa de crossover e mutações
+
+    Returns:
+    - cromossomos: array (qtd_croms_populacao_geral, qtd_genes) da população final
+    - retornos: array com os retornos da população final
+    - riscos: array com os riscos da população final
+    - fitnesses: array com os fitnesses da população final
+    """
+
+    gerador = np.random.default_rng(seed)
+
+    if perfilador is None:
+        perfilador = PERFILADOR_NULO
+
+    with perfilador.etapa("populacao_inicial"):
+        cromossomos, retornos, riscos, fitnesses = \
+            gerar_cromossomos_base_np(qtd_croms_populacao_geral, medias, matriz_covariancia,
+                                      gerador)
+
+        if cromossomos_semente is not None:
+            cromossomos, retornos, riscos, fitnesses = \
+                semear_populacao(cromossomos, retornos, riscos, fitnesses,
+                                 cromossomos_semente, medias, matriz_covariancia)
+
+    return evoluir_estacionario(cromossomos, retornos, riscos, fitnesses, medias,
+                                matriz_covariancia, qtd_iteracoes, qtd_epocas, gerador,
+                                risco_incremental, selecao, tamanho_torneio, parada,
+                                historico, cache, perfilador, selecao_operadores)
+
+
+def evoluir_estacionario(cromossomos: np.ndarray, retornos: np.ndarray, riscos: np.ndarray,
+                         fitnesses: np.ndarray, medias: np.ndarray,
+                         matriz_covariancia: np.ndarray, qtd_iteracoes: int,
+                         qtd_epocas: int, gerador: np.random.Generator,
+                         risco_incremental: bool = False, selecao: str = "roleta",
+                         tamanho_torneio: int = 3, parada: CriterioParada = None,
+                         historico: HistoricoAG = None,
+                         cache: CacheFitness = None,
+                         perfilador: Perfilador = None,
+                         selecao_operadores: SelecaoOperadores = None) -> tuple[np.ndarray,
+                                                                                np.ndarray,
+                                                                                np.ndarray,
+                                                                                np.ndarray]:
+    """
+    Função que evolui uma população já existente por 'qtd_epocas' épocas no modo
+    estacionário. É o laço de 'executar_ag_numpy', separado para que o AG possa
+    continuar de onde parou (por exemplo, entre as migrações do modelo de ilhas).
+
+    Args:
+    - cromossomos: array (qtd_cromossomos, qtd_genes) com a população atual
+    - retornos: array com os retornos da população atual
+    - riscos: array com os riscos da população atual
+    - fitnesses: array com os fitnesses da população atual
+    - medias: array com as médias dos retornos dos ativos
+    - matriz_covariancia: array com a matriz de covariância dos retornos dos ativos
+    - qtd_iteracoes: quantidade de iterações para cada época
+    - qtd_epocas: quantidade de épocas
+    - gerador: gerador de números aleatórios (np.random.Generator)
+    - risco_incremental: se True, calcula os riscos dos descendentes em O(n)
+    - selecao: método de seleção dos pais ('roleta', 'torneio' ou 'sus')
+    - tamanho_torneio: quantidade de cromossomos em cada torneio
+    - parada: critério de parada antecipada (ver ag.convergencia.CriterioParada);
+      None executa todas as épocas
+    - historico: objeto que recebe o melhor fitness, o fitness médio e a
+      diversidade de cada época (ver ag.convergencia.HistoricoAG)
+    - cache: cache de fitnesses dos descendentes (ver ces.cache.CacheFitness); usado
+      apenas na avaliação completa, sem o risco incremental
+    - perfilador: perfilador que mede o tempo de cada etapa (ver ag.perfilador.Perfilador)
+    - selecao_operadores: seleção adaptativa dos operadores (ver
+      ag.operadores.SelecaoOperadores). A cada iteração, os 8 descendentes do par de
+      pais são gerados pelos operadores sorteados e recompensam os seus operadores
+      quando superam o melhor dos cromossomos sorteados; incompatível com o risco
+      incremental
+
+    Returns:
+    - cromossomos: array (qtd_cromossomos, qtd_genes) da população final
+    - retornos: array com os retornos da população final
+    - riscos: array com os riscos da população final
+    - fitnesses: array com os fitnesses da população final
+    """
+
+    qtd_genes = medias.shape[0]
+    qtd_croms_populacao_geral = cromossomos.shape[0]
+
+    if perfilador is None:
+        perfilador = PERFILADOR_NULO
+
+    if risco_incremental:
+        produtos = ces_produtos_covariancia(cromossomos, matriz_covariancia)
+
+    for _ in range(qtd_epocas):
+
+        # sorteia 6 cromossomos para a roda do acaso
+        indices_sorteados = \
+            gerador.choice(qtd_croms_populacao_geral, size=6, replace=False)
+
+        # a indexação avançada gera cópias, que são devolvidas à população ao final da época
+        cromossomos_sorteados = cromossomos[indices_sorteados]
+        retornos_sorteados = retornos[indices_sorteados]
+        riscos_sorteados = riscos[indices_sorteados]
+        fitnesses_sorteados = fitnesses[indices_sorteados]
+
+        if risco_incremental:
+            produtos_sorteados = produtos[indices_sorteados]
+
+        for _ in range(qtd_iteracoes):
+
+            # roda do acaso: pai e mãe sempre em posições distintas
+            with perfilador.etapa("selecao"):
+                posicoes_pais, posicoes_maes = selecionar_pares(fitnesses_sorteados, 1,
+                                                                gerador, selecao,
+                                                                tamanho_torneio)
+            posicao_pai, posicao_mae = posicoes_pais[0], posicoes_maes[0]
+            cromossomo_pai = cromossomos_sorteados[posicao_pai]
+            cromossomo_mae = cromossomos_sorteados[posicao_mae]
+
+            if selecao_operadores is not None:
+                # os 8 descendentes do par saem dos operadores sorteados para a iteração
+                with perfilador.etapa("descendentes"):
+                    operadores = selecao_operadores.sortear(8, gerador)
+                    nova_geracao = montar_descendentes_adaptativos(
+                        np.repeat(cromossomo_pai[np.newaxis], 8, axis=0),
+                        np.repeat(cromossomo_mae[np.newaxis], 8, axis=0),
+                        operadores, gerador)
+
+                with perfilador.etapa("avaliacao"):
+                    retornos_nova, riscos_nova, fitnesses_nova = \
+                        avaliar_cromossomos(nova_geracao, medias, matriz_covariancia, cache)
+            elif risco_incremental:
+                # crossover e mutações em um só bloco, com os riscos atualizados em O(n)
+                with perfilador.etapa("descendentes"):
+                    # os sorteios seguem a mesma ordem das funções crossover_np,
+                    # mutacao_um_np e mutacao_dois_np do caminho completo
+                    als = np.array([[gerador.random()], [gerador.random()]])
+                    genes_um = np.stack([gerador.choice(qtd_genes, size=2, replace=False)
+                                         for _ in range(2)])
+                    genes_dois = np.stack([gerador.choice(qtd_genes, size=2, replace=False)
+                                           for _ in range(2)])
+
+                    nova_geracao, riscos_nova, produtos_nova = \
+                        montar_descendentes_incremental(
+                            cromossomo_pai[np.newaxis], cromossomo_mae[np.newaxis],
+                            riscos_sorteados[[posicao_pai]], riscos_sorteados[[posicao_mae]],
+                            produtos_sorteados[[posicao_pai]], produtos_sorteados[[posicao_mae]],
+                            matriz_covariancia, als, genes_um, genes_dois)
+
+                with perfilador.etapa("avaliacao"):
+                    retornos_nova = ces_retornos(carteiras=nova_geracao, medias=medias)
+                    fitnesses_nova = ces_fitnesses(retornos=retornos_nova, riscos=riscos_nova)
+            else:
+                with perfilador.etapa("crossover"):
+                    cromossomo_filho_um = crossover_np(cromossomo_pai, cromossomo_mae, gerador)
+                    cromossomo_filho_dois = crossover_np(cromossomo_pai, cromossomo_mae, gerador)
+
+                with perfilador.etapa("mutacao_um"):
+                    mutante_um = mutacao_um_np(cromossomo_filho_um, gerador)
+                    mutante_dois = mutacao_um_np(cromossomo_filho_dois, gerador)
+
+                with perfilador.etapa("mutacao_dois"):
+                    mutante_tres, mutante_quatro = mutacao_dois_np(cromossomo_filho_um, gerador)
+                    mutante_cinco, mutante_seis = mutacao_dois_np(cromossomo_filho_dois, gerador)
+
+                with perfilador.etapa("avaliacao"):
+                    nova_geracao, retornos_nova, riscos_nova, fitnesses_nova = \
+                        gerar_nova_geracao_np(medias, matriz_covariancia,
+                                              [cromossomo_filho_um, cromossomo_filho_dois,
+                                               mutante_um, mutante_dois, mutante_tres,
+                                               mutante_quatro, mutante_cinco, mutante_seis],
+                                              cache)
+
+            with perfilador.etapa("substituicao"):
+                # pior pai entre os sorteados e melhor filho/mutante da nova geração
+                posicao_ruim = np.argmin(fitnesses_sorteados)
+                posicao_bom = np.argmax(fitnesses_nova)
+
+                if selecao_operadores is not None:
+                    selecao_operadores.atualizar(operadores, fitnesses_nova,
+                                                 fitnesses_sorteados.max())
+
+                if fitnesses_nova[posicao_bom] > fitnesses_sorteados[posicao_ruim]:
+                    cromossomos_sorteados[posicao_ruim] = nova_geracao[posicao_bom]
+                    retornos_sorteados[posicao_ruim] = retornos_nova[posicao_bom]
+                    riscos_sorteados[posicao_ruim] = riscos_nova[posicao_bom]
+                    fitnesses_sorteados[posicao_ruim] = fitnesses_nova[posicao_bom]
+
+                    if risco_incremental:
+                        produtos_sorteados[posicao_ruim] = produtos_nova[posicao_bom]
+
+        # atualiza a população com os cromossomos sorteados iterados/melhorados
+        with perfilador.etapa("atualizacao_populacao"):
+            cromossomos[indices_sorteados] = cromossomos_sorteados
+            retornos[indices_sorteados] = retornos_sorteados
+            riscos[indices_sorteados] = riscos_sorteados
+            fitnesses[indices_sorteados] = fitnesses_sorteados
+
+            if risco_incremental:
+                produtos[indices_sorteados] = produtos_sorteados
+
+        if historico is not None:
+            historico.registrar(cromossomos, fitnesses)
+
+        if parada is not None and parada.deve_parar(fitnesses.max()):
+            break
+
+    if risco_incremental:
+        # recalcula exatamente a população final, descartando o acúmulo de
+        # arredondamentos das atualizações incrementais
+        retornos, riscos, fitnesses = avaliar_cromossomos(cromossomos, medias,
+                                                          matriz_covariancia)
+
+    return cromossomos, retornos, riscos, fitnesses
+
+
+def executar_ag_geracional(medias: np.ndarray, matriz_covariancia: np.ndarray,
+                           qtd_iteracoes: int, qtd_epocas: int,
+                           qtd_croms_populacao_geral: int,
+                           risco_incremental: bool = False, selecao: str = "roleta",
+                           tamanho_torneio: int = 3, seed=None,
+                           parada: CriterioParada = None,
+                           historico: HistoricoAG = None,
+                           cache: CacheFitness = None,
+                           perfilador: Perfilador = None,
+                           cromossomos_semente: np.ndarray = None,
+                           selecao_operadores: SelecaoOperadores = None) -> tuple[np.ndarray,
+                                                                                  np.ndarray,
+                                                                                  np.ndarray,
+                                                                                  np.ndarray]:
+    """
+    Função que executa o algoritmo genético no modo geracional: em cada época os
+    'qtd_iteracoes' pares de pais são sorteados de uma vez, todos os descendentes
+    são gerados e avaliados em um único bloco e os melhores entre pais e
+    descendentes formam a população seguinte. O orçamento de avaliações por época
+    é o mesmo do modo estacionário (8 descendentes por iteração).
+
+    Args:
+    - medias: array com as médias dos retornos dos ativos
+    - matriz_covariancia: array com a matriz de covariância dos retornos dos ativos
+    - qtd_iteracoes: quantidade de pares de pais (iterações) em cada época
+    - qtd_epocas: quantidade de épocas
+    - qtd_croms_populacao_geral: quantidade de cromossomos na população
+    - risco_incremental: se True, guarda Σw de cada cromossomo e calcula os riscos
+      dos descendentes em O(n) (ver 'montar_descendentes_incremental')
+    - selecao: método de seleção dos pais ('roleta', 'torneio' ou 'sus')
+    - tamanho_torneio: quantidade de cromossomos em cada torneio
+    - seed: semente (int, np.random.SeedSequence ou np.random.Generator); todo o
+      sorteio da execução sai de um único gerador criado a partir dela
+    - parada: critério de parada antecipada (ver ag.convergencia.CriterioParada);
+      None executa todas as épocas
+    - historico: objeto que recebe o melhor fitness, o fitness médio e a
+      diversidade de cada época (ver ag.convergencia.HistoricoAG)
+    - cache: cache de fitnesses dos descendentes (ver ces.cache.CacheFitness); usado
+      apenas na avaliação completa, sem o risco incremental
+    - perfilador: perfilador que mede o tempo de cada etapa (ver ag.perfilador.Perfilador)
+    - cromossomos_semente: array (qtd_sementes, qtd_genes) com cromossomos que entram na
+      população inicial no lugar dos piores (ver 'semear_populacao')
+    - selecao_operadores: seleção adaptativa dos operadores (ver
+      ag.operadores.SelecaoOperadores); None usa a sequência fixa de crossover e mutações
+
+    Returns:
+    - cromossomos: array (qtd_croms_populacao_geral, qtd_genes) da população final
+    - retornos: array com os retornos da população final
+    - riscos: array com os riscos da população final
+    - fitnesses: array com os fitnesses da população final
+    """
+
+    gerador = np.random.default_rng(seed)
+
+    if perfilador is None:
+        perfilador = PERFILADOR_NULO
+
+    with perfilador.etapa("populacao_inicial"):
+        cromossomos, retornos, riscos, fitnesses = \
+            gerar_cromossomos_base_np(qtd_croms_populacao_geral, medias, matriz_covariancia,
+                                      gerador)
+
+        if cromossomos_semente is not None:
+            cromossomos, retornos, riscos, fitnesses = \
+                semear_populacao(cromossomos, retornos, riscos, fitnesses,
+                                 cromossomos_semente, medias, matriz_covariancia)
+
+    return evoluir_geracional(cromossomos, retornos, riscos, fitnesses, medias,
+                              matriz_covariancia, qtd_iteracoes, qtd_epocas, gerador,
+                              risco_incremental, selecao, tamanho_torneio, parada,
+                              historico, cache, perfilador, selecao_operadores)
+
+
+def evoluir_geracional(cromossomos: np.ndarray, retornos: np.ndarray, riscos: np.ndarray,
+                       fitnesses: np.ndarray, medias: np.ndarray,
+                       matriz_covariancia: np.ndarray, qtd_iteracoes: int,
+                       qtd_epocas: int, gerador: np.random.Generator,
+                       risco_incremental: bool = False, selecao: str = "roleta",
+                       tamanho_torneio: int = 3, parada: CriterioParada = None,
+                       historico: HistoricoAG = None,
+                       cache: CacheFitness = None,
+                       perfilador: Perfilador = None,
+                       selecao_operadores: SelecaoOperadores = None) -> tuple[np.ndarray,
+                                                                              np.ndarray,
+                                                                              np.ndarray,
+                                                                              np.ndarray]:
+    """
+    Função que evolui uma população já existente por 'qtd_epocas' épocas no modo
+    geracional. É o laço de 'executar_ag_geracional', separado para que o AG possa
+    continuar de onde parou (por exemplo, entre as migrações do modelo de ilhas).
+
+    Args:
+    - cromossomos: array (qtd_cromossomos, qtd_genes) com a população atual
+    - retornos: array com os retornos da população atual
+    - riscos: array com os riscos da população atual
+    - fitnesses: array com os fitnesses da população atual
+    - medias: array com as médias dos retornos dos ativos
+    - matriz_covariancia: array com a matriz de covariância dos retornos dos ativos
+    - qtd_iteracoes: quantidade de pares de pais (iterações) em cada época
+    - qtd_epocas: quantidade de épocas
+    - gerador: gerador de números aleatórios (np.random.Generator)
+    - risco_incremental: se True, calcula os riscos dos descendentes em O(n)
+    - selecao: método de seleção dos pais ('roleta', 'torneio' ou 'sus')
+    - tamanho_torneio: quantidade de cromossomos em cada torneio
+    - parada: critério de parada antecipada (ver ag.convergencia.CriterioParada);
+      None executa todas as épocas
+    - historico: objeto que recebe o melhor fitness, o fitness médio e a
+      diversidade de cada época (ver ag.convergencia.HistoricoAG)
+    - cache: cache de fitnesses dos descendentes (ver ces.cache.CacheFitness); usado
+      apenas na avaliação completa, sem o risco incremental
+    - perfilador: perfilador que mede o tempo de cada etapa (ver ag.perfilador.Perfilador)
+    - selecao_operadores: seleção adaptativa dos operadores (ver
+      ag.operadores.SelecaoOperadores). Os 8 * qtd_iteracoes descendentes de cada época
+      são gerados por pares de pais independentes, cada um com o operador sorteado, e
+      recompensam os seus operadores quando superam o melhor fitness da população;
+      incompatível com o risco incremental
+
+    Returns:
+    - cromossomos: array (qtd_cromossomos, qtd_genes) da população final
+    - retornos: array com os retornos da população final
+    - riscos: array com os riscos da população final
+    - fitnesses: array com os fitnesses da população final
+    """
+
+    qtd_genes = medias.shape[0]
+    qtd_croms_populacao_geral = cromossomos.shape[0]
+
+    if perfilador is None:
+        perfilador = PERFILADOR_NULO
+
+    if risco_incremental:
+        produtos = ces_produtos_covariancia(cromossomos, matriz_covariancia)
+
+    for _ in range(qtd_epocas):
+
+        if selecao_operadores is not None:
+            # mesmo orçamento de avaliações da sequência fixa, com um par de pais
+            # e um operador sorteados para cada descendente
+            qtd_descendentes = 8 * qtd_iteracoes
+
+            with perfilador.etapa("selecao"):
+                indices_pais, indices_maes = selecionar_pares(fitnesses, qtd_descendentes,
+                                                              gerador, selecao,
+                                                              tamanho_torneio)
+                operadores = selecao_operadores.sortear(qtd_descendentes, gerador)
+
+            with perfilador.etapa("descendentes"):
+                descendentes = montar_descendentes_adaptativos(cromossomos[indices_pais],
+                                                               cromossomos[indices_maes],
+                                                               operadores, gerador)
+
+            with perfilador.etapa("avaliacao"):
+                retornos_descendentes, riscos_descendentes, fitnesses_descendentes = \
+                    avaliar_cromossomos(descendentes, medias, matriz_covariancia, cache)
+        else:
+            with perfilador.etapa("selecao"):
+                indices_pais, indices_maes, als, genes_um, genes_dois = \
+                    sortear_operacoes_lote(fitnesses, qtd_iteracoes, qtd_genes, gerador,
+                                           selecao, tamanho_torneio)
+
+            if risco_incremental:
+                with perfilador.etapa("descendentes"):
+                    descendentes, riscos_descendentes, produtos_descendentes = \
+                        montar_descendentes_incremental(
+                            cromossomos[indices_pais], cromossomos[indices_maes],
+                            riscos[indices_pais], riscos[indices_maes],
+                            produtos[indices_pais], produtos[indices_maes],
+                            matriz_covariancia, als, genes_um, genes_dois)
+
+                with perfilador.etapa("avaliacao"):
+                    retornos_descendentes = ces_retornos(carteiras=descendentes, medias=medias)
+                    fitnesses_descendentes = ces_fitnesses(retornos=retornos_descendentes,
+                                                           riscos=riscos_descendentes)
+            else:
+                # crossover e mutações de todos os pares em um só bloco
+                with perfilador.etapa("descendentes"):
+                    descendentes = montar_descendentes(cromossomos[indices_pais],
+                                                       cromossomos[indices_maes],
+                                                       als, genes_um, genes_dois)
+
+                # uma única chamada matricial às funções ces_* para todos os descendentes
+                with perfilador.etapa("avaliacao"):
+                    retornos_descendentes, riscos_descendentes, fitnesses_descendentes = \
+                        avaliar_cromossomos(descendentes, medias, matriz_covariancia, cache)
+
+        with perfilador.etapa("substituicao"):
+            indices_sobreviventes = selecionar_sobreviventes(
+                qtd_croms_populacao_geral, np.concatenate([fitnesses, fitnesses_descendentes]))
+
+            if selecao_operadores is not None:
+                selecao_operadores.atualizar(operadores, fitnesses_descendentes,
+                                             fitnesses.max())
+
+            cromossomos = np.concatenate([cromossomos, descendentes])[indices_sobreviventes]
+            retornos = np.concatenate([retornos, retornos_descendentes])[indices_sobreviventes]
+            riscos = np.concatenate([riscos, riscos_descendentes])[indices_sobreviventes]
+            fitnesses = np.concatenate([fitnesses,
+                                        fitnesses_descendentes])[indices_sobreviventes]
+
+            if risco_incremental:
+                produtos = np.concatenate([produtos,
+                                           produtos_descendentes])[indices_sobreviventes]
+
+        if historico is not None:
+            historico.registrar(cromossomos, fitnesses)
+
+        if parada is not None and parada.deve_parar(fitnesses.max()):
+            break
+
+    if risco_incremental:
+        # recalcula exatamente a população final, descartando o acúmulo de
+        # arredondamentos das atualizações incrementais
+        retornos, riscos, fitnesses = avaliar_cromossomos(cromossomos, medias,
+                                                          matriz_covariancia)
+
+    return cromossomos, retornos, riscos, fitnesses
+
+
+def executar_ag_reinicios(medias: np.ndarray, matriz_covariancia: np.ndarray,
+                          qtd_iteracoes: int, qtd_epocas: int,
+                          qtd_croms_populacao_geral: int, qtd_reinicios: int,
+                          selecao: str = "roleta", tamanho_torneio: int = 3,
+                          seed=None, parada: CriterioParada = None,
+                          historico: HistoricoAG = None,
+                          perfilador: Perfilador = None) -> tuple[np.ndarray, np.ndarray,
+                                                                  np.ndarray, np.ndarray]:
+    """
+    Função que executa 'qtd_reinicios' rodadas independentes do modo geracional ao
+    mesmo tempo. As populações ficam em um único tensor (qtd_reinicios,
+    qtd_croms_populacao_geral, qtd_genes) e os descendentes de todas elas são
+    avaliados com uma só chamada às funções ces_* (einsum contra a matriz de
+    covariância compartilhada). Cada população só cruza e compete com ela mesma.
+
+    Args:
+    - medias: array com as médias dos retornos dos ativos
+    - matriz_covariancia: array com a matriz de covariância dos retornos dos ativos
+    - qtd_iteracoes: quantidade de pares de pais (iterações) em cada época
+    - qtd_epocas: quantidade de épocas
+    - qtd_croms_populacao_geral: quantidade de cromossomos em cada população
+    - qtd_reinicios: quantidade de populações independentes
+    - selecao: método de seleção dos pais ('roleta', 'torneio' ou 'sus')
+    - tamanho_torneio: quantidade de cromossomos em cada torneio
+    - seed: semente (int, np.random.SeedSequence ou np.random.Generator)
+    - parada: critério de parada antecipada (ver ag.convergencia.CriterioParada);
+      None executa todas as épocas
+    - historico: objeto que recebe o melhor fitness, o fitness médio e a
+      diversidade de cada época (ver ag.convergencia.HistoricoAG)
+    - perfilador: perfilador que mede o tempo de cada etapa (ver ag.perfilador.Perfilador)
+
+    Returns:
+    - cromossomos: array (qtd_reinicios, qtd_croms_populacao_geral, qtd_genes) com as
+      populações finais
+    - retornos: array (qtd_reinicios, qtd_croms_populacao_geral) com os retornos
+    - riscos: array (qtd_reinicios, qtd_croms_populacao_geral) com os riscos
+    - fitnesses: array (qtd_reinicios, qtd_croms_populacao_geral) com os fitnesses
+    """
+
+    gerador = np.random.default_rng(seed)
+    qtd_genes = medias.shape[0]
+    formato_populacoes = (qtd_reinicios, qtd_croms_populacao_geral)
+
+    if perfilador is None:
+        perfilador = PERFILADOR_NULO
+
+    # as populações iniciais são geradas como um único bloco e separadas por reinício
+    with perfilador.etapa("populacao_inicial"):
+        cromossomos, retornos, riscos, fitnesses = \
+            gerar_cromossomos_base_np(qtd_reinicios * qtd_croms_populacao_geral, medias,
+                                      matriz_covariancia, gerador)
+    cromossomos = cromossomos.reshape(formato_populacoes + (qtd_genes,))
+    retornos = retornos.reshape(formato_populacoes)
+    riscos = riscos.reshape(formato_populacoes)
+    fitnesses = fitnesses.reshape(formato_populacoes)
+
+    reinicios = np.arange(qtd_reinicios)[:, np.newaxis]
+
+    for _ in range(qtd_epocas):
+
+        qtd_pares = qtd_reinicios * qtd_iteracoes
+
+        with perfilador.etapa("selecao"):
+            # a seleção usa os fitnesses de cada população separadamente
+            pares = [selecionar_pares(fitnesses[reinicio], qtd_iteracoes, gerador,
+                                      selecao, tamanho_torneio)
+                     for reinicio in range(qtd_reinicios)]
+            indices_pais = np.stack([indices for indices, _ in pares])
+            indices_maes = np.stack([indices for _, indices in pares])
+
+            als = gerador.random((2, qtd_pares))
+            genes_um = sortear_genes_lote(2 * qtd_pares, qtd_genes, gerador)
+            genes_dois = sortear_genes_lote(2 * qtd_pares, qtd_genes, gerador)
+
+        with perfilador.etapa("descendentes"):
+            # os pares de todas as populações são cruzados e mutados em um único bloco
+            descendentes = montar_descendentes(
+                cromossomos[reinicios, indices_pais].reshape(qtd_pares, qtd_genes),
+                cromossomos[reinicios, indices_maes].reshape(qtd_pares, qtd_genes),
+                als, genes_um, genes_dois)
+
+            # o bloco tem 8 fatias (filhos e mutantes) de qtd_reinicios * qtd_iteracoes
+            # linhas; as fatias são reagrupadas por população
+            descendentes = descendentes.reshape(8, qtd_reinicios, qtd_iteracoes, qtd_genes)
+            descendentes = descendentes.transpose(1, 0, 2, 3).reshape(
+                qtd_reinicios, 8 * qtd_iteracoes, qtd_genes)
+
+        with perfilador.etapa("avaliacao"):
+            retornos_descendentes, riscos_descendentes, fitnesses_descendentes = \
+                avaliar_cromossomos(descendentes, medias, matriz_covariancia)
+
+        # substituição elitista dentro de cada população
+        with perfilador.etapa("substituicao"):
+            fitnesses_todos = np.concatenate([fitnesses, fitnesses_descendentes], axis=1)
+            indices_sobreviventes = np.argpartition(
+                -fitnesses_todos, qtd_croms_populacao_geral - 1,
+                axis=1)[:, :qtd_croms_populacao_geral]
+
+            cromossomos = np.concatenate([cromossomos, descendentes],
+                                         axis=1)[reinicios, indices_sobreviventes]
+            retornos = np.take_along_axis(
+                np.concatenate([retornos, retornos_descendentes], axis=1),
+                indices_sobreviventes, axis=1)
+            riscos = np.take_along_axis(np.concatenate([riscos, riscos_descendentes], axis=1),
+                                        indices_sobreviventes, axis=1)
+            fitnesses = np.take_along_axis(fitnesses_todos, indices_sobreviventes, axis=1)
+
+        if historico is not None:
+            historico.registrar(cromossomos, fitnesses)
+
+        if parada is not None and parada.deve_parar(fitnesses.max()):
+            break
+
+    return cromossomos, retornos, riscos, fitnesses
+
+
+def executar_ag_janelas(medias: np.ndarray, matrizes_covariancia: np.ndarray,
+                        qtd_genes_janelas: np.ndarray, qtd_iteracoes: int, qtd_epocas: int,
+                        qtd_croms_populacao_geral: int, selecao: str = "roleta",
+                        tamanho_torneio: int = 3, seed=None, paradas: list = None,
+                        perfilador: Perfilador = None) -> tuple[np.ndarray, np.ndarray,
+                                                                np.ndarray, np.ndarray]:
+    """
+    Função que executa o modo geracional para várias janelas (por exemplo, as rodadas
+    de um backteste) ao mesmo tempo. Cada janela tem as suas médias, a sua matriz de
+    covariância e a sua população; as janelas com menos ações são completadas com
+    genes de preenchimento (média e covariância zero) depois dos genes válidos. As
+    populações ficam em um único tensor (qtd_janelas, qtd_croms_populacao_geral,
+    qtd_genes) e os descendentes de todas as janelas são avaliados com uma só chamada
+    às funções ces_*. Os genes de preenchimento começam com peso zero e as mutações só
+    sorteiam genes válidos de cada janela, então eles nunca recebem peso.
+
+    Com critérios de parada, cada janela tem o seu: quando ele para, a população da
+    janela é congelada e sai dos blocos das épocas seguintes, e o laço termina quando
+    todas as janelas param.
+
+    Args:
+    - medias: array (qtd_janelas, qtd_genes) com as médias dos retornos de cada janela
+    - matrizes_covariancia: array (qtd_janelas, qtd_genes, qtd_genes) com a matriz de
+      covariância de cada janela
+    - qtd_genes_janelas: array (qtd_janelas,) com a quantidade de genes válidos (pelo
+      menos 2) de cada janela
+    - qtd_iteracoes: quantidade de pares de pais (iterações) em cada época
+    - qtd_epocas: quantidade de épocas
+    - qtd_croms_populacao_geral: quantidade de cromossomos em cada população
+    - selecao: método de seleção dos pais ('roleta', 'torneio' ou 'sus')
+    - tamanho_torneio: quantidade de cromossomos em cada torneio
+    - seed: semente (int, np.random.SeedSequence ou np.random.Generator)
+    - paradas: lista com um critério de parada antecipada por janela (ver
+      ag.convergencia.CriterioParada); None executa todas as épocas
+    - perfilador: perfilador que mede o tempo de cada etapa (ver ag.perfilador.Perfilador)
+
+    Returns:
+    - cromossomos: array (qtd_janelas, qtd_croms_populacao_geral, qtd_genes) com as
+      populações finais (peso zero nos genes de preenchimento)
+    - retornos: array (qtd_janelas, qtd_croms_populacao_geral) com os retornos
+    - riscos: array (qtd_janelas, qtd_croms_populacao_geral) com os riscos
+    - fitnesses: array (qtd_janelas, qtd_croms_populacao_geral) com os fitnesses
+    """
+
+    gerador = np.random.default_rng(seed)
+    qtd_janelas, qtd_genes = medias.shape
+    qtd_genes_janelas = np.asarray(qtd_genes_janelas)
+
+    if np.any(qtd_genes_janelas < 2) or np.any(qtd_genes_janelas > qtd_genes):
+        raise ValueError("Cada janela deve ter entre 2 e qtd_genes genes válidos.")
+
+    if paradas is not None and len(paradas) != qtd_janelas:
+        raise ValueError("Deve haver um critério de parada por janela.")
+
+    if perfilador is None:
+        perfilador = PERFILADOR_NULO
+
+    # máscara (qtd_janelas, 1, qtd_genes) dos genes válidos de cada janela
+    mascara = (np.arange(qtd_genes) < qtd_genes_janelas[:, np.newaxis])[:, np.newaxis, :]
+
+    with perfilador.etapa("populacao_inicial"):
+        carteiras = gerador.integers(low=0, high=10,
+                                     size=(qtd_janelas, qtd_croms_populacao_geral, qtd_genes))
+        carteiras = carteiras * mascara
+
+        # carteiras sem nenhum peso sorteado ficam com pesos iguais nos genes válidos
+        carteiras = np.where(carteiras.sum(axis=2, keepdims=True) == 0, mascara, carteiras)
+        cromossomos = (carteiras / carteiras.sum(axis=2, keepdims=True)).astype(medias.dtype)
+
+        retornos, riscos, fitnesses = avaliar_cromossomos(cromossomos, medias,
+                                                          matrizes_covariancia)
+
+    if paradas is not None:
+        for parada in paradas:
+            parada.iniciar()
+
+        # as janelas paradas guardam aqui as suas populações finais
+        resultados = [np.empty_like(cromossomos), np.empty_like(retornos),
+                      np.empty_like(riscos), np.empty_like(fitnesses)]
+
+    # índices originais das janelas que ainda evoluem
+    ativas = np.arange(qtd_janelas)
+
+    janelas = np.arange(qtd_janelas)[:, np.newaxis]
+
+    # quantidade de genes válidos de cada linha dos blocos de mutação, que seguem a
+    # ordem (fatia, janela, iteração) dos filhos de montar_descendentes
+    qtd_genes_mutacao = np.tile(np.repeat(qtd_genes_janelas, qtd_iteracoes), 2)
+
+    for _ in range(qtd_epocas):
+
+        qtd_pares = qtd_janelas * qtd_iteracoes
+
+        with perfilador.etapa("selecao"):
+            # a seleção usa os fitnesses de cada janela separadamente
+            pares = [selecionar_pares(fitnesses[janela], qtd_iteracoes, gerador,
+                                      selecao, tamanho_torneio)
+                     for janela in range(qtd_janelas)]
+            indices_pais = np.stack([indices for indices, _ in pares])
+            indices_maes = np.stack([indices for _, indices in pares])
+
+            als = gerador.random((2, qtd_pares))
+            genes_um = sortear_genes_lote(2 * qtd_pares, qtd_genes_mutacao, gerador)
+            genes_dois = sortear_genes_lote(2 * qtd_pares, qtd_genes_mutacao, gerador)
+
+        with perfilador.etapa("descendentes"):
+            descendentes = montar_descendentes(
+                cromossomos[janelas, indices_pais].reshape(qtd_pares, qtd_genes),
+                cromossomos[janelas, indices_maes].reshape(qtd_pares, qtd_genes),
+                als, genes_um, genes_dois)
+
+            # as 8 fatias de qtd_janelas * qtd_iteracoes linhas são reagrupadas por janela
+            descendentes = descendentes.reshape(8, qtd_janelas, qtd_iteracoes, qtd_genes)
+            descendentes = descendentes.transpose(1, 0, 2, 3).reshape(
+                qtd_janelas, 8 * qtd_iteracoes, qtd_genes)
+
+        with perfilador.etapa("avaliacao"):
+            retornos_descendentes, riscos_descendentes, fitnesses_descendentes = \
+                avaliar_cromossomos(descendentes, medias, matrizes_covariancia)
+
+        # substituição elitista dentro de cada janela
+        with perfilador.etapa("substituicao"):
+            fitnesses_todos = np.concatenate([fitnesses, fitnesses_descendentes], axis=1)
+            indices_sobreviventes = np.argpartition(
+                -fitnesses_todos, qtd_croms_populacao_geral - 1,
+                axis=1)[:, :qtd_croms_populacao_geral]
+
+            cromossomos = np.concatenate([cromossomos, descendentes],
+                                         axis=1)[janelas, indices_sobreviventes]
+            retornos = np.take_along_axis(
+                np.concatenate([retornos, retornos_descendentes], axis=1),
+                indices_sobreviventes, axis=1)
+            riscos = np.take_along_axis(np.concatenate([riscos, riscos_descendentes], axis=1),
+                                        indices_sobreviventes, axis=1)
+            fitnesses = np.take_along_axis(fitnesses_todos, indices_sobreviventes, axis=1)
+
+        if paradas is None:
+            continue
+
+        paradas_epoca = np.array([paradas[janela].deve_parar(fitnesses[posicao].max())
+                                  for posicao, janela in enumerate(ativas.tolist())])
+
+        if paradas_epoca.any():
+            # as janelas paradas guardam as suas populações e saem dos blocos
+            for resultado, valores in zip(resultados,
+                                          (cromossomos, retornos, riscos, fitnesses)):
+                resultado[ativas[paradas_epoca]] = valores[paradas_epoca]
+
+            continuam = ~paradas_epoca
+            ativas = ativas[continuam]
+            cromossomos, retornos, riscos, fitnesses = (
+                cromossomos[continuam], retornos[continuam], riscos[continuam],
+                fitnesses[continuam])
+            if len(ativas) == 0:
+                break
+
+            medias, matrizes_covariancia = medias[continuam], matrizes_covariancia[continuam]
+
+            qtd_janelas = len(ativas)
+            janelas = np.arange(qtd_janelas)[:, np.newaxis]
+            qtd_genes_mutacao = np.tile(np.repeat(qtd_genes_janelas[ativas],
+                                                  qtd_iteracoes), 2)
+
+    if paradas is None:
+        return cromossomos, retornos, riscos, fitnesses
+
+    for resultado, valores in zip(resultados, (cromossomos, retornos, riscos, fitnesses)):
+        resultado[ativas] = valores
+
+    return tuple(resultados)
+
+
+def cromossomo_para_series(acoes: list, cromossomo: np.ndarray, retorno: float,
+                           risco: float, fitness: float, nome=None) -> pd.Series:
+    """
+    Função que converte um cromossomo do motor numpy para o formato rotulado
+    (ações + 'Retornos', 'Riscos' e 'Fitnesses') retornado pelo moneta_ag.
+
+    Args:
+    - acoes: lista com os nomes dos ativos
+    - cromossomo: array com os genes do cromossomo
+    - retorno: retorno do cromossomo
+    - risco: risco do cromossomo
+    - fitness: fitness do cromossomo
+    - nome: nome (índice) do cromossomo na população
+
+    Returns:
+    - series_cromossomo: pd.Series com os genes e as métricas do cromossomo
+    """
+
+    valores = np.concatenate([cromossomo, [retorno, risco, fitness]])
+
+    return pd.Series(data=valores, index=list(acoes) + ["Retornos", "Riscos", "Fitnesses"],
+                     name=nome)
+
+
+def populacao_para_dataframe(acoes: list, cromossomos: np.ndarray, retornos: np.ndarray,
+                             riscos: np.ndarray, fitnesses: np.ndarray) -> pd.DataFrame:
+    """
+    Função que converte uma população do motor numpy para o formato rotulado (uma linha
+    por cromossomo, com as ações + 'Retornos', 'Riscos' e 'Fitnesses'), do melhor para
+    o pior fitness. É o formato aceito pelo moneta_ag em 'cromossomos_semente'.
+
+    Args:
+    - acoes: lista com os nomes dos ativos
+    - cromossomos: array (qtd_cromossomos, qtd_genes) com os genes da população
+    - retornos: array com os retornos da população
+    - riscos: array com os riscos da população
+    - fitnesses: array com os fitnesses da população
+
+    Returns:
+    - populacao: pd.DataFrame com os genes e as métricas de cada cromossomo
+    """
+
+    populacao = pd.DataFrame(cromossomos, columns=list(acoes))
+    populacao["Retornos"] = retornos
+    populacao["Riscos"] = riscos
+    populacao["Fitnesses"] = fitnesses
+
+    return populacao.sort_values("Fitnesses", ascending=False, kind="stable")
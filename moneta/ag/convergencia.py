@@ -0,0 +1,142 @@
+import time
+import numpy as np
+import pandas as pd
+
+
+class CriterioParada:
+    """
+    Regras de parada antecipada do algoritmo genético. A cada época o motor informa
+    o melhor fitness da população e o critério decide se a execução deve parar:
+    - estagnação: 'epocas_estagnacao' épocas seguidas sem melhoria relativa do
+      melhor fitness maior que 'tolerancia_melhoria'
+    - tempo: 'tempo_maximo' segundos desde o início da execução
+
+    Os motivos possíveis de parada são 'estagnacao', 'tempo' ou None (a execução
+    foi até a última época).
+    """
+
+    def __init__(self, epocas_estagnacao: int = None, tolerancia_melhoria: float = 0.0,
+                 tempo_maximo: float = None):
+        """
+        Args:
+        - epocas_estagnacao: quantidade de épocas seguidas sem melhoria para parar
+          (None desliga a regra)
+        - tolerancia_melhoria: melhoria relativa mínima do melhor fitness para que a
+          época conte como melhoria (0.0 aceita qualquer melhoria)
+        - tempo_maximo: tempo máximo de execução, em segundos (None desliga a regra)
+        """
+
+        if epocas_estagnacao is not None and epocas_estagnacao < 1:
+            raise ValueError("A quantidade de épocas de estagnação deve ser pelo menos 1.")
+
+        if tolerancia_melhoria < 0:
+            raise ValueError("A tolerância de melhoria não pode ser negativa.")
+
+        self.epocas_estagnacao = epocas_estagnacao
+        self.tolerancia_melhoria = tolerancia_melhoria
+        self.tempo_maximo = tempo_maximo
+        self.iniciar()
+
+    def iniciar(self):
+        """
+        Reinicia o relógio e a contagem de estagnação para uma nova execução.
+        """
+
+        self.inicio = time.perf_counter()
+        self.melhor_fitness = -np.inf
+        self.epocas_sem_melhoria = 0
+        self.motivo = None
+
+    def deve_parar(self, melhor_fitness: float) -> bool:
+        """
+        Atualiza o critério com o melhor fitness da época e informa se o AG deve parar.
+
+        Args:
+        - melhor_fitness: melhor fitness da população ao final da época
+
+        Returns:
+        - bool: True se alguma regra de parada foi atingida
+        """
+
+        # os fitnesses são positivos, então a melhoria relativa é um limiar multiplicativo
+        if melhor_fitness > self.melhor_fitness * (1 + self.tolerancia_melhoria):
+            self.melhor_fitness = melhor_fitness
+            self.epocas_sem_melhoria = 0
+        else:
+            self.epocas_sem_melhoria += 1
+
+        if self.epocas_estagnacao is not None and \
+           self.epocas_sem_melhoria >= self.epocas_estagnacao:
+            self.motivo = "estagnacao"
+        elif self.tempo_maximo is not None and \
+             time.perf_counter() - self.inicio >= self.tempo_maximo:
+            self.motivo = "tempo"
+
+        return self.motivo is not None
+
+
+class HistoricoAG:
+    """
+    Histórico por época do algoritmo genético: melhor fitness, fitness médio e
+    diversidade da população (desvio padrão médio dos genes; com várias populações,
+    a média das diversidades de cada uma). Os valores ficam em
+    arrays pré-alocados com 'qtd_epocas' posições, preenchidos apenas até a última
+    época executada.
+    """
+
+    def __init__(self, qtd_epocas: int):
+        """
+        Args:
+        - qtd_epocas: quantidade máxima de épocas da execução
+        """
+
+        self._melhores = np.full(qtd_epocas, np.nan)
+        self._medias = np.full(qtd_epocas, np.nan)
+        self._diversidades = np.full(qtd_epocas, np.nan)
+        self.qtd_epocas = 0
+        self.motivo_parada = None
+
+    def registrar(self, cromossomos: np.ndarray, fitnesses: np.ndarray):
+        """
+        Registra os valores da população ao final de uma época.
+
+        Args:
+        - cromossomos: array (qtd_cromossomos, qtd_genes) com a população, ou
+          (qtd_populacoes, qtd_cromossomos, qtd_genes) com várias populações
+        - fitnesses: array com os fitnesses da população
+        """
+
+        epoca = self.qtd_epocas
+
+        self._melhores[epoca] = fitnesses.max()
+        self._medias[epoca] = fitnesses.mean()
+        self._diversidades[epoca] = cromossomos.std(axis=-2).mean()
+        self.qtd_epocas += 1
+
+    @property
+    def melhores(self) -> np.ndarray:
+        """Array com o melhor fitness de cada época executada."""
+        return self._melhores[:self.qtd_epocas]
+
+    @property
+    def medias(self) -> np.ndarray:
+        """Array com o fitness médio de cada época executada."""
+        return self._medias[:self.qtd_epocas]
+
+    @property
+    def diversidades(self) -> np.ndarray:
+        """Array com a diversidade de cada época executada."""
+        return self._diversidades[:self.qtd_epocas]
+
+    def para_dataframe(self) -> pd.DataFrame:
+        """
+        Retorna o histórico em um DataFrame, com uma linha por época executada.
+
+        Returns:
+        - pd.DataFrame: colunas 'Melhor Fitness', 'Fitness Medio' e 'Diversidade'
+        """
+
+        return pd.DataFrame({"Melhor Fitness": self.melhores,
+                             "Fitness Medio": self.medias,
+                             "Diversidade": self.diversidades},
+                            index=pd.RangeIndex(self.qtd_epocas, name="epoca"))
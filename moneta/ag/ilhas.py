@@ -0,0 +1,187 @@
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from ag.ag_numpy import (gerar_cromossomos_base_np, evoluir_estacionario,
+                         evoluir_geracional)
+from utilidades.gerais import gerar_geradores_filhos
+
+# médias e covariância compartilhadas por todas as ilhas de um processo. São
+# enviadas uma única vez para cada processo (no 'initializer' do pool), e não
+# a cada rodada de épocas
+_medias_processo = None
+_matriz_covariancia_processo = None
+
+
+def iniciar_processo_ilha(medias: np.ndarray, matriz_covariancia: np.ndarray):
+    """
+    Função executada uma vez em cada processo do pool para guardar as médias e a
+    matriz de covariância usadas por todas as ilhas.
+
+    Args:
+    - medias: array com as médias dos retornos dos ativos
+    - matriz_covariancia: array com a matriz de covariância dos retornos dos ativos
+    """
+
+    global _medias_processo, _matriz_covariancia_processo
+    _medias_processo = medias
+    _matriz_covariancia_processo = matriz_covariancia
+
+
+def evoluir_ilha(ilha: tuple, qtd_iteracoes: int, qtd_epocas: int, modo: str,
+                 risco_incremental: bool, selecao: str, tamanho_torneio: int) -> tuple:
+    """
+    Função que evolui uma ilha por 'qtd_epocas' épocas, dentro de um processo do pool.
+    O gerador da ilha viaja junto com a população, então o resultado não depende
+    do processo que executou a ilha.
+
+    Args:
+    - ilha: tupla (cromossomos, retornos, riscos, fitnesses, gerador) da ilha
+    - qtd_iteracoes: quantidade de iterações para cada época
+    - qtd_epocas: quantidade de épocas desta rodada
+    - modo: 'estacionario' ou 'geracional'
+    - risco_incremental: se True, calcula os riscos dos descendentes em O(n)
+    - selecao: método de seleção dos pais ('roleta', 'torneio' ou 'sus')
+    - tamanho_torneio: quantidade de cromossomos em cada torneio
+
+    Returns:
+    - ilha: tupla (cromossomos, retornos, riscos, fitnesses, gerador) evoluída
+    """
+
+    cromossomos, retornos, riscos, fitnesses, gerador = ilha
+    evoluir = evoluir_geracional if modo == "geracional" else evoluir_estacionario
+
+    cromossomos, retornos, riscos, fitnesses = \
+        evoluir(cromossomos, retornos, riscos, fitnesses, _medias_processo,
+                _matriz_covariancia_processo, qtd_iteracoes, qtd_epocas, gerador,
+                risco_incremental, selecao, tamanho_torneio)
+
+    return cromossomos, retornos, riscos, fitnesses, gerador
+
+
+def migrar_melhores(ilhas: list, qtd_migrantes: int) -> list:
+    """
+    Função que faz a migração em anel: os 'qtd_migrantes' melhores cromossomos de
+    cada ilha substituem os piores cromossomos da ilha seguinte.
+
+    Args:
+    - ilhas: lista de tuplas (cromossomos, retornos, riscos, fitnesses, gerador)
+    - qtd_migrantes: quantidade de cromossomos que migram de cada ilha
+
+    Returns:
+    - ilhas: lista de ilhas após a migração
+    """
+
+    # os migrantes são copiados antes de qualquer substituição, para que um
+    # cromossomo não atravesse duas ilhas na mesma migração
+    migrantes = []
+    for cromossomos, retornos, riscos, fitnesses, _ in ilhas:
+        melhores = np.argsort(-fitnesses, kind="stable")[:qtd_migrantes]
+        migrantes.append((cromossomos[melhores], retornos[melhores],
+                          riscos[melhores], fitnesses[melhores]))
+
+    for indice_ilha, (cromossomos, retornos, riscos, fitnesses, _) in enumerate(ilhas):
+        cromossomos_mig, retornos_mig, riscos_mig, fitnesses_mig = migrantes[indice_ilha - 1]
+        piores = np.argsort(fitnesses, kind="stable")[:qtd_migrantes]
+
+        cromossomos[piores] = cromossomos_mig
+        retornos[piores] = retornos_mig
+        riscos[piores] = riscos_mig
+        fitnesses[piores] = fitnesses_mig
+
+    return ilhas
+
+
+def executar_ag_ilhas(medias: np.ndarray, matriz_covariancia: np.ndarray,
+                      qtd_iteracoes: int, qtd_epocas: int,
+                      qtd_croms_populacao_geral: int, qtd_ilhas: int = 4,
+                      intervalo_migracao: int = 5, qtd_migrantes: int = 1,
+                      qtd_processos: int = None, modo: str = "estacionario",
+                      risco_incremental: bool = False, selecao: str = "roleta",
+                      tamanho_torneio: int = 3, seed=None) -> tuple[np.ndarray, np.ndarray,
+                                                                    np.ndarray, np.ndarray]:
+    """
+    Função que executa o algoritmo genético no modelo de ilhas: 'qtd_ilhas'
+    subpopulações evoluem de forma independente (cada uma com o seu gerador,
+    derivado da semente com SeedSequence.spawn) em processos separados e, a cada
+    'intervalo_migracao' épocas, os melhores cromossomos de cada ilha migram para
+    a ilha seguinte. Para uma mesma semente, o resultado é o mesmo qualquer que
+    seja a quantidade de processos.
+
+    Args:
+    - medias: array com as médias dos retornos dos ativos
+    - matriz_covariancia: array com a matriz de covariância dos retornos dos ativos
+    - qtd_iteracoes: quantidade de iterações para cada época
+    - qtd_epocas: quantidade de épocas
+    - qtd_croms_populacao_geral: quantidade de cromossomos em cada ilha
+    - qtd_ilhas: quantidade de ilhas (subpopulações)
+    - intervalo_migracao: quantidade de épocas entre duas migrações
+    - qtd_migrantes: quantidade de cromossomos que migram de cada ilha
+    - qtd_processos: quantidade de processos do pool (None usa um processo por
+      ilha, limitado pela quantidade de núcleos; 1 roda tudo no processo atual)
+    - modo: 'estacionario' ou 'geracional'
+    - risco_incremental: se True, calcula os riscos dos descendentes em O(n)
+    - selecao: método de seleção dos pais ('roleta', 'torneio' ou 'sus')
+    - tamanho_torneio: quantidade de cromossomos em cada torneio
+    - seed: semente (int, np.random.SeedSequence ou np.random.Generator)
+
+    Returns:
+    - cromossomos: array (qtd_ilhas * qtd_croms_populacao_geral, qtd_genes) com as
+      populações finais de todas as ilhas, empilhadas na ordem das ilhas
+    - retornos: array com os retornos das populações finais
+    - riscos: array com os riscos das populações finais
+    - fitnesses: array com os fitnesses das populações finais
+    """
+
+    if qtd_ilhas < 1:
+        raise ValueError("A quantidade de ilhas deve ser pelo menos 1.")
+
+    if intervalo_migracao < 1:
+        raise ValueError("O intervalo de migração deve ser pelo menos 1 época.")
+
+    if not 0 <= qtd_migrantes < qtd_croms_populacao_geral:
+        raise ValueError("A quantidade de migrantes deve ser menor que a população de cada ilha.")
+
+    geradores = gerar_geradores_filhos(seed, qtd_ilhas)
+
+    ilhas = [gerar_cromossomos_base_np(qtd_croms_populacao_geral, medias,
+                                       matriz_covariancia, gerador) + (gerador,)
+             for gerador in geradores]
+
+    # as épocas são divididas em rodadas de 'intervalo_migracao' épocas
+    rodadas = [intervalo_migracao] * (qtd_epocas // intervalo_migracao)
+    if qtd_epocas % intervalo_migracao:
+        rodadas.append(qtd_epocas % intervalo_migracao)
+
+    # com um único processo as ilhas rodam em sequência no processo atual
+    if qtd_processos == 1:
+        iniciar_processo_ilha(medias, matriz_covariancia)
+        executor = None
+    else:
+        qtd_processos = qtd_processos or min(qtd_ilhas, os.cpu_count() or 1)
+        executor = ProcessPoolExecutor(max_workers=qtd_processos,
+                                       initializer=iniciar_processo_ilha,
+                                       initargs=(medias, matriz_covariancia))
+
+    try:
+        for indice_rodada, qtd_epocas_rodada in enumerate(rodadas):
+            argumentos = (qtd_iteracoes, qtd_epocas_rodada, modo, risco_incremental,
+                          selecao, tamanho_torneio)
+
+            if executor is None:
+                ilhas = [evoluir_ilha(ilha, *argumentos) for ilha in ilhas]
+            else:
+                futuros = [executor.submit(evoluir_ilha, ilha, *argumentos)
+                           for ilha in ilhas]
+                ilhas = [futuro.result() for futuro in futuros]
+
+            # não há migração depois da última rodada
+            if qtd_ilhas > 1 and qtd_migrantes and indice_rodada < len(rodadas) - 1:
+                ilhas = migrar_melhores(ilhas, qtd_migrantes)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    cromossomos, retornos, riscos, fitnesses, _ = zip(*ilhas)
+
+    return (np.concatenate(cromossomos), np.concatenate(retornos),
+            np.concatenate(riscos), np.concatenate(fitnesses))
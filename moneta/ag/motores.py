@@ -0,0 +1,372 @@
+import warnings
+import numpy as np
+import pandas as pd
+from ag.ag import executar_ag_pandas
+from ag.ag_numpy import executar_ag_numpy, executar_ag_geracional, executar_ag_reinicios
+from ag.ag_esparso import executar_ag_esparso, esparsos_para_densos
+from ag.ag_numba import executar_ag_numba, NUMBA_DISPONIVEL, SELECOES_NUMBA
+from ag.ilhas import executar_ag_ilhas
+from ag.convergencia import CriterioParada, HistoricoAG
+from ag.operadores import SelecaoOperadores
+from ag.perfilador import Perfilador, PERFILADOR_NULO
+from ag.selecao import METODOS_SELECAO
+from ces.cache import CacheFitness
+
+MODOS = ["estacionario", "geracional"]
+
+
+class MotorNumpy:
+    """
+    Motor numpy de uma única população, mantida em arrays contíguos. Para uma mesma
+    semente, produz a mesma carteira do MotorPandas no modo 'estacionario'.
+
+    Cada motor recebe no construtor apenas as opções que ele suporta, e os atributos
+    de classe dizem quais opções comuns do moneta_ag ele aceita: 'selecoes' (métodos
+    de seleção), 'suporta_parada' (critério de parada e histórico por época),
+    'suporta_sementes' (cromossomos semente), 'suporta_fatorial' (modelo de
+    covariância 'fatorial') e 'dtype_fixo' (precisão imposta ao motor; None aceita
+    float64 e float32). Todos os motores têm o método 'executar', com a mesma
+    assinatura.
+    """
+
+    selecoes = METODOS_SELECAO
+    suporta_parada = True
+    suporta_sementes = True
+    suporta_fatorial = True
+    dtype_fixo = None
+
+    def __init__(self, modo: str = "estacionario", risco_incremental: bool = False,
+                 tamanho_cache: int = 0, precisao_cache: int = 10,
+                 operadores_adaptativos: bool = False):
+        """
+        Args:
+        - modo: 'estacionario' substitui o pior pai pelo melhor filho a cada iteração;
+          'geracional' gera e avalia todos os descendentes de uma época em um único bloco
+        - risco_incremental: se True, guarda Σw de cada cromossomo e calcula o risco dos
+          filhos e mutantes em O(n) em vez de O(n²); indicado para universos grandes
+        - tamanho_cache: capacidade do cache de fitnesses dos descendentes (0 desliga o
+          cache; ver ces.cache.CacheFitness). Só compensa em universos grandes com
+          muitos acertos
+        - precisao_cache: casas decimais dos pesos usadas na chave do cache; em float32
+          a chave usa no máximo 6 casas (a resolução do float32)
+        - operadores_adaptativos: se True, cada descendente é gerado por um operador
+          sorteado com probabilidades que perseguem o operador de maior taxa de
+          sucesso (ver ag.operadores.SelecaoOperadores)
+        """
+
+        if modo not in MODOS:
+            raise ValueError(f"O modo '{modo}' não existe. Opções: {MODOS}.")
+
+        # o risco incremental troca a avaliação completa, usada pelo cache e pelos
+        # operadores adaptativos
+        if risco_incremental and (tamanho_cache or operadores_adaptativos):
+            raise ValueError("O risco incremental não suporta o cache nem os operadores "
+                             "adaptativos.")
+
+        self.modo = modo
+        self.risco_incremental = risco_incremental
+        self.tamanho_cache = tamanho_cache
+        self.precisao_cache = precisao_cache
+        self.operadores_adaptativos = operadores_adaptativos
+
+    @property
+    def qtd_populacoes(self) -> int:
+        """Quantidade de populações evoluídas pelo motor."""
+        return 1
+
+    def executar(self, medias: np.ndarray, matriz_covariancia: np.ndarray,
+                 qtd_iteracoes: int, qtd_epocas: int, qtd_croms_populacao_geral: int,
+                 selecao: str = "roleta", tamanho_torneio: int = 3, seed=None,
+                 parada: CriterioParada = None, historico: HistoricoAG = None,
+                 perfilador: Perfilador = None,
+                 cromossomos_semente: np.ndarray = None) -> tuple[np.ndarray, np.ndarray,
+                                                                   np.ndarray, np.ndarray,
+                                                                   dict]:
+        """
+        Executa o algoritmo genético.
+
+        Args:
+        - medias: array com as médias dos retornos dos ativos
+        - matriz_covariancia: array com a matriz de covariância dos retornos dos ativos
+          (ou o modelo fatorial, ver ces.covariancia.CovarianciaFatorial)
+        - qtd_iteracoes: quantidade de iterações (pares de pais) em cada época
+        - qtd_epocas: quantidade de épocas
+        - qtd_croms_populacao_geral: quantidade de cromossomos em cada população
+        - selecao: método de seleção dos pais (um de 'selecoes')
+        - tamanho_torneio: quantidade de cromossomos em cada torneio
+        - seed: semente (int, np.random.SeedSequence ou np.random.Generator)
+        - parada: critério de parada antecipada (apenas se 'suporta_parada')
+        - historico: histórico por época (apenas se 'suporta_parada')
+        - perfilador: perfilador que mede o tempo de cada etapa
+        - cromossomos_semente: array (qtd_sementes, qtd_genes) com carteiras da
+          população inicial (apenas se 'suporta_sementes')
+
+        Returns:
+        - cromossomos: array (qtd_cromossomos, qtd_genes) com as populações finais,
+          empilhadas
+        - retornos: array com os retornos das populações finais
+        - riscos: array com os riscos das populações finais
+        - fitnesses: array com os fitnesses das populações finais
+        - detalhes: dicionário com os detalhes próprios do motor
+        """
+
+        executar_ag = executar_ag_geracional if self.modo == "geracional" else executar_ag_numpy
+
+        cache = CacheFitness(medias, matriz_covariancia, self.tamanho_cache,
+                             self.precisao_cache) if self.tamanho_cache else None
+
+        selecao_operadores = SelecaoOperadores() if self.operadores_adaptativos else None
+
+        cromossomos, retornos, riscos, fitnesses = \
+            executar_ag(medias, matriz_covariancia,
+                        qtd_iteracoes, qtd_epocas, qtd_croms_populacao_geral,
+                        risco_incremental=self.risco_incremental,
+                        selecao=selecao, tamanho_torneio=tamanho_torneio, seed=seed,
+                        parada=parada, historico=historico, cache=cache,
+                        perfilador=perfilador, cromossomos_semente=cromossomos_semente,
+                        selecao_operadores=selecao_operadores)
+
+        detalhes = {}
+
+        if selecao_operadores is not None:
+            detalhes["operadores"] = selecao_operadores.estatisticas()
+
+        if cache is not None:
+            detalhes["cache"] = cache.estatisticas()
+
+        return cromossomos, retornos, riscos, fitnesses, detalhes
+
+
+class MotorPandas(MotorNumpy):
+    """
+    Motor original, com a população em DataFrames, apenas no modo estacionário.
+    Mantido como referência do MotorNumpy; sempre calcula em float64.
+    """
+
+    suporta_parada = False
+    suporta_sementes = False
+    suporta_fatorial = False
+    dtype_fixo = np.float64
+
+    def __init__(self):
+        super().__init__()
+
+    def executar(self, medias, matriz_covariancia, qtd_iteracoes, qtd_epocas,
+                 qtd_croms_populacao_geral, selecao="roleta", tamanho_torneio=3,
+                 seed=None, parada=None, historico=None, perfilador=None,
+                 cromossomos_semente=None):
+        """Executa o algoritmo genético (ver MotorNumpy.executar)."""
+
+        # as posições das ações servem de rótulos; a população volta em arrays
+        acoes = list(range(medias.shape[0]))
+
+        cromossomos = executar_ag_pandas(acoes, pd.Series(medias, index=acoes),
+                                         pd.DataFrame(matriz_covariancia, index=acoes,
+                                                      columns=acoes),
+                                         qtd_iteracoes, qtd_epocas,
+                                         qtd_croms_populacao_geral,
+                                         selecao, tamanho_torneio, seed,
+                                         perfilador=perfilador)
+
+        return (cromossomos[acoes].to_numpy(), cromossomos["Retornos"].to_numpy(),
+                cromossomos["Riscos"].to_numpy(), cromossomos["Fitnesses"].to_numpy(), {})
+
+
+class MotorNumba(MotorNumpy):
+    """
+    Motor com o laço do modo estacionário compilado com numba.njit, sempre em
+    float64. É estatisticamente equivalente ao MotorNumpy, mas não reproduz a sua
+    carteira para a mesma semente. Sem o numba instalado, o MotorNumpy é usado no
+    lugar, com um aviso.
+    """
+
+    selecoes = SELECOES_NUMBA
+    suporta_sementes = False
+    suporta_fatorial = False
+    dtype_fixo = np.float64
+
+    def __init__(self):
+        super().__init__()
+
+    def executar(self, medias, matriz_covariancia, qtd_iteracoes, qtd_epocas,
+                 qtd_croms_populacao_geral, selecao="roleta", tamanho_torneio=3,
+                 seed=None, parada=None, historico=None, perfilador=None,
+                 cromossomos_semente=None):
+        """Executa o algoritmo genético (ver MotorNumpy.executar)."""
+
+        if not NUMBA_DISPONIVEL:
+            warnings.warn("O numba não está instalado; o moneta_ag vai usar o motor numpy.")
+            return super().executar(medias, matriz_covariancia, qtd_iteracoes, qtd_epocas,
+                                    qtd_croms_populacao_geral, selecao, tamanho_torneio,
+                                    seed, parada, historico, perfilador)
+
+        if perfilador is None:
+            perfilador = PERFILADOR_NULO
+
+        # o laço compilado não é dividido em etapas
+        with perfilador.etapa("evolucao"):
+            resultado = executar_ag_numba(medias, matriz_covariancia,
+                                          qtd_iteracoes, qtd_epocas, qtd_croms_populacao_geral,
+                                          selecao=selecao, tamanho_torneio=tamanho_torneio,
+                                          seed=seed, parada=parada, historico=historico)
+
+        return resultado + ({},)
+
+
+class MotorIlhas(MotorNumpy):
+    """
+    Modelo de ilhas do motor numpy: cada ilha (subpopulação de
+    'qtd_croms_populacao_geral' cromossomos) evolui em um processo e troca os seus
+    melhores cromossomos com a ilha seguinte (ver ag.ilhas.executar_ag_ilhas).
+    """
+
+    suporta_parada = False
+    suporta_sementes = False
+
+    def __init__(self, qtd_ilhas: int = 4, intervalo_migracao: int = 5,
+                 qtd_migrantes: int = 1, qtd_processos: int = None,
+                 modo: str = "estacionario", risco_incremental: bool = False):
+        """
+        Args:
+        - qtd_ilhas: quantidade de ilhas (subpopulações)
+        - intervalo_migracao: quantidade de épocas entre duas migrações entre ilhas
+        - qtd_migrantes: quantidade de cromossomos que migram de cada ilha
+        - qtd_processos: quantidade de processos para as ilhas (None usa um por ilha,
+          limitado pelos núcleos; 1 roda as ilhas no processo atual)
+        - modo: modo de cada ilha, 'estacionario' ou 'geracional' (ver MotorNumpy)
+        - risco_incremental: se True, calcula o risco dos descendentes em O(n)
+        """
+
+        super().__init__(modo, risco_incremental)
+
+        self.qtd_ilhas = qtd_ilhas
+        self.intervalo_migracao = intervalo_migracao
+        self.qtd_migrantes = qtd_migrantes
+        self.qtd_processos = qtd_processos
+
+    @property
+    def qtd_populacoes(self) -> int:
+        """Quantidade de populações evoluídas pelo motor."""
+        return self.qtd_ilhas
+
+    def executar(self, medias, matriz_covariancia, qtd_iteracoes, qtd_epocas,
+                 qtd_croms_populacao_geral, selecao="roleta", tamanho_torneio=3,
+                 seed=None, parada=None, historico=None, perfilador=None,
+                 cromossomos_semente=None):
+        """Executa o algoritmo genético (ver MotorNumpy.executar)."""
+
+        if perfilador is None:
+            perfilador = PERFILADOR_NULO
+
+        # as populações finais de todas as ilhas voltam empilhadas; o melhor
+        # cromossomo entre elas é o melhor global. As ilhas rodam em outros
+        # processos, então apenas o tempo total é medido
+        with perfilador.etapa("evolucao"):
+            resultado = executar_ag_ilhas(medias, matriz_covariancia,
+                                          qtd_iteracoes, qtd_epocas, qtd_croms_populacao_geral,
+                                          qtd_ilhas=self.qtd_ilhas,
+                                          intervalo_migracao=self.intervalo_migracao,
+                                          qtd_migrantes=self.qtd_migrantes,
+                                          qtd_processos=self.qtd_processos, modo=self.modo,
+                                          risco_incremental=self.risco_incremental,
+                                          selecao=selecao, tamanho_torneio=tamanho_torneio,
+                                          seed=seed)
+
+        return resultado + ({},)
+
+
+class MotorReinicios(MotorNumpy):
+    """
+    Populações independentes do modo geracional evoluídas ao mesmo tempo em um tensor
+    (qtd_reinicios, população, ações), com uma única avaliação vetorizada por época
+    (ver ag.ag_numpy.executar_ag_reinicios). Substitui rodar o moneta_ag várias vezes
+    e ficar com o melhor resultado.
+    """
+
+    suporta_sementes = False
+
+    def __init__(self, qtd_reinicios: int = 4):
+        """
+        Args:
+        - qtd_reinicios: quantidade de populações independentes
+        """
+
+        super().__init__("geracional")
+
+        self.qtd_reinicios = qtd_reinicios
+
+    @property
+    def qtd_populacoes(self) -> int:
+        """Quantidade de populações evoluídas pelo motor."""
+        return self.qtd_reinicios
+
+    def executar(self, medias, matriz_covariancia, qtd_iteracoes, qtd_epocas,
+                 qtd_croms_populacao_geral, selecao="roleta", tamanho_torneio=3,
+                 seed=None, parada=None, historico=None, perfilador=None,
+                 cromossomos_semente=None):
+        """
+        Executa o algoritmo genético (ver MotorNumpy.executar). Os detalhes trazem
+        'reinicios': DataFrame com o melhor cromossomo e as estatísticas de fitness de
+        cada reinício.
+        """
+
+        cromossomos, retornos, riscos, fitnesses = \
+            executar_ag_reinicios(medias, matriz_covariancia,
+                                  qtd_iteracoes, qtd_epocas, qtd_croms_populacao_geral,
+                                  self.qtd_reinicios, selecao=selecao,
+                                  tamanho_torneio=tamanho_torneio, seed=seed,
+                                  parada=parada, historico=historico,
+                                  perfilador=perfilador)
+
+        # estatísticas de cada reinício, a partir do seu melhor cromossomo
+        melhores = np.argmax(fitnesses, axis=1)
+        reinicios = np.arange(self.qtd_reinicios)
+        detalhes = {"reinicios": pd.DataFrame(
+            {"Retornos": retornos[reinicios, melhores],
+             "Riscos": riscos[reinicios, melhores],
+             "Fitnesses": fitnesses[reinicios, melhores],
+             "Fitness Medio": fitnesses.mean(axis=1),
+             "Fitness Desvio": fitnesses.std(axis=1)},
+            index=pd.Index(reinicios, name="reinicio"))}
+
+        # a partir daqui os reinícios são tratados como uma única população empilhada
+        return (cromossomos.reshape(-1, cromossomos.shape[-1]), retornos.ravel(),
+                riscos.ravel(), fitnesses.ravel(), detalhes)
+
+
+class MotorEsparso(MotorNumpy):
+    """
+    Modo geracional com cromossomos esparsos: cada cromossomo guarda no máximo
+    'cardinalidade_maxima' ações (posições e pesos), e os operadores e o risco (bloco
+    K×K da covariância) passam a custar O(K²) em vez de O(n²). Permite varrer
+    milhares de ações (ver ag.ag_esparso.executar_ag_esparso).
+    """
+
+    suporta_sementes = False
+
+    def __init__(self, cardinalidade_maxima: int):
+        """
+        Args:
+        - cardinalidade_maxima: quantidade máxima K de ações em cada cromossomo
+        """
+
+        super().__init__("geracional")
+
+        self.cardinalidade_maxima = cardinalidade_maxima
+
+    def executar(self, medias, matriz_covariancia, qtd_iteracoes, qtd_epocas,
+                 qtd_croms_populacao_geral, selecao="roleta", tamanho_torneio=3,
+                 seed=None, parada=None, historico=None, perfilador=None,
+                 cromossomos_semente=None):
+        """Executa o algoritmo genético (ver MotorNumpy.executar)."""
+
+        indices, pesos, retornos, riscos, fitnesses = \
+            executar_ag_esparso(medias, matriz_covariancia,
+                                qtd_iteracoes, qtd_epocas, qtd_croms_populacao_geral,
+                                self.cardinalidade_maxima, selecao=selecao,
+                                tamanho_torneio=tamanho_torneio, seed=seed,
+                                parada=parada, historico=historico, perfilador=perfilador)
+
+        # a saída volta ao formato denso, com um peso para cada ação
+        return (esparsos_para_densos(indices, pesos, medias.shape[0]), retornos, riscos,
+                fitnesses, {})
@@ -0,0 +1,125 @@
+import numpy as np
+import pandas as pd
+
+OPERADORES = ["crossover", "mutacao_um", "mutacao_dois"]
+
+
+class SelecaoOperadores:
+    """
+    Seleção adaptativa dos operadores do algoritmo genético por perseguição adaptativa
+    (adaptive pursuit, Thierens 2005). Cada descendente é gerado por um operador
+    ('crossover': o filho do crossover; 'mutacao_um' e 'mutacao_dois': o filho do
+    crossover seguido da mutação), sorteado com as probabilidades atuais. Ao final de
+    cada rodada, a qualidade de cada operador usado anda na direção da sua recompensa
+    média, e a probabilidade do operador de maior qualidade persegue
+    'probabilidade_maxima', enquanto as demais caem para 'probabilidade_minima'. A
+    probabilidade mínima garante que nenhum operador deixa de ser testado.
+
+    A recompensa de um descendente é a sua melhoria relativa sobre o melhor fitness
+    da população antes da rodada (0 se ele não o supera), dividida pela maior
+    melhoria da rodada: só conta o descendente que vence a população. Recompensar a
+    simples sobrevivência favorece o crossover, cujos filhos ficam entre os pais e
+    quase sempre sobrevivem, e acaba com a exploração das mutações.
+    """
+
+    def __init__(self, taxa_aprendizado: float = 0.3, taxa_perseguicao: float = 0.3,
+                 probabilidade_minima: float = 0.1):
+        """
+        Args:
+        - taxa_aprendizado: peso da taxa de sucesso mais recente na qualidade (alfa)
+        - taxa_perseguicao: velocidade com que as probabilidades perseguem o melhor
+          operador (beta)
+        - probabilidade_minima: probabilidade mínima de cada operador
+        """
+
+        qtd_operadores = len(OPERADORES)
+
+        if not 0 < taxa_aprendizado <= 1 or not 0 < taxa_perseguicao <= 1:
+            raise ValueError("As taxas de aprendizado e de perseguição devem ficar em (0, 1].")
+
+        if not 0 <= probabilidade_minima < 1 / qtd_operadores:
+            raise ValueError("A probabilidade mínima deve ficar entre 0 e "
+                             f"1/{qtd_operadores}.")
+
+        self.taxa_aprendizado = taxa_aprendizado
+        self.taxa_perseguicao = taxa_perseguicao
+        self.probabilidade_minima = probabilidade_minima
+        self.probabilidade_maxima = 1 - (qtd_operadores - 1) * probabilidade_minima
+
+        self.probabilidades = np.full(qtd_operadores, 1 / qtd_operadores)
+        self.qualidades = np.full(qtd_operadores, 1.0)
+        self.usos = np.zeros(qtd_operadores, dtype=np.int64)
+        self.sucessos = np.zeros(qtd_operadores, dtype=np.int64)
+
+    def sortear(self, qtd_descendentes: int, gerador: np.random.Generator) -> np.ndarray:
+        """
+        Sorteia o operador de cada descendente.
+
+        Args:
+        - qtd_descendentes: quantidade de descendentes da rodada
+        - gerador: gerador de números aleatórios (np.random.Generator)
+
+        Returns:
+        - operadores: array (qtd_descendentes,) com a posição (em OPERADORES) do
+          operador de cada descendente, em ordem crescente
+        """
+
+        quantidades = gerador.multinomial(qtd_descendentes, self.probabilidades)
+        return np.repeat(np.arange(len(OPERADORES)), quantidades)
+
+    def atualizar(self, operadores: np.ndarray, fitnesses_descendentes: np.ndarray,
+                  melhor_fitness: float):
+        """
+        Atualiza as qualidades e as probabilidades com o resultado de uma rodada.
+
+        Args:
+        - operadores: array com a posição do operador de cada descendente
+        - fitnesses_descendentes: array com os fitnesses dos descendentes
+        - melhor_fitness: melhor fitness da população antes da rodada
+        """
+
+        qtd_operadores = len(OPERADORES)
+
+        melhorias = np.maximum(fitnesses_descendentes / melhor_fitness - 1, 0.0)
+        maior_melhoria = melhorias.max()
+        recompensas = melhorias / maior_melhoria if maior_melhoria > 0 else melhorias
+
+        usos = np.bincount(operadores, minlength=qtd_operadores)
+        somas = np.bincount(operadores, weights=recompensas, minlength=qtd_operadores)
+
+        self.usos += usos
+        self.sucessos += np.bincount(operadores, weights=melhorias > 0,
+                                     minlength=qtd_operadores).astype(np.int64)
+
+        # só os operadores usados na rodada têm a qualidade atualizada
+        usados = usos > 0
+        medias = somas[usados] / usos[usados]
+        self.qualidades[usados] += self.taxa_aprendizado * (medias - self.qualidades[usados])
+
+        melhor = np.argmax(self.qualidades)
+        alvos = np.full(qtd_operadores, self.probabilidade_minima)
+        alvos[melhor] = self.probabilidade_maxima
+        self.probabilidades += self.taxa_perseguicao * (alvos - self.probabilidades)
+        self.probabilidades /= self.probabilidades.sum()
+
+    def estatisticas(self) -> pd.DataFrame:
+        """
+        Retorna as estatísticas acumuladas de cada operador.
+
+        Returns:
+        - pd.DataFrame: índice 'operador' e colunas 'Usos' (descendentes gerados),
+          'Sucessos' (descendentes que superaram o melhor fitness da população),
+          'Taxa Sucesso' (sucessos / usos), 'Qualidade' e 'Probabilidade' (valores ao
+          final da execução)
+        """
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            taxas = self.sucessos / self.usos
+
+        estatisticas = pd.DataFrame({"Usos": self.usos, "Sucessos": self.sucessos,
+                                     "Taxa Sucesso": taxas, "Qualidade": self.qualidades,
+                                     "Probabilidade": self.probabilidades},
+                                    index=pd.Index(OPERADORES, name="operador"))
+
+        return estatisticas
+
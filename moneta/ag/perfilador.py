@@ -0,0 +1,124 @@
+import time
+from contextlib import nullcontext
+import pandas as pd
+
+
+class _Etapa:
+    """
+    Gerenciador de contexto que mede uma etapa e soma o tempo no perfilador. Cada
+    etapa tem um único objeto, reaproveitado a cada medição.
+    """
+
+    def __init__(self, perfilador, nome: str):
+        self.perfilador = perfilador
+        self.nome = nome
+        self.inicio = 0.0
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *_):
+        self.perfilador.registrar(self.nome, time.perf_counter() - self.inicio)
+        return False
+
+
+class Perfilador:
+    """
+    Perfilador de etapas do algoritmo genético: acumula o tempo total e a quantidade
+    de chamadas de cada etapa ('populacao_inicial', 'selecao' (roda do acaso),
+    'crossover', 'mutacao_um', 'mutacao_dois', 'avaliacao' (nova geração),
+    'substituicao' (devolução dos cromossomos à população), entre outras).
+    Os motores medem as etapas com 'with perfilador.etapa(nome):'; sem perfilador
+    eles usam o PERFILADOR_NULO, cujas etapas não medem nada.
+    """
+
+    def __init__(self):
+        self.tempos = {}
+        self.chamadas = {}
+        self._etapas = {}
+
+    def etapa(self, nome: str) -> _Etapa:
+        """
+        Retorna o gerenciador de contexto que mede a etapa 'nome'.
+
+        Args:
+        - nome: nome da etapa
+
+        Returns:
+        - _Etapa: gerenciador de contexto da etapa
+        """
+
+        etapa = self._etapas.get(nome)
+        if etapa is None:
+            etapa = self._etapas[nome] = _Etapa(self, nome)
+        return etapa
+
+    def registrar(self, nome: str, segundos: float, qtd_chamadas: int = 1):
+        """
+        Soma um tempo medido fora do perfilador à etapa 'nome'.
+
+        Args:
+        - nome: nome da etapa
+        - segundos: tempo gasto na etapa, em segundos
+        - qtd_chamadas: quantidade de chamadas que o tempo representa
+        """
+
+        self.tempos[nome] = self.tempos.get(nome, 0.0) + segundos
+        self.chamadas[nome] = self.chamadas.get(nome, 0) + qtd_chamadas
+
+    def limpar(self):
+        """
+        Zera os tempos e as chamadas de todas as etapas.
+        """
+
+        self.tempos.clear()
+        self.chamadas.clear()
+
+    def para_dict(self) -> dict:
+        """
+        Retorna as medições em um dicionário.
+
+        Returns:
+        - dict: {etapa: {'tempo': segundos, 'chamadas': quantidade}}
+        """
+
+        return {nome: {"tempo": tempo, "chamadas": self.chamadas[nome]}
+                for nome, tempo in self.tempos.items()}
+
+    def para_dataframe(self) -> pd.DataFrame:
+        """
+        Retorna as medições em um DataFrame, da etapa mais demorada para a mais rápida.
+
+        Returns:
+        - pd.DataFrame: colunas 'Tempo Total' (s), 'Chamadas', 'Tempo Medio' (s) e
+          'Percentual' (do tempo somado de todas as etapas)
+        """
+
+        perfil = pd.DataFrame({"Tempo Total": pd.Series(self.tempos, dtype=float),
+                               "Chamadas": pd.Series(self.chamadas, dtype=int)})
+        perfil.index.name = "etapa"
+
+        perfil["Tempo Medio"] = perfil["Tempo Total"] / perfil["Chamadas"]
+        perfil["Percentual"] = 100 * perfil["Tempo Total"] / perfil["Tempo Total"].sum()
+
+        return perfil.sort_values("Tempo Total", ascending=False)
+
+
+class PerfiladorNulo:
+    """
+    Perfilador desligado: todas as etapas devolvem o mesmo contexto vazio, então
+    medir uma etapa custa apenas uma chamada de método.
+    """
+
+    _contexto = nullcontext()
+
+    def etapa(self, nome: str) -> nullcontext:
+        """Retorna um contexto que não mede nada."""
+        return self._contexto
+
+    def registrar(self, nome: str, segundos: float, qtd_chamadas: int = 1):
+        """Descarta a medição."""
+
+
+PERFILADOR_NULO = PerfiladorNulo()
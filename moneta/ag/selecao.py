@@ -0,0 +1,173 @@
+import numpy as np
+
+METODOS_SELECAO = ["roleta", "torneio", "sus"]
+
+
+def sortear_roleta(fitnesses_acumulados: np.ndarray, als: np.ndarray) -> np.ndarray:
+    """
+    Função que converte números aleatórios em posições da roda do acaso.
+
+    Args:
+    - fitnesses_acumulados: array com a soma acumulada dos fitnesses
+    - als: array com números entre 0 e o fitness total
+
+    Returns:
+    - posicoes: array com as posições sorteadas
+    """
+
+    # a fatia de cada cromossomo é o intervalo [acumulado anterior, acumulado próprio)
+    posicoes = np.searchsorted(fitnesses_acumulados, als, side="right")
+
+    # protege contra arredondamentos em que o sorteio cai sobre o acumulado final
+    return np.minimum(posicoes, fitnesses_acumulados.shape[0] - 1)
+
+
+def sortear_roleta_exceto(fitnesses: np.ndarray, fitnesses_acumulados: np.ndarray,
+                          posicoes_excluidas: np.ndarray,
+                          gerador: np.random.Generator) -> np.ndarray:
+    """
+    Função que sorteia pela roda do acaso, para cada posição excluída, uma posição
+    diferente dela. A fatia excluída é retirada da roda e o sorteio é feito uma única
+    vez, sem laço de rejeição.
+
+    Args:
+    - fitnesses: array com os fitnesses da população
+    - fitnesses_acumulados: array com a soma acumulada dos fitnesses
+    - posicoes_excluidas: array com a posição que não pode ser sorteada em cada par
+    - gerador: gerador de números aleatórios (np.random.Generator)
+
+    Returns:
+    - posicoes: array com as posições sorteadas
+    """
+
+    qtd_cromossomos = fitnesses.shape[0]
+    fitnesses_excluidos = fitnesses[posicoes_excluidas]
+    inicio_fatias_excluidas = fitnesses_acumulados[posicoes_excluidas] - fitnesses_excluidos
+    massas_restantes = fitnesses_acumulados[-1] - fitnesses_excluidos
+
+    als = gerador.random(posicoes_excluidas.shape[0]) * massas_restantes
+
+    # os sorteios que caem depois do início da fatia excluída 'pulam' a fatia
+    als = np.where(als >= inicio_fatias_excluidas, als + fitnesses_excluidos, als)
+    posicoes = sortear_roleta(fitnesses_acumulados, als)
+
+    # se todo o fitness está na posição excluída, o sorteio é uniforme entre as demais
+    sem_massa = ~(massas_restantes > 0)
+    if sem_massa.any():
+        uniformes = gerador.integers(0, qtd_cromossomos - 1, size=sem_massa.sum())
+        uniformes += uniformes >= posicoes_excluidas[sem_massa]
+        posicoes[sem_massa] = uniformes
+
+    return posicoes
+
+
+def sortear_torneio(fitnesses: np.ndarray, qtd_sorteios: int, tamanho_torneio: int,
+                    gerador: np.random.Generator,
+                    posicoes_excluidas: np.ndarray = None) -> np.ndarray:
+    """
+    Função que sorteia posições por torneio: para cada sorteio, 'tamanho_torneio'
+    cromossomos são escolhidos ao acaso e o de maior fitness vence.
+
+    Args:
+    - fitnesses: array com os fitnesses da população
+    - qtd_sorteios: quantidade de torneios
+    - tamanho_torneio: quantidade de cromossomos em cada torneio
+    - gerador: gerador de números aleatórios (np.random.Generator)
+    - posicoes_excluidas: array com a posição que não pode participar de cada torneio
+
+    Returns:
+    - posicoes: array com as posições vencedoras
+    """
+
+    qtd_cromossomos = fitnesses.shape[0]
+
+    if posicoes_excluidas is None:
+        candidatos = gerador.integers(0, qtd_cromossomos,
+                                      size=(qtd_sorteios, tamanho_torneio))
+    else:
+        # sorteia entre as n - 1 posições restantes e desloca as que passam da excluída
+        candidatos = gerador.integers(0, qtd_cromossomos - 1,
+                                      size=(qtd_sorteios, tamanho_torneio))
+        candidatos += candidatos >= posicoes_excluidas[:, np.newaxis]
+
+    vencedores = np.argmax(fitnesses[candidatos], axis=1)
+
+    return candidatos[np.arange(qtd_sorteios), vencedores]
+
+
+def sortear_sus(fitnesses_acumulados: np.ndarray, qtd_sorteios: int,
+                gerador: np.random.Generator) -> np.ndarray:
+    """
+    Função que sorteia posições por amostragem universal estocástica (SUS): um único
+    número aleatório posiciona 'qtd_sorteios' ponteiros igualmente espaçados na roda.
+
+    Args:
+    - fitnesses_acumulados: array com a soma acumulada dos fitnesses
+    - qtd_sorteios: quantidade de posições a sortear
+    - gerador: gerador de números aleatórios (np.random.Generator)
+
+    Returns:
+    - posicoes: array com as posições sorteadas, em ordem aleatória
+    """
+
+    passo = fitnesses_acumulados[-1] / qtd_sorteios
+    ponteiros = gerador.random() * passo + passo * np.arange(qtd_sorteios)
+
+    posicoes = sortear_roleta(fitnesses_acumulados, ponteiros)
+
+    # os ponteiros saem ordenados; embaralha para formar pares ao acaso
+    return gerador.permutation(posicoes)
+
+
+def selecionar_pares(fitnesses: np.ndarray, qtd_pares: int, gerador: np.random.Generator,
+                     metodo: str = "roleta",
+                     tamanho_torneio: int = 3) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Função que sorteia, de uma só vez, 'qtd_pares' pares de pais com posições
+    distintas (o pai nunca é a mãe do mesmo par). Todos os métodos trabalham sobre
+    um único array de fitnesses e têm custo limitado, sem laços de rejeição.
+
+    Args:
+    - fitnesses: array com os fitnesses da população (ou dos cromossomos sorteados)
+    - qtd_pares: quantidade de pares de pais
+    - gerador: gerador de números aleatórios (np.random.Generator)
+    - metodo: 'roleta' (proporcional ao fitness), 'torneio' ou 'sus'
+      (amostragem universal estocástica)
+    - tamanho_torneio: quantidade de cromossomos em cada torneio (método 'torneio')
+
+    Returns:
+    - posicoes_pais: array com as posições dos cromossomos pais
+    - posicoes_maes: array com as posições dos cromossomos mães
+    """
+
+    if metodo not in METODOS_SELECAO:
+        raise ValueError(f"O método de seleção '{metodo}' não existe. Opções: {METODOS_SELECAO}.")
+
+    if fitnesses.shape[0] < 2:
+        raise ValueError("São necessários pelo menos 2 cromossomos para formar pares.")
+
+    if metodo == "torneio":
+        posicoes_pais = sortear_torneio(fitnesses, qtd_pares, tamanho_torneio, gerador)
+        posicoes_maes = sortear_torneio(fitnesses, qtd_pares, tamanho_torneio, gerador,
+                                        posicoes_excluidas=posicoes_pais)
+        return posicoes_pais, posicoes_maes
+
+    fitnesses_acumulados = np.cumsum(fitnesses)
+
+    if metodo == "sus":
+        posicoes = sortear_sus(fitnesses_acumulados, 2 * qtd_pares, gerador)
+        posicoes_pais, posicoes_maes = posicoes[:qtd_pares], posicoes[qtd_pares:]
+
+        # pares com o mesmo cromossomo nas duas posições sorteiam outra mãe na roleta
+        repetidos = posicoes_pais == posicoes_maes
+        if repetidos.any():
+            posicoes_maes[repetidos] = sortear_roleta_exceto(fitnesses, fitnesses_acumulados,
+                                                             posicoes_pais[repetidos], gerador)
+        return posicoes_pais, posicoes_maes
+
+    posicoes_pais = sortear_roleta(fitnesses_acumulados,
+                                   gerador.random(qtd_pares) * fitnesses_acumulados[-1])
+    posicoes_maes = sortear_roleta_exceto(fitnesses, fitnesses_acumulados, posicoes_pais,
+                                          gerador)
+
+    return posicoes_pais, posicoes_maes
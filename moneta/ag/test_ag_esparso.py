@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+from ag.ag_esparso import avaliar_esparsos, esparsos_para_densos
+from ces.ces import ces_retornos, ces_riscos, ces_fitnesses
+from ces.covariancia import estimar_covariancia_amostral, estimar_covariancia_fatorial
+
+
+@pytest.mark.parametrize("modelo_covariancia", ["amostral", "fatorial"])
+def test_risco_esparso_igual_ao_denso(gerar_variacoes, modelo_covariancia):
+    """O bloco K×K de cada carteira dá o mesmo risco da carteira densa equivalente."""
+
+    variacoes = gerar_variacoes(qtd_acoes=30)
+    medias = variacoes.mean(axis=0).to_numpy()
+    matriz_covariancia = estimar_covariancia_fatorial(variacoes, 3) \
+        if modelo_covariancia == "fatorial" else estimar_covariancia_amostral(variacoes)
+
+    gerador = np.random.default_rng(5)
+    qtd_cromossomos, cardinalidade, qtd_genes = 16, 6, variacoes.shape[1]
+    indices = np.argsort(gerador.random((qtd_cromossomos, qtd_genes)),
+                         axis=1)[:, :cardinalidade]
+    pesos = gerador.random((qtd_cromossomos, cardinalidade))
+    pesos /= pesos.sum(axis=1, keepdims=True)
+
+    retornos, riscos, fitnesses = avaliar_esparsos(indices, pesos, medias, matriz_covariancia)
+
+    densos = esparsos_para_densos(indices, pesos, qtd_genes)
+    retornos_densos = ces_retornos(carteiras=densos, medias=medias)
+    riscos_densos = ces_riscos(carteiras=densos, matriz_covariancia=matriz_covariancia)
+
+    np.testing.assert_allclose(retornos, retornos_densos, rtol=1e-12)
+    np.testing.assert_allclose(riscos, riscos_densos, rtol=1e-10)
+    np.testing.assert_allclose(fitnesses, ces_fitnesses(retornos_densos, riscos_densos),
+                               rtol=1e-10)
@@ -0,0 +1,51 @@
+import numpy as np
+from ag.ag_numpy import executar_ag_janelas
+from ag.convergencia import CriterioParada
+from ces.ces import ces_retornos
+from ces.covariancia import estimar_covariancia_amostral
+
+
+def montar_janelas(gerar_variacoes, qtd_acoes_janelas):
+    """Empilha as médias e as covariâncias de janelas com quantidades diferentes de ações."""
+
+    qtd_genes = max(qtd_acoes_janelas)
+    medias = np.zeros((len(qtd_acoes_janelas), qtd_genes))
+    matrizes_covariancia = np.zeros((len(qtd_acoes_janelas), qtd_genes, qtd_genes))
+    for janela, qtd_acoes in enumerate(qtd_acoes_janelas):
+        variacoes = gerar_variacoes(qtd_acoes=qtd_acoes, seed=janela)
+        medias[janela, :qtd_acoes] = variacoes.mean(axis=0).to_numpy()
+        matrizes_covariancia[janela, :qtd_acoes, :qtd_acoes] = \
+            estimar_covariancia_amostral(variacoes)
+
+    return medias, matrizes_covariancia, np.array(qtd_acoes_janelas)
+
+
+def test_parada_por_janela(gerar_variacoes):
+    """
+    Critérios que nunca param reproduzem a execução sem parada; com estagnação, cada
+    janela para sozinha e a sua população final continua válida.
+    """
+
+    medias, matrizes_covariancia, qtd_genes_janelas = montar_janelas(gerar_variacoes,
+                                                                     [6, 8, 4])
+
+    sem_parada = executar_ag_janelas(medias, matrizes_covariancia, qtd_genes_janelas,
+                                     5, 30, 20, seed=3)
+    sem_estagnacao = executar_ag_janelas(medias, matrizes_covariancia, qtd_genes_janelas,
+                                         5, 30, 20, seed=3,
+                                         paradas=[CriterioParada(epocas_estagnacao=100)
+                                                  for _ in range(3)])
+    for esperado, obtido in zip(sem_parada, sem_estagnacao):
+        np.testing.assert_array_equal(esperado, obtido)
+
+    paradas = [CriterioParada(epocas_estagnacao=2) for _ in range(3)]
+    cromossomos, retornos, _, _ = executar_ag_janelas(medias, matrizes_covariancia,
+                                                       qtd_genes_janelas, 5, 500, 20,
+                                                       seed=3, paradas=paradas)
+
+    assert all(parada.motivo == "estagnacao" for parada in paradas)
+    np.testing.assert_allclose(cromossomos.sum(axis=2), 1.0)
+    for janela, qtd_genes in enumerate(qtd_genes_janelas):
+        assert np.all(cromossomos[janela, :, qtd_genes:] == 0)
+        np.testing.assert_allclose(retornos[janela],
+                                   ces_retornos(cromossomos[janela], medias[janela]))
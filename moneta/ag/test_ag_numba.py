@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+import ag.ag_numba as ag_numba
+from ag.ag_numpy import executar_ag_numpy
+from ces.covariancia import estimar_covariancia_amostral
+
+QTD_SEMENTES = 40
+
+
+@pytest.mark.parametrize("selecao", ["roleta", "torneio"])
+@pytest.mark.parametrize("compilado", [True, False], ids=["compilado", "python"])
+def test_numba_reproduz_estatisticas_numpy(gerar_variacoes, monkeypatch, selecao, compilado):
+    """
+    Os sorteios do numba seguem outra ordem, então cada semente dá outro resultado; a
+    média e o desvio do melhor fitness em várias sementes devem ser os do motor numpy.
+    Sem o numba, o núcleo roda em Python puro e o teste 'python' continua valendo.
+    """
+
+    if compilado:
+        pytest.importorskip("numba")
+    else:
+        # o núcleo sem compilar (com o numba instalado, a função original fica em py_func)
+        monkeypatch.setattr(ag_numba, "_evoluir_epoca_numba",
+                            getattr(ag_numba._evoluir_epoca_numba, "py_func",
+                                    ag_numba._evoluir_epoca_numba))
+
+    variacoes = gerar_variacoes()
+    medias = variacoes.mean(axis=0).to_numpy()
+    matriz_covariancia = estimar_covariancia_amostral(variacoes)
+
+    melhores_numba = np.array([
+        ag_numba.executar_ag_numba(medias, matriz_covariancia, 5, 10, 20, selecao=selecao,
+                                   seed=semente)[3].max()
+        for semente in range(QTD_SEMENTES)])
+    melhores_numpy = np.array([
+        executar_ag_numpy(medias, matriz_covariancia, 5, 10, 20, selecao=selecao,
+                          seed=semente)[3].max()
+        for semente in range(QTD_SEMENTES)])
+
+    # diferença das médias em erros padrão, e razão entre os desvios
+    erro_padrao = np.sqrt((melhores_numba.var() + melhores_numpy.var()) / QTD_SEMENTES)
+    assert abs(melhores_numba.mean() - melhores_numpy.mean()) < 4 * erro_padrao
+    assert 0.5 < melhores_numba.std() / melhores_numpy.std() < 2.0
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+import pytest
+from ag.motores import MotorNumpy, MotorPandas, MotorReinicios
+from modelo.moneta import moneta_ag
+
+
+@pytest.mark.parametrize("selecao", ["roleta", "torneio", "sus"])
+def test_numpy_reproduz_pandas(gerar_variacoes, selecao):
+    """Com a mesma semente, o motor numpy encontra a mesma carteira do motor pandas."""
+
+    variacoes = gerar_variacoes()
+
+    carteira_numpy = moneta_ag(variacoes, qtd_iteracoes=5, qtd_epocas=10, motor=MotorNumpy(),
+                               selecao=selecao, seed=7)
+    carteira_pandas = moneta_ag(variacoes, qtd_iteracoes=5, qtd_epocas=10, motor=MotorPandas(),
+                                selecao=selecao, seed=7)
+
+    assert carteira_numpy.name == carteira_pandas.name
+    assert list(carteira_numpy.index) == list(carteira_pandas.index)
+    np.testing.assert_array_equal(carteira_numpy.to_numpy(dtype=np.float64),
+                                  carteira_pandas.to_numpy(dtype=np.float64))
+
+
+def test_geracional_elitista_e_reprodutivel(gerar_variacoes):
+    """
+    No modo geracional o melhor fitness nunca cai entre as épocas, a população final é
+    de carteiras válidas e a mesma semente reproduz a mesma população.
+    """
+
+    variacoes = gerar_variacoes()
+
+    carteira, detalhes = moneta_ag(variacoes, qtd_iteracoes=5, qtd_epocas=15,
+                                   motor=MotorNumpy("geracional"), seed=3,
+                                   retornar_detalhes=True, retornar_populacao=True)
+    repeticao, detalhes_repeticao = moneta_ag(variacoes, qtd_iteracoes=5, qtd_epocas=15,
+                                              motor=MotorNumpy("geracional"), seed=3,
+                                              retornar_populacao=True)
+
+    melhores = detalhes["historico"].melhores
+    assert melhores.shape[0] == 15
+    assert np.all(np.diff(melhores) >= 0)
+    assert carteira["Fitnesses"] == melhores[-1]
+
+    populacao = detalhes["populacao"]
+    assert populacao.shape[0] == 40
+    pesos = populacao[list(variacoes.columns)].to_numpy()
+    assert np.all(pesos >= 0)
+    np.testing.assert_allclose(pesos.sum(axis=1), 1.0)
+
+    pd.testing.assert_series_equal(carteira, repeticao)
+    pd.testing.assert_frame_equal(populacao, detalhes_repeticao["populacao"])
+
+
+def test_reinicios_retornam_o_melhor_reinicio(gerar_variacoes):
+    """
+    Com várias populações no tensor, a carteira retornada é o melhor cromossomo entre
+    todos os reinícios, e cada reinício termina pelo menos tão bem quanto começou.
+    """
+
+    variacoes = gerar_variacoes()
+    qtd_reinicios, qtd_croms = 4, 20
+
+    carteira, detalhes = moneta_ag(variacoes, qtd_iteracoes=5, qtd_epocas=10,
+                                   qtd_croms_populacao_geral=qtd_croms,
+                                   motor=MotorReinicios(qtd_reinicios), seed=5,
+                                   retornar_detalhes=True)
+
+    # sem épocas, as populações são as iniciais, sorteadas da mesma semente
+    _, detalhes_iniciais = moneta_ag(variacoes, qtd_iteracoes=5, qtd_epocas=0,
+                                     qtd_croms_populacao_geral=qtd_croms,
+                                     motor=MotorReinicios(qtd_reinicios), seed=5,
+                                     retornar_detalhes=True)
+
+    reinicios = detalhes["reinicios"]
+    assert reinicios.shape[0] == qtd_reinicios
+    assert reinicios["Fitnesses"].nunique() > 1
+
+    # a posição do melhor cromossomo na população empilhada aponta para o melhor reinício
+    assert carteira["Fitnesses"] == reinicios["Fitnesses"].max()
+    assert carteira.name // qtd_croms == reinicios["Fitnesses"].idxmax()
+    assert carteira["Retornos"] == reinicios.loc[carteira.name // qtd_croms, "Retornos"]
+
+    assert np.all(reinicios["Fitnesses"].to_numpy() >=
+                  detalhes_iniciais["reinicios"]["Fitnesses"].to_numpy())
@@ -0,0 +1,53 @@
+import numpy as np
+from ag.ilhas import executar_ag_ilhas, migrar_melhores
+from ces.covariancia import estimar_covariancia_amostral
+
+
+def montar_ilha(fitnesses: list, gerador: np.random.Generator) -> tuple:
+    """Ilha com cromossomos marcados pelo próprio fitness (retorno e risco derivados dele)."""
+
+    fitnesses = np.array(fitnesses, dtype=np.float64)
+    cromossomos = np.repeat(fitnesses[:, np.newaxis], 3, axis=1)
+    return cromossomos, fitnesses * 2, fitnesses * 3, fitnesses, gerador
+
+
+def test_migracao_em_anel_leva_os_melhores():
+    """Os melhores de cada ilha substituem os piores da seguinte (a última leva à primeira)."""
+
+    gerador = np.random.default_rng(0)
+    ilhas = [montar_ilha([1.0, 5.0, 3.0, 4.0], gerador),
+             montar_ilha([10.0, 9.0, 2.0, 8.0], gerador),
+             montar_ilha([7.0, 0.5, 6.0, 0.2], gerador)]
+
+    ilhas = migrar_melhores(ilhas, qtd_migrantes=2)
+
+    # os migrantes são os da população antes da migração, não os recém-chegados
+    esperados = [[7.0, 5.0, 6.0, 4.0], [10.0, 9.0, 5.0, 4.0], [7.0, 9.0, 6.0, 10.0]]
+    for (cromossomos, retornos, riscos, fitnesses, _), esperado in zip(ilhas, esperados):
+        np.testing.assert_array_equal(fitnesses, esperado)
+        np.testing.assert_array_equal(cromossomos[:, 0], fitnesses)
+        np.testing.assert_array_equal(retornos, fitnesses * 2)
+        np.testing.assert_array_equal(riscos, fitnesses * 3)
+
+
+def test_ilhas_independem_da_quantidade_de_processos(gerar_variacoes):
+    """Com a mesma semente, 1 processo e vários processos dão as mesmas populações."""
+
+    variacoes = gerar_variacoes()
+    medias = variacoes.mean(axis=0).to_numpy()
+    matriz_covariancia = estimar_covariancia_amostral(variacoes)
+
+    resultados = [executar_ag_ilhas(medias, matriz_covariancia, 5, 12, 10, qtd_ilhas=3,
+                                    intervalo_migracao=4, qtd_migrantes=2,
+                                    qtd_processos=qtd_processos, seed=11)
+                  for qtd_processos in (1, 2, 3)]
+
+    for resultado in resultados[1:]:
+        for esperado, obtido in zip(resultados[0], resultado):
+            np.testing.assert_array_equal(esperado, obtido)
+
+    # outra semente leva a outra evolução
+    outro = executar_ag_ilhas(medias, matriz_covariancia, 5, 12, 10, qtd_ilhas=3,
+                              intervalo_migracao=4, qtd_migrantes=2, qtd_processos=1,
+                              seed=12)
+    assert not np.array_equal(outro[0], resultados[0][0])
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+import ag.motores as motores
+from ag.motores import MotorIlhas, MotorNumba, MotorNumpy, MotorPandas, MotorReinicios
+from modelo.moneta import moneta_ag
+
+
+def test_opcoes_incompativeis_no_construtor():
+    """As opções próprias de cada motor são validadas ao montar o motor."""
+
+    with pytest.raises(ValueError):
+        MotorNumpy("inexistente")
+
+    with pytest.raises(ValueError):
+        MotorNumpy(risco_incremental=True, tamanho_cache=100)
+
+    with pytest.raises(ValueError):
+        MotorNumpy(risco_incremental=True, operadores_adaptativos=True)
+
+    # as opções de outros motores não existem no construtor
+    with pytest.raises(TypeError):
+        MotorReinicios(qtd_reinicios=2, risco_incremental=True)
+
+    with pytest.raises(TypeError):
+        MotorPandas(modo="geracional")
+
+
+@pytest.mark.parametrize("motor, parametros", [
+    (MotorPandas(), {"epocas_estagnacao": 3}),
+    (MotorPandas(), {"modelo_covariancia": "fatorial"}),
+    (MotorNumba(), {"selecao": "sus"}),
+    (MotorIlhas(qtd_ilhas=2), {"tempo_maximo": 1.0}),
+    (MotorReinicios(2), {"cromossomos_semente": np.full((1, 8), 1 / 8)}),
+], ids=["pandas_parada", "pandas_fatorial", "numba_sus", "ilhas_parada",
+        "reinicios_sementes"])
+def test_opcoes_comuns_nao_suportadas(gerar_variacoes, motor, parametros):
+    """Uma opção comum que o motor não suporta gera um ValueError."""
+
+    with pytest.raises(ValueError):
+        moneta_ag(gerar_variacoes(), qtd_iteracoes=2, qtd_epocas=2, motor=motor, seed=0,
+                  **parametros)
+
+
+def test_numba_ausente_usa_o_motor_numpy(gerar_variacoes, monkeypatch):
+    """Sem o numba, o MotorNumba avisa e devolve a carteira do MotorNumpy em float64."""
+
+    monkeypatch.setattr(motores, "NUMBA_DISPONIVEL", False)
+    variacoes = gerar_variacoes().astype(np.float32)
+
+    with pytest.warns(UserWarning, match="numba"):
+        carteira = moneta_ag(variacoes, qtd_iteracoes=3, qtd_epocas=4, motor=MotorNumba(),
+                             seed=2)
+
+    np.testing.assert_array_equal(carteira.to_numpy(),
+                                  moneta_ag(variacoes, qtd_iteracoes=3, qtd_epocas=4,
+                                            dtype=np.float64, seed=2).to_numpy())
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+from ag.motores import MotorNumpy
+from ag.operadores import OPERADORES, SelecaoOperadores
+from modelo.moneta import moneta_ag
+
+
+def test_probabilidades_normalizadas_e_acima_da_minima():
+    """Com recompensas aleatórias, as probabilidades somam 1 e nunca caem abaixo da mínima."""
+
+    gerador = np.random.default_rng(0)
+    selecao = SelecaoOperadores(probabilidade_minima=0.05)
+
+    for _ in range(500):
+        operadores = selecao.sortear(16, gerador)
+        selecao.atualizar(operadores, gerador.uniform(0.5, 1.5, 16), 1.0)
+
+        assert selecao.probabilidades.sum() == pytest.approx(1.0)
+        assert np.all(selecao.probabilidades >= selecao.probabilidade_minima - 1e-12)
+        assert np.all(selecao.probabilidades <= selecao.probabilidade_maxima + 1e-12)
+
+
+def test_probabilidade_persegue_o_operador_de_sucesso():
+    """Se só um operador supera a população, a sua probabilidade vai para a máxima."""
+
+    gerador = np.random.default_rng(1)
+    selecao = SelecaoOperadores(probabilidade_minima=0.1)
+    vencedor = OPERADORES.index("mutacao_dois")
+
+    for _ in range(50):
+        operadores = selecao.sortear(24, gerador)
+        selecao.atualizar(operadores, np.where(operadores == vencedor, 2.0, 0.5), 1.0)
+
+    esperadas = np.full(len(OPERADORES), 0.1)
+    esperadas[vencedor] = selecao.probabilidade_maxima
+    np.testing.assert_allclose(selecao.probabilidades, esperadas, atol=1e-6)
+    assert selecao.sucessos[vencedor] == selecao.usos[vencedor]
+    assert selecao.sucessos.sum() == selecao.sucessos[vencedor]
+
+
+def test_probabilidade_minima_invalida():
+    """A probabilidade mínima precisa deixar espaço para o operador de maior qualidade."""
+
+    with pytest.raises(ValueError):
+        SelecaoOperadores(probabilidade_minima=1 / len(OPERADORES))
+
+
+@pytest.mark.parametrize("modo", ["estacionario", "geracional"])
+def test_estatisticas_dos_operadores_no_moneta_ag(gerar_variacoes, modo):
+    """Cada descendente conta um uso, e as probabilidades finais seguem normalizadas."""
+
+    _, detalhes = moneta_ag(gerar_variacoes(), qtd_iteracoes=4, qtd_epocas=6, seed=0,
+                            motor=MotorNumpy(modo, operadores_adaptativos=True),
+                            retornar_detalhes=True)
+
+    estatisticas = detalhes["operadores"]
+    assert list(estatisticas.index) == OPERADORES
+    assert estatisticas["Usos"].sum() == 8 * 4 * 6
+    assert np.all(estatisticas["Sucessos"] <= estatisticas["Usos"])
+    assert estatisticas["Probabilidade"].sum() == pytest.approx(1.0)
+    assert np.all(estatisticas["Probabilidade"] >= 0.1 - 1e-12)
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+from ag.motores import MotorEsparso, MotorNumpy, MotorPandas, MotorReinicios
+from ag.perfilador import Perfilador
+from modelo.moneta import moneta_ag
+
+ETAPAS_ESTACIONARIO = {"covariancia", "populacao_inicial", "selecao", "crossover",
+                       "mutacao_um", "mutacao_dois", "avaliacao", "substituicao",
+                       "atualizacao_populacao"}
+ETAPAS_LOTE = {"covariancia", "populacao_inicial", "selecao", "descendentes", "avaliacao",
+               "substituicao"}
+
+
+def test_perfilador_acumula_etapas():
+    """As medições da mesma etapa se somam, e o DataFrame fecha em 100%."""
+
+    perfilador = Perfilador()
+
+    for _ in range(3):
+        with perfilador.etapa("a"):
+            pass
+    perfilador.registrar("b", 2.0, qtd_chamadas=4)
+    perfilador.registrar("b", 1.0)
+
+    assert perfilador.chamadas == {"a": 3, "b": 5}
+    assert perfilador.tempos["b"] == 3.0
+
+    perfil = perfilador.para_dataframe()
+    assert list(perfil.index) == ["b", "a"]
+    assert perfil.loc["b", "Tempo Medio"] == pytest.approx(0.6)
+    assert perfil["Percentual"].sum() == pytest.approx(100.0)
+
+    perfilador.limpar()
+    assert perfilador.para_dict() == {}
+
+
+@pytest.mark.parametrize("motor, etapas, chamadas_selecao", [
+    (MotorNumpy(), ETAPAS_ESTACIONARIO, 6 * 4),
+    (MotorPandas(), ETAPAS_ESTACIONARIO, 6 * 4),
+    (MotorNumpy("geracional"), ETAPAS_LOTE, 6),
+    (MotorReinicios(3), ETAPAS_LOTE, 6),
+    (MotorEsparso(4), ETAPAS_LOTE, 6),
+], ids=["numpy", "pandas", "geracional", "reinicios", "esparso"])
+def test_perfilador_registra_todas_as_etapas(gerar_variacoes, motor, etapas,
+                                             chamadas_selecao):
+    """Cada motor registra todas as suas etapas, uma seleção por iteração ou por época."""
+
+    perfilador = Perfilador()
+
+    _, detalhes = moneta_ag(gerar_variacoes(), qtd_iteracoes=4, qtd_epocas=6, seed=0,
+                            motor=motor, perfilador=perfilador, retornar_detalhes=True)
+
+    perfil = detalhes["perfil"]
+    assert set(perfil.index) == etapas
+    assert np.all(perfil["Tempo Total"] >= 0)
+    assert perfil.loc["covariancia", "Chamadas"] == 1
+    assert perfil.loc["populacao_inicial", "Chamadas"] == 1
+    assert perfil.loc["selecao", "Chamadas"] == chamadas_selecao
+    assert perfil.loc["avaliacao", "Chamadas"] == chamadas_selecao
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+from ag.selecao import selecionar_pares, sortear_roleta_exceto, sortear_sus
+
+FITNESSES = np.array([1.0, 4.0, 2.0, 0.5, 2.5])
+QTD_SORTEIOS = 200_000
+
+
+@pytest.mark.parametrize("fitnesses", [FITNESSES, np.array([0.0, 0.0, 5.0, 0.0])],
+                         ids=["positivos", "massa_na_excluida"])
+def test_roleta_exceto_nunca_sorteia_excluida(fitnesses):
+    """Nenhum sorteio cai na posição excluída, mesmo com todo o fitness nela."""
+
+    gerador = np.random.default_rng(0)
+    excluidas = gerador.integers(0, fitnesses.shape[0], size=10_000)
+
+    posicoes = sortear_roleta_exceto(fitnesses, np.cumsum(fitnesses), excluidas, gerador)
+
+    assert np.all(posicoes != excluidas)
+    assert np.all((posicoes >= 0) & (posicoes < fitnesses.shape[0]))
+
+
+def test_roleta_exceto_proporcional_ao_fitness():
+    """Sem a fatia excluída, cada posição sai com fitness / (total - fitness excluído)."""
+
+    gerador = np.random.default_rng(1)
+    excluidas = np.full(QTD_SORTEIOS, 1)
+
+    posicoes = sortear_roleta_exceto(FITNESSES, np.cumsum(FITNESSES), excluidas, gerador)
+
+    esperadas = np.where(np.arange(FITNESSES.shape[0]) == 1, 0.0, FITNESSES)
+    esperadas /= esperadas.sum()
+    frequencias = np.bincount(posicoes, minlength=FITNESSES.shape[0]) / QTD_SORTEIOS
+    np.testing.assert_allclose(frequencias, esperadas, atol=5e-3)
+
+
+@pytest.mark.parametrize("metodo", ["roleta", "sus"])
+def test_pais_proporcionais_ao_fitness(metodo):
+    """Na roleta e na SUS, os pais saem com frequência proporcional ao fitness."""
+
+    gerador = np.random.default_rng(2)
+
+    posicoes_pais, _ = selecionar_pares(FITNESSES, QTD_SORTEIOS, gerador, metodo)
+
+    frequencias = np.bincount(posicoes_pais, minlength=FITNESSES.shape[0]) / QTD_SORTEIOS
+    np.testing.assert_allclose(frequencias, FITNESSES / FITNESSES.sum(), atol=5e-3)
+
+
+def test_sus_espaca_ponteiros():
+    """A SUS dá a cada posição o piso ou o teto da sua quantidade esperada de sorteios."""
+
+    gerador = np.random.default_rng(3)
+    qtd_sorteios = 37
+
+    posicoes = sortear_sus(np.cumsum(FITNESSES), qtd_sorteios, gerador)
+
+    esperadas = FITNESSES / FITNESSES.sum() * qtd_sorteios
+    contagens = np.bincount(posicoes, minlength=FITNESSES.shape[0])
+    assert np.all((contagens >= np.floor(esperadas)) & (contagens <= np.ceil(esperadas)))
+
+
+@pytest.mark.parametrize("metodo", ["roleta", "torneio", "sus"])
+def test_pares_sem_repeticao(metodo):
+    """O pai nunca é a mãe do mesmo par; na SUS, os pares repetidos são refeitos."""
+
+    # quase todo o fitness em um cromossomo: a SUS sorteia pares repetidos com frequência
+    fitnesses = np.array([100.0, 1.0, 1.0, 1.0])
+    gerador = np.random.default_rng(4)
+
+    for _ in range(50):
+        posicoes_pais, posicoes_maes = selecionar_pares(fitnesses, 20, gerador, metodo)
+        assert np.all(posicoes_pais != posicoes_maes)
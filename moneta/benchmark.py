@@ -0,0 +1,279 @@
+import argparse
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from datetime import datetime
+from itertools import product
+import numpy as np
+import pandas as pd
+from ag.ag_numba import NUMBA_DISPONIVEL
+from ag.motores import MotorEsparso, MotorNumba, MotorNumpy, MotorPandas, MotorReinicios
+from cotacoes.cotacoes import formata_cotacoes
+from cotacoes.mercado_sintetico import PREGOES_ANO, ProvedorSintetico, simbolos_sinteticos
+from modelo.moneta import moneta_ag, moneta_otimizar, OTIMIZADORES
+
+# motores comparados pelo benchmark: parâmetros repassados ao moneta_ag (ou ao
+# moneta_otimizar, nos motores com 'metodo') e o maior universo em que cada um roda
+MOTORES = {
+    "pandas": {"parametros": {"motor": MotorPandas()}, "limite_acoes": 50},
+    "numpy_estacionario": {"parametros": {"motor": MotorNumpy("estacionario")}},
+    "numpy_geracional": {"parametros": {"motor": MotorNumpy("geracional")}},
+    "numpy_float32": {"parametros": {"motor": MotorNumpy("geracional"), "dtype": np.float32}},
+    "numpy_incremental": {"parametros": {"motor": MotorNumpy("geracional",
+                                                             risco_incremental=True)}},
+    "numpy_fatorial": {"parametros": {"motor": MotorNumpy("geracional"),
+                                      "modelo_covariancia": "fatorial", "qtd_fatores": 5}},
+    "numpy_esparso": {"parametros": {"motor": MotorEsparso(cardinalidade_maxima=20)}},
+    "numpy_reinicios": {"parametros": {"motor": MotorReinicios(qtd_reinicios=4)}},
+    "numpy_adaptativo": {"parametros": {"motor": MotorNumpy("geracional",
+                                                            operadores_adaptativos=True)}},
+    "numpy_cache": {"parametros": {"motor": MotorNumpy("geracional", tamanho_cache=100_000)}},
+    "numba": {"parametros": {"motor": MotorNumba()}},
+    "gradiente": {"parametros": {"metodo": "gradiente"}},
+    "cmaes": {"parametros": {"metodo": "cmaes"}},
+    "recozimento": {"parametros": {"metodo": "recozimento"}},
+}
+
+COLUNAS = ["motor", "qtd_acoes", "qtd_periodos", "qtd_epocas", "qtd_iteracoes",
+           "qtd_croms", "tempo_s", "avaliacoes", "avaliacoes_por_s", "memoria_pico_mb",
+           "fitness_final"]
+
+
+def gerar_variacoes_sinteticas(qtd_acoes: int, qtd_periodos: int, qtd_fatores: int = 3,
+                               seed=None) -> pd.DataFrame:
+    """
+    Função que gera um painel de variações diárias do mercado sintético (ver
+    cotacoes.mercado_sintetico.ProvedorSintetico: fatores correlacionados e choques de
+    caudas pesadas), passando as cotações pelo formata_cotacoes. O mercado é gerado sem
+    estreias nem lacunas, para que o painel tenha exatamente 'qtd_acoes' ações
+
+    Args:
+    qtd_acoes (int): quantidade de ações
+    qtd_periodos (int): quantidade de períodos (linhas) das variações
+    qtd_fatores (int): quantidade de fatores comuns (o primeiro é o mercado)
+    seed (int | np.random.SeedSequence): semente do mercado
+
+    Returns:
+    variacoes (pd.DataFrame): DataFrame (qtd_periodos, qtd_acoes) com as variações
+    """
+
+    provedor = ProvedorSintetico(qtd_anos=qtd_periodos // PREGOES_ANO + 1,
+                                 qtd_fatores=qtd_fatores, prob_estreia=0.0,
+                                 prob_lacunas=0.0, seed=seed)
+
+    # qtd_periodos + 1 cotações geram qtd_periodos variações
+    cotacoes = provedor.buscar(simbolos_sinteticos(qtd_acoes), provedor.datas[0],
+                               provedor.datas[qtd_periodos] + pd.Timedelta(days=1))
+
+    return formata_cotacoes(cotacoes, intervalo="d", maiores_medias=0)
+
+
+def contar_avaliacoes(parametros: dict, qtd_iteracoes: int, qtd_epocas: int,
+                      qtd_croms: int) -> int:
+    """
+    Função que calcula a quantidade de carteiras avaliadas por uma execução do moneta_ag
+    sem parada antecipada: a população inicial mais 8 descendentes por iteração de cada
+    época, multiplicados pela quantidade de populações do motor (reinícios ou ilhas)
+
+    Args:
+    parametros (dict): parâmetros do motor repassados ao moneta_ag
+    qtd_iteracoes (int): quantidade de iterações de cada época
+    qtd_epocas (int): quantidade de épocas
+    qtd_croms (int): quantidade de cromossomos de cada população
+
+    Returns:
+    int: quantidade de carteiras avaliadas
+    """
+
+    motor = parametros.get("motor")
+    qtd_populacoes = motor.qtd_populacoes if motor is not None else 1
+
+    return qtd_populacoes * (qtd_croms + 8 * qtd_iteracoes * qtd_epocas)
+
+
+def rodar_motor(motor: str, variacoes: pd.DataFrame, qtd_iteracoes: int, qtd_epocas: int,
+                qtd_croms: int, seed: int) -> tuple[float, int]:
+    """
+    Função que executa um motor uma vez
+
+    Args:
+    motor (str): nome do motor (chave de MOTORES)
+    variacoes (pd.DataFrame): DataFrame com as variações periódicas das ações
+    qtd_iteracoes (int): quantidade de iterações de cada época
+    qtd_epocas (int): quantidade de épocas
+    qtd_croms (int): quantidade de cromossomos da população
+    seed (int): semente da execução
+
+    Returns:
+    float: fitness da melhor carteira
+    int: quantidade de avaliações (carteiras avaliadas; no gradiente, inclui as
+         avaliações dos passos recusados na busca com retrocesso)
+    """
+
+    parametros = MOTORES[motor]["parametros"]
+
+    if parametros.get("metodo") in OTIMIZADORES:
+        # a CMA-ES e o recozimento recebem o mesmo orçamento de avaliações do AG
+        qtd_avaliacoes_max = contar_avaliacoes({}, qtd_iteracoes, qtd_epocas, qtd_croms)
+        carteira, detalhes = moneta_otimizar(variacoes, seed=seed, retornar_detalhes=True,
+                                             qtd_avaliacoes_max=qtd_avaliacoes_max,
+                                             **parametros)
+        return float(carteira["Fitnesses"]), detalhes["avaliacoes"]
+
+    if "metodo" in parametros:
+        carteira, detalhes = moneta_otimizar(variacoes, seed=seed, retornar_detalhes=True,
+                                             **parametros)
+        return float(carteira["Fitnesses"]), detalhes["avaliacoes"]
+
+    carteira = moneta_ag(variacoes, qtd_iteracoes=qtd_iteracoes, qtd_epocas=qtd_epocas,
+                         qtd_croms_populacao_geral=qtd_croms, seed=seed, **parametros)
+
+    return float(carteira["Fitnesses"]), contar_avaliacoes(parametros, qtd_iteracoes,
+                                                          qtd_epocas, qtd_croms)
+
+
+def medir_motor(motor: str, variacoes: pd.DataFrame, qtd_iteracoes: int, qtd_epocas: int,
+                qtd_croms: int, qtd_repeticoes: int, seed: int) -> dict:
+    """
+    Função que mede o tempo, as avaliações por segundo, o pico de memória e o fitness
+    final de um motor. O tempo é a mediana de 'qtd_repeticoes' execuções com a mesma
+    semente; o pico de memória vem de uma execução à parte com o tracemalloc ligado,
+    para que o rastreamento não entre no tempo. O numba roda uma vez antes, para que
+    a compilação também fique fora do tempo
+
+    Args:
+    motor (str): nome do motor (chave de MOTORES)
+    variacoes (pd.DataFrame): DataFrame com as variações periódicas das ações
+    qtd_iteracoes (int): quantidade de iterações de cada época
+    qtd_epocas (int): quantidade de épocas
+    qtd_croms (int): quantidade de cromossomos da população
+    qtd_repeticoes (int): quantidade de execuções cronometradas
+    seed (int): semente das execuções
+
+    Returns:
+    dict: linha de resultado com as colunas de COLUNAS
+    """
+
+    if motor == "numba":
+        rodar_motor(motor, variacoes, qtd_iteracoes, 1, qtd_croms, seed)
+
+    tempos = []
+    for _ in range(qtd_repeticoes):
+        inicio = time.perf_counter()
+        fitness, avaliacoes = rodar_motor(motor, variacoes, qtd_iteracoes, qtd_epocas,
+                                          qtd_croms, seed)
+        tempos.append(time.perf_counter() - inicio)
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    rodar_motor(motor, variacoes, qtd_iteracoes, qtd_epocas, qtd_croms, seed)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    tempo = statistics.median(tempos)
+
+    return {"motor": motor, "qtd_acoes": variacoes.shape[1], "qtd_periodos": variacoes.shape[0],
+            "qtd_epocas": qtd_epocas, "qtd_iteracoes": qtd_iteracoes, "qtd_croms": qtd_croms,
+            "tempo_s": tempo, "avaliacoes": avaliacoes,
+            "avaliacoes_por_s": avaliacoes / tempo, "memoria_pico_mb": pico / 2 ** 20,
+            "fitness_final": fitness}
+
+
+def rodar_benchmark(motores: list, colecao_acoes: list, colecao_periodos: list,
+                    qtd_iteracoes: int = 10, qtd_epocas: int = 40, qtd_croms: int = 40,
+                    qtd_repeticoes: int = 3, seed: int = 0) -> pd.DataFrame:
+    """
+    Função que mede todos os motores em todas as combinações de quantidade de ações e
+    de períodos. Cada combinação usa o mesmo painel sintético para todos os motores,
+    e os motores acima do seu 'limite_acoes' são pulados
+
+    Args:
+    motores (list): nomes dos motores (chaves de MOTORES)
+    colecao_acoes (list): quantidades de ações dos painéis
+    colecao_periodos (list): quantidades de períodos dos painéis
+    qtd_iteracoes (int): quantidade de iterações de cada época
+    qtd_epocas (int): quantidade de épocas
+    qtd_croms (int): quantidade de cromossomos da população
+    qtd_repeticoes (int): quantidade de execuções cronometradas de cada medição
+    seed (int): semente dos painéis e das execuções
+
+    Returns:
+    pd.DataFrame: uma linha por medição, com as colunas de COLUNAS
+    """
+
+    resultados = []
+
+    for qtd_acoes, qtd_periodos in product(colecao_acoes, colecao_periodos):
+        variacoes = gerar_variacoes_sinteticas(qtd_acoes, qtd_periodos, seed=seed)
+
+        for motor in motores:
+            if qtd_acoes > MOTORES[motor].get("limite_acoes", np.inf):
+                print(f"{motor}: pulado com {qtd_acoes} ações")
+                continue
+
+            resultado = medir_motor(motor, variacoes, qtd_iteracoes, qtd_epocas, qtd_croms,
+                                    qtd_repeticoes, seed)
+            resultados.append(resultado)
+
+            print(f"{motor}: {qtd_acoes} ações x {qtd_periodos} períodos, "
+                  f"{resultado['tempo_s']:.3f} s, "
+                  f"{resultado['avaliacoes_por_s']:.0f} avaliações/s, "
+                  f"{resultado['memoria_pico_mb']:.1f} MB")
+
+    return pd.DataFrame(resultados, columns=COLUNAS)
+
+
+def salvar_resultados(resultados: pd.DataFrame, caminho: str) -> None:
+    """
+    Função que salva os resultados em CSV ou, se o caminho terminar em '.json', em JSON
+    junto com o ambiente da medição (versões e máquina), para comparar versões
+
+    Args:
+    resultados (pd.DataFrame): DataFrame retornado pelo rodar_benchmark
+    caminho (str): caminho do arquivo de saída
+
+    Returns:
+    None
+    """
+
+    if caminho.endswith(".json"):
+        ambiente = {"data": datetime.now().isoformat(timespec="seconds"),
+                    "python": platform.python_version(), "numpy": np.__version__,
+                    "pandas": pd.__version__, "numba": NUMBA_DISPONIVEL,
+                    "maquina": platform.machine(), "sistema": platform.platform(),
+                    "processador": platform.processor()}
+
+        with open(caminho, "w", encoding="utf-8") as arquivo:
+            json.dump({"ambiente": ambiente, "resultados": resultados.to_dict("records")},
+                      arquivo, indent=2, ensure_ascii=False)
+    else:
+        resultados.to_csv(caminho, index=False)
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(
+        description="Benchmark dos motores do Moneta em painéis sintéticos de variações.")
+    parser.add_argument("--motores", nargs="+", choices=list(MOTORES),
+                        default=[motor for motor in MOTORES
+                                 if motor != "numba" or NUMBA_DISPONIVEL])
+    parser.add_argument("--acoes", nargs="+", type=int, default=[50, 200, 1000])
+    parser.add_argument("--periodos", nargs="+", type=int, default=[250, 1000])
+    parser.add_argument("--iteracoes", type=int, default=10)
+    parser.add_argument("--epocas", type=int, default=40)
+    parser.add_argument("--cromossomos", type=int, default=40)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--saida", default="benchmark.csv",
+                        help="arquivo de saída (.csv ou .json)")
+    argumentos = parser.parse_args()
+
+    resultados_benchmark = rodar_benchmark(argumentos.motores, argumentos.acoes,
+                                           argumentos.periodos, argumentos.iteracoes,
+                                           argumentos.epocas, argumentos.cromossomos,
+                                           argumentos.repeticoes, argumentos.seed)
+
+    salvar_resultados(resultados_benchmark, argumentos.saida)
+    print(f"Resultados salvos em {argumentos.saida}")
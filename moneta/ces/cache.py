@@ -0,0 +1,214 @@
+from collections import deque
+import numpy as np
+from ces.ces import ces_retornos, ces_riscos, ces_fitnesses
+
+
+class CacheFitness:
+    """
+    Cache de retornos, riscos e fitnesses na frente das funções ces_*. Os pesos de
+    cada carteira são quantizados em 'casas_decimais' casas, e a chave é uma
+    assinatura de 16 bytes dos pesos quantizados (duas projeções aleatórias fixas),
+    então cada entrada ocupa o mesmo espaço qualquer que seja o universo. Cada bloco
+    é primeiro reduzido às suas carteiras distintas (np.unique), que são consultadas
+    no cache, e apenas as distintas ausentes são avaliadas (em um único bloco). Perto
+    da convergência, a mutação um e o crossover de pais iguais geram muitas carteiras
+    repetidas, e cada acerto evita uma forma quadrática w'Σw de custo O(n²).
+
+    Quando o cache enche, as carteiras usadas há mais tempo são descartadas de uma
+    vez, um quarto da capacidade por vez (um LRU aproximado).
+
+    A assinatura custa O(n) por carteira, contra O(n²) da avaliação, então o cache só
+    compensa com uma taxa de acertos alta, e tanto mais quanto maior o universo; em
+    universos pequenos a avaliação já é barata e o cache deixa a execução mais lenta.
+
+    Com uma precisão baixa (poucas casas decimais), carteiras próximas, mas
+    diferentes, caem na mesma chave e recebem o retorno, o risco e o fitness da
+    primeira carteira avaliada: os valores passam a ser aproximados. Na precisão
+    padrão (10 casas) apenas carteiras iguais até o arredondamento compartilham a
+    chave (duas carteiras distintas só têm a mesma assinatura com uma probabilidade
+    desprezível).
+
+    A precisão nunca passa da resolução do tipo das médias (np.finfo(dtype).precision:
+    15 casas em float64 e 6 em float32). Em float32 os pesos não têm 10 casas exatas,
+    então a chave usa no máximo 6 casas, e carteiras que só diferem abaixo delas (no
+    ruído de arredondamento do próprio float32) dividem a chave.
+    """
+
+    def __init__(self, medias: np.ndarray, matriz_covariancia: np.ndarray,
+                 capacidade: int = 100_000, casas_decimais: int = 10):
+        """
+        Args:
+        - medias: array com as médias dos retornos dos ativos
+        - matriz_covariancia: array com a matriz de covariância dos retornos dos ativos
+        - capacidade: quantidade máxima de carteiras guardadas no cache
+        - casas_decimais: precisão da quantização dos pesos usada na chave (limitada
+          à resolução do tipo das médias)
+        """
+
+        if capacidade < 1:
+            raise ValueError("A capacidade do cache deve ser pelo menos 1.")
+
+        # os pesos quantizados (até 10^casas_decimais) ficam exatos em float64 até 2^53
+        if not 0 <= casas_decimais <= 15:
+            raise ValueError("A precisão do cache deve ficar entre 0 e 15 casas decimais.")
+
+        self.medias = medias
+        self.matriz_covariancia = matriz_covariancia
+        self.capacidade = capacidade
+        self.casas_decimais = min(casas_decimais, np.finfo(medias.dtype).precision)
+        self.escala = 10.0 ** self.casas_decimais
+
+        # projeções das assinaturas, sempre as mesmas para o mesmo universo
+        self._projecoes = np.random.default_rng(0).standard_normal((2, medias.shape[0]))
+
+        # os retornos, riscos e fitnesses ficam em um array, e o dicionário leva cada
+        # chave à sua linha: sem um objeto Python por carteira, o coletor de lixo não
+        # percorre o cache inteiro
+        self._valores = np.empty((capacidade, 3))
+        self._linhas = {}
+        self._chaves = [None] * capacidade
+        self.limpar()
+
+    @property
+    def taxa_acertos(self) -> float:
+        """Fração das consultas respondidas pelo cache (0.0 sem consultas)."""
+        consultas = self.acertos + self.falhas
+        return self.acertos / consultas if consultas else 0.0
+
+    def estatisticas(self) -> dict:
+        """
+        Retorna os contadores do cache.
+
+        Returns:
+        - dict: 'acertos', 'falhas', 'taxa_acertos' e 'tamanho' (carteiras guardadas)
+        """
+
+        return {"acertos": self.acertos, "falhas": self.falhas,
+                "taxa_acertos": self.taxa_acertos, "tamanho": len(self._linhas)}
+
+    def limpar(self):
+        """
+        Esvazia o cache e zera os contadores.
+        """
+
+        self._linhas.clear()
+
+        # último bloco em que cada linha foi usada (-1 nas linhas livres)
+        self._usos = np.full(self.capacidade, -1, dtype=np.int64)
+        self._relogio = 0
+        self._livres = np.arange(self.capacidade)
+
+        self.acertos = 0
+        self.falhas = 0
+
+    def _liberar_linhas(self, qtd_linhas: int):
+        """
+        Descarta as carteiras usadas há mais tempo, liberando pelo menos 'qtd_linhas'
+        linhas (ou um quarto da capacidade, o que for maior). As carteiras usadas no
+        bloco atual nunca são descartadas.
+
+        Args:
+        - qtd_linhas: quantidade mínima de linhas liberadas
+        """
+
+        candidatas = np.flatnonzero((self._usos >= 0) & (self._usos < self._relogio))
+        qtd_linhas = min(max(qtd_linhas, self.capacidade // 4), len(candidatas))
+
+        if qtd_linhas < len(candidatas):
+            candidatas = candidatas[np.argpartition(self._usos[candidatas],
+                                                    qtd_linhas - 1)[:qtd_linhas]]
+
+        for linha in candidatas.tolist():
+            del self._linhas[self._chaves[linha]]
+
+        self._usos[candidatas] = -1
+        self._livres = np.concatenate([self._livres, candidatas])
+
+    def avaliar(self, carteiras: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Calcula os retornos, riscos e fitnesses de um bloco de carteiras, consultando
+        o cache antes e avaliando apenas as carteiras ausentes (em um único bloco).
+
+        Args:
+        - carteiras: array (qtd_carteiras, qtd_genes) com os pesos das carteiras
+
+        Returns:
+        - retornos: array com os retornos das carteiras
+        - riscos: array com os riscos das carteiras
+        - fitnesses: array com os fitnesses das carteiras
+        """
+
+        self._relogio += 1
+
+        # arredondamento para o inteiro mais próximo (mais barato que o np.rint). A
+        # quantização é feita em float64 também para as carteiras em float32, cujo
+        # produto pela escala perderia os últimos dígitos
+        quantizadas = np.floor(np.multiply(carteiras, self.escala, dtype=np.float64) + 0.5)
+
+        # a assinatura de cada carteira são as duas projeções dos seus pesos quantizados.
+        # O einsum soma cada linha na mesma ordem, qualquer que seja a sua posição no
+        # bloco (o matmul do BLAS não garante isso), então carteiras iguais sempre têm a
+        # mesma assinatura
+        assinaturas = np.einsum("cg,pg->cp", quantizadas, self._projecoes)
+        assinaturas = assinaturas.view(np.dtype((np.void, 2 * assinaturas.itemsize))).ravel()
+        chaves = assinaturas.tolist()
+
+        # com carteiras repetidas, o bloco é reduzido às suas carteiras distintas:
+        # 'primeiras' é a primeira carteira de cada chave e 'inversa' leva cada carteira
+        # do bloco à sua chave
+        repetidas = len(set(chaves)) < len(chaves)
+        if repetidas:
+            distintas, primeiras, inversa = np.unique(assinaturas, return_index=True,
+                                                      return_inverse=True)
+            chaves = distintas.tolist()
+        else:
+            primeiras = np.arange(len(chaves))
+
+        # linha de cada chave no array de valores (-1 quando a chave não está no cache)
+        linhas = np.fromiter(map(self._linhas.get, chaves, [-1] * len(chaves)),
+                             dtype=np.intp, count=len(chaves))
+        ausentes = linhas < 0
+        posicoes_ausentes = np.flatnonzero(ausentes)
+
+        resultados = np.empty((len(chaves), 3))
+
+        if len(posicoes_ausentes) < len(chaves):
+            linhas_acertos = linhas[~ausentes]
+            resultados[~ausentes] = self._valores[linhas_acertos]
+            self._usos[linhas_acertos] = self._relogio
+
+        # as repetições dentro do bloco também contam como acertos, pois não são avaliadas
+        self.acertos += carteiras.shape[0] - len(posicoes_ausentes)
+        self.falhas += len(posicoes_ausentes)
+
+        if len(posicoes_ausentes):
+            ausentes = carteiras if len(posicoes_ausentes) == carteiras.shape[0] \
+                else carteiras[primeiras[posicoes_ausentes]]
+            retornos = ces_retornos(carteiras=ausentes, medias=self.medias)
+            riscos = ces_riscos(carteiras=ausentes, matriz_covariancia=self.matriz_covariancia)
+            fitnesses = ces_fitnesses(retornos=retornos, riscos=riscos)
+            resultados[posicoes_ausentes] = np.column_stack([retornos, riscos, fitnesses])
+
+            if len(posicoes_ausentes) > len(self._livres):
+                self._liberar_linhas(len(posicoes_ausentes) - len(self._livres))
+
+            # com a capacidade toda usada no bloco, guarda apenas as últimas ausentes
+            posicoes_guardadas = posicoes_ausentes[len(posicoes_ausentes) -
+                                                   min(len(posicoes_ausentes),
+                                                       len(self._livres)):]
+            linhas_guardadas = self._livres[:len(posicoes_guardadas)]
+            self._livres = self._livres[len(posicoes_guardadas):]
+
+            chaves_guardadas = [chaves[posicao] for posicao in posicoes_guardadas.tolist()]
+            self._linhas.update(zip(chaves_guardadas, linhas_guardadas.tolist()))
+            deque(map(self._chaves.__setitem__, linhas_guardadas.tolist(), chaves_guardadas),
+                  maxlen=0)
+
+            self._valores[linhas_guardadas] = resultados[posicoes_guardadas]
+            self._usos[linhas_guardadas] = self._relogio
+
+        # com repetições no bloco, cada carteira recebe os valores da sua chave
+        if repetidas:
+            resultados = resultados[inversa]
+
+        return resultados[:, 0], resultados[:, 1], resultados[:, 2]
@@ -1,16 +1,29 @@
 import pandas as pd
+import numpy as np
+from ces.covariancia import CovarianciaFatorial
 
 def ces_retornos(carteiras: pd.DataFrame, medias: pd.Series) -> pd.Series:
     """
     Esta função recebe multiplas carteiras e as médias periódicas das
     variações percentuais
-    :param carteiras = N Carteiras (linhas) por M acoes (colunas)
-    :param medias = Series com as médias das variacoes diárias das acoes
+    :param carteiras = N Carteiras (linhas) por M acoes (colunas), DataFrame ou np.ndarray
+    :param medias = Series (ou np.ndarray) com as médias das variacoes diárias das acoes.
+    Com carteiras (R, N, M), também aceita um np.ndarray (R, M) com as médias de cada
+    população
 
     :return todos os retornos das carteiras fornecidas de uma vez só!!!
     a função exponencial foi utilizada para positivar qualquer retorno negativo
     sem perder a relação entre os retornos bons e ruins
     """
+    if isinstance(carteiras, np.ndarray) and carteiras.ndim == 3 and np.ndim(medias) == 2:
+        # R populações, cada uma com as suas médias (por exemplo, uma por janela)
+        return 2 ** np.einsum("rpm,rm->rp", carteiras, medias).astype(np.float64)
+
+    if isinstance(carteiras, np.ndarray):
+        # com carteiras em float32, o expoente passa para float64 antes da exponencial:
+        # os retornos (e os fitnesses) têm um valor por carteira e ficam em precisão dupla
+        return 2 ** carteiras.dot(medias).astype(np.float64)
+
     return 2 ** carteiras.dot(medias)
 
 def ces_riscos(carteiras: pd.DataFrame, 
@@ -18,13 +31,35 @@ def ces_riscos(carteiras: pd.DataFrame,
     """
     Esta função recebe multiplas carteiras e a matriz de covariâncias
     entre os ativos (genes)
-    :param carteiras = N Carteiras (linhas) por M acoes (colunas)
-    :param matriz_covariancia = matriz das covariancias entre os ativos
+    :param carteiras = N Carteiras (linhas) por M acoes (colunas), DataFrame ou np.ndarray.
+    Também aceita um np.ndarray (R, N, M) com R populações de carteiras
+    :param matriz_covariancia = matriz das covariancias entre os ativos, um np.ndarray
+    (R, M, M) com uma matriz para cada uma das R populações, ou um modelo
+    fatorial (ces.covariancia.CovarianciaFatorial), que calcula os riscos em O(nk)
 
     :return todos os riscos das carteiras fornecidas de uma vez só!!!
     a função modular foi utilizada para positivar qualquer risco negativo
     sem perder a relação entre os riscos bons e ruins
+    com carteiras e matriz em float32, os produtos Σw ficam em float32 e apenas a
+    soma final de cada carteira é acumulada em float64
     """
+    if isinstance(matriz_covariancia, CovarianciaFatorial):
+        return matriz_covariancia.riscos(np.asarray(carteiras)).astype(np.float64)
+
+    if isinstance(carteiras, np.ndarray) and carteiras.ndim == 3:
+        # R populações avaliadas de uma vez, contra a mesma matriz de covariância ou
+        # contra a matriz de cada população (o matmul faz o broadcast das duas formas)
+        produtos = np.matmul(carteiras, matriz_covariancia)
+        return np.abs((produtos * carteiras).sum(axis=-1, dtype=np.float64))
+
+    if isinstance(carteiras, np.ndarray):
+        # o pandas guarda os blocos transpostos (ordem de colunas) e soma as linhas
+        # coluna a coluna; o mesmo layout é usado aqui para que os motores pandas e
+        # numpy produzam exatamente os mesmos riscos
+        carteiras = np.asfortranarray(carteiras)
+        produtos = np.asfortranarray(carteiras.dot(matriz_covariancia) * carteiras)
+        return np.abs(produtos.sum(axis=1, dtype=np.float64))
+
     return (carteiras.dot(matriz_covariancia) * carteiras).\
                                             sum(axis=1).__abs__()
 
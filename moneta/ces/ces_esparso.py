@@ -0,0 +1,35 @@
+import numpy as np
+from ces.covariancia import CovarianciaFatorial
+
+def ces_retornos_esparsos(indices: np.ndarray, pesos: np.ndarray,
+                          medias: np.ndarray) -> np.ndarray:
+    """
+    Esta função calcula os retornos de carteiras esparsas, guardadas como as
+    posições dos K ativos de cada carteira e os seus pesos
+    :param indices = array (N, K) com as posições dos ativos de cada carteira
+    :param pesos = array (N, K) com os pesos desses ativos
+    :param medias = np.ndarray com as médias das variacoes das M acoes
+
+    :return os retornos das carteiras, com a mesma função exponencial de ces_retornos
+    """
+    return 2 ** np.einsum("pk,pk->p", pesos, medias[indices]).astype(np.float64)
+
+def ces_riscos_esparsos(indices: np.ndarray, pesos: np.ndarray,
+                        matriz_covariancia: np.ndarray) -> np.ndarray:
+    """
+    Esta função calcula os riscos de carteiras esparsas usando apenas o bloco
+    K×K da matriz de covariância formado pelos ativos de cada carteira, em O(K²)
+    por carteira em vez de O(M²)
+    :param indices = array (N, K) com as posições dos ativos de cada carteira
+    :param pesos = array (N, K) com os pesos desses ativos
+    :param matriz_covariancia = matriz das covariancias entre as M acoes, ou um modelo
+    fatorial (ces.covariancia.CovarianciaFatorial), que calcula os riscos em O(Kk)
+
+    :return os riscos das carteiras, com a mesma função modular de ces_riscos
+    """
+    if isinstance(matriz_covariancia, CovarianciaFatorial):
+        return matriz_covariancia.riscos_esparsos(indices, pesos).astype(np.float64)
+
+    # blocos (N, K, K) com as covariâncias entre os ativos de cada carteira
+    blocos = matriz_covariancia[indices[:, :, np.newaxis], indices[:, np.newaxis, :]]
+    return np.abs(np.einsum("pk,pkl,pl->p", pesos, blocos, pesos).astype(np.float64))
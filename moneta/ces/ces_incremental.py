@@ -0,0 +1,78 @@
+import numpy as np
+from ces.covariancia import CovarianciaFatorial
+
+def ces_produtos_covariancia(carteiras: np.ndarray,
+                             matriz_covariancia: np.ndarray) -> np.ndarray:
+    """
+    Esta função calcula o produto Σw de cada carteira, que fica guardado junto
+    com a população para que os riscos dos descendentes sejam atualizados em O(n)
+    :param carteiras = N Carteiras (linhas) por M acoes (colunas)
+    :param matriz_covariancia = matriz das covariancias entre os ativos (ou modelo fatorial)
+
+    :return array (N, M) com os produtos Σw das carteiras
+    """
+    if isinstance(matriz_covariancia, CovarianciaFatorial):
+        return matriz_covariancia.produtos(carteiras)
+
+    return carteiras.dot(matriz_covariancia)
+
+def ces_riscos_crossover(als: np.ndarray, riscos_pais: np.ndarray, riscos_maes: np.ndarray,
+                         termos_cruzados: np.ndarray) -> np.ndarray:
+    """
+    Esta função calcula o risco dos filhos c = al * p + (1 - al) * m sem refazer a
+    forma quadrática: c'Σc = al² p'Σp + (1 - al)² m'Σm + 2 al (1 - al) p'Σm
+    :param als = coeficientes de cruzamento de cada filho
+    :param riscos_pais = riscos (p'Σp) dos pais
+    :param riscos_maes = riscos (m'Σm) das mães
+    :param termos_cruzados = termos cruzados p'Σm de cada par
+
+    :return os riscos dos filhos
+    """
+    return np.abs(als ** 2 * riscos_pais + (1 - als) ** 2 * riscos_maes +
+                  2 * als * (1 - als) * termos_cruzados)
+
+def ces_riscos_transferencia(riscos: np.ndarray, produtos: np.ndarray,
+                             matriz_covariancia: np.ndarray, genes_sorteados: np.ndarray,
+                             deltas: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Esta função atualiza o risco e o produto Σw de carteiras que transferem um
+    peso 'delta' do gene j para o gene i (w' = w + delta * (e_i - e_j)). As duas
+    mutações do AG são transferências deste tipo:
+    - mutação um (troca dos genes): delta = w_j - w_i
+    - mutação dois (soma no gene i): delta = w_j
+    - mutação dois (soma no gene j): delta = -w_i
+    w'Σw' = w'Σw + 2 delta ((Σw)_i - (Σw)_j) + delta² (Σ_ii + Σ_jj - 2 Σ_ij)
+    :param riscos = riscos (w'Σw) das carteiras originais
+    :param produtos = produtos Σw das carteiras originais (N, M)
+    :param matriz_covariancia = matriz das covariancias entre os ativos (ou modelo fatorial)
+    :param genes_sorteados = array (N, 2) com os genes i e j de cada carteira
+    :param deltas = peso transferido em cada carteira
+
+    :return os riscos e os produtos Σw das carteiras mutantes
+    """
+    linhas = np.arange(produtos.shape[0])
+    gene_i, gene_j = genes_sorteados[:, 0], genes_sorteados[:, 1]
+
+    variacao_produto = produtos[linhas, gene_i] - produtos[linhas, gene_j]
+
+    if isinstance(matriz_covariancia, CovarianciaFatorial):
+        # no modelo fatorial os elementos e as linhas de Σ custam O(k) e O(nk)
+        variancia_transferencia = matriz_covariancia.elementos(gene_i, gene_i) + \
+                                  matriz_covariancia.elementos(gene_j, gene_j) - \
+                                  2 * matriz_covariancia.elementos(gene_i, gene_j)
+        diferenca_linhas = matriz_covariancia.linhas(gene_i) - \
+                           matriz_covariancia.linhas(gene_j)
+    else:
+        variancia_transferencia = matriz_covariancia[gene_i, gene_i] + \
+                                  matriz_covariancia[gene_j, gene_j] - \
+                                  2 * matriz_covariancia[gene_i, gene_j]
+
+        # a matriz é simétrica, então as linhas i e j são as colunas i e j de Σ
+        diferenca_linhas = matriz_covariancia[gene_i] - matriz_covariancia[gene_j]
+
+    riscos_mutantes = np.abs(riscos + 2 * deltas * variacao_produto +
+                             deltas ** 2 * variancia_transferencia)
+
+    produtos_mutantes = produtos + deltas[:, np.newaxis] * diferenca_linhas
+
+    return riscos_mutantes, produtos_mutantes
@@ -0,0 +1,184 @@
+import numpy as np
+import pandas as pd
+
+MODELOS_COVARIANCIA = ["amostral", "fatorial"]
+
+
+class CovarianciaFatorial:
+    """
+    Modelo fatorial (de posto baixo) da matriz de covariância:
+    Σ = B B' + diag(d), com as cargas B (n, k) dos k fatores e as variâncias
+    idiossincráticas d (n,). A matriz n×n nunca é montada: o risco de uma carteira
+    é w'Σw = ||B'w||² + Σ d_i w_i², em O(nk) em vez de O(n²).
+    """
+
+    def __init__(self, cargas: np.ndarray, variancias_especificas: np.ndarray):
+        """
+        Args:
+        - cargas: array (qtd_ativos, qtd_fatores) com as cargas dos fatores
+        - variancias_especificas: array (qtd_ativos,) com as variâncias idiossincráticas
+        """
+
+        self.cargas = cargas
+        self.variancias_especificas = variancias_especificas
+
+    @property
+    def shape(self) -> tuple:
+        """Formato (qtd_ativos, qtd_ativos) da matriz representada."""
+        qtd_ativos = self.cargas.shape[0]
+        return (qtd_ativos, qtd_ativos)
+
+    @property
+    def dtype(self):
+        """Tipo numérico das cargas e das variâncias."""
+        return self.cargas.dtype
+
+    def riscos(self, carteiras: np.ndarray) -> np.ndarray:
+        """
+        Calcula o risco |w'Σw| de cada carteira em O(nk).
+
+        Args:
+        - carteiras: array (..., qtd_ativos) com os pesos das carteiras
+
+        Returns:
+        - riscos: array (...) com os riscos das carteiras
+        """
+
+        exposicoes = carteiras @ self.cargas
+        return np.abs(np.einsum("...k,...k->...", exposicoes, exposicoes) +
+                      (carteiras ** 2) @ self.variancias_especificas)
+
+    def riscos_esparsos(self, indices: np.ndarray, pesos: np.ndarray) -> np.ndarray:
+        """
+        Calcula o risco de carteiras esparsas (K ativos cada) em O(Kk), usando
+        apenas as cargas dos ativos presentes em cada carteira.
+
+        Args:
+        - indices: array (qtd_carteiras, K) com as posições dos ativos de cada carteira
+        - pesos: array (qtd_carteiras, K) com os pesos desses ativos
+
+        Returns:
+        - riscos: array (qtd_carteiras,) com os riscos das carteiras
+        """
+
+        exposicoes = np.einsum("pk,pkf->pf", pesos, self.cargas[indices])
+        return np.abs(np.einsum("pf,pf->p", exposicoes, exposicoes) +
+                      np.einsum("pk,pk->p", pesos ** 2, self.variancias_especificas[indices]))
+
+    def produtos(self, carteiras: np.ndarray) -> np.ndarray:
+        """
+        Calcula o produto Σw de cada carteira em O(nk).
+
+        Args:
+        - carteiras: array (..., qtd_ativos) com os pesos das carteiras
+
+        Returns:
+        - produtos: array (..., qtd_ativos) com os produtos Σw
+        """
+
+        return (carteiras @ self.cargas) @ self.cargas.T + carteiras * self.variancias_especificas
+
+    def elementos(self, linhas: np.ndarray, colunas: np.ndarray) -> np.ndarray:
+        """
+        Retorna os elementos Σ_ij para os pares (linhas[p], colunas[p]).
+
+        Args:
+        - linhas: array com os índices das linhas
+        - colunas: array com os índices das colunas
+
+        Returns:
+        - elementos: array com os elementos de Σ
+        """
+
+        elementos = np.einsum("pk,pk->p", self.cargas[linhas], self.cargas[colunas])
+        return elementos + np.where(linhas == colunas, self.variancias_especificas[linhas], 0)
+
+    def linhas(self, indices: np.ndarray) -> np.ndarray:
+        """
+        Retorna as linhas de Σ (iguais às colunas, pois Σ é simétrica).
+
+        Args:
+        - indices: array com os índices das linhas
+
+        Returns:
+        - linhas: array (qtd_indices, qtd_ativos) com as linhas de Σ
+        """
+
+        linhas = self.cargas[indices] @ self.cargas.T
+        linhas[np.arange(len(indices)), indices] += self.variancias_especificas[indices]
+        return linhas
+
+    def densa(self) -> np.ndarray:
+        """
+        Monta a matriz n×n (apenas para conferência ou para motores que exigem Σ densa).
+
+        Returns:
+        - matriz_covariancia: array (qtd_ativos, qtd_ativos)
+        """
+
+        return self.cargas @ self.cargas.T + np.diag(self.variancias_especificas)
+
+
+def estimar_covariancia_amostral(variacoes: pd.DataFrame, dtype=np.float64) -> np.ndarray:
+    """
+    Função que calcula a matriz de covariância amostral das variações no tipo pedido.
+    Em float64 o cálculo é o do pandas (o mesmo do MotorPandas); em float32 as
+    variações são centralizadas e multiplicadas diretamente em float32, sem montar
+    uma cópia n×n em float64.
+
+    Args:
+    - variacoes: DataFrame com as variações periódicas das ações
+    - dtype: tipo da matriz (np.float64 ou np.float32)
+
+    Returns:
+    - matriz_covariancia: array (qtd_ativos, qtd_ativos)
+    """
+
+    if np.dtype(dtype) == np.float64:
+        return variacoes.cov().to_numpy(dtype=np.float64)
+
+    valores = np.asarray(variacoes, dtype=dtype)
+
+    # as médias são acumuladas em float64 e a centralização evita o cancelamento
+    # catastrófico de E[xy] - E[x]E[y] em precisão simples
+    centralizadas = valores - valores.mean(axis=0, dtype=np.float64).astype(dtype)
+
+    return centralizadas.T @ centralizadas / (valores.shape[0] - 1)
+
+
+def estimar_covariancia_fatorial(variacoes: pd.DataFrame, qtd_fatores: int = 5,
+                                 dtype=np.float64) -> CovarianciaFatorial:
+    """
+    Função que estima o modelo fatorial da covariância por PCA: os k maiores
+    componentes principais das variações formam as cargas e o que sobra da
+    variância de cada ativo vira a variância idiossincrática. A decomposição é
+    feita sobre as variações (T×n), sem montar a matriz de covariância amostral.
+
+    Args:
+    - variacoes: DataFrame (ou array) com as variações periódicas das ações
+    - qtd_fatores: quantidade de fatores (componentes principais)
+    - dtype: tipo das cargas e das variâncias (a decomposição é sempre feita em float64)
+
+    Returns:
+    - CovarianciaFatorial: modelo com as cargas e as variâncias idiossincráticas
+    """
+
+    variacoes = np.asarray(variacoes, dtype=np.float64)
+    qtd_observacoes, qtd_ativos = variacoes.shape
+
+    if not 1 <= qtd_fatores <= min(qtd_observacoes - 1, qtd_ativos):
+        raise ValueError("A quantidade de fatores deve ficar entre 1 e "
+                         f"{min(qtd_observacoes - 1, qtd_ativos)}.")
+
+    centralizadas = variacoes - variacoes.mean(axis=0)
+    _, valores_singulares, componentes = np.linalg.svd(centralizadas, full_matrices=False)
+
+    # cargas = autovetores escalados pela raiz dos autovalores da covariância amostral
+    cargas = componentes[:qtd_fatores].T * \
+             (valores_singulares[:qtd_fatores] / np.sqrt(qtd_observacoes - 1))
+
+    variancias = centralizadas.var(axis=0, ddof=1)
+    variancias_especificas = np.maximum(variancias - (cargas ** 2).sum(axis=1), 0.0)
+
+    return CovarianciaFatorial(np.ascontiguousarray(cargas, dtype=dtype),
+                               variancias_especificas.astype(dtype))
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+from ces.cache import CacheFitness
+from ces.ces import ces_retornos, ces_riscos, ces_fitnesses
+from ces.covariancia import estimar_covariancia_amostral
+
+
+@pytest.mark.parametrize("capacidade", [100_000, 8, 1])
+def test_cache_reproduz_avaliacao(gerar_variacoes, capacidade):
+    """
+    Com ou sem repetições no bloco, e mesmo descartando carteiras, o cache devolve os
+    valores da avaliação direta; as repetições dentro do bloco contam como acertos.
+    """
+
+    variacoes = gerar_variacoes(qtd_acoes=12)
+    medias = variacoes.mean(axis=0).to_numpy()
+    matriz_covariancia = estimar_covariancia_amostral(variacoes)
+
+    gerador = np.random.default_rng(0)
+    carteiras = gerador.random((6, 20, medias.shape[0]))
+    carteiras /= carteiras.sum(axis=2, keepdims=True)
+    carteiras[0, [3, 7, 11]] = carteiras[0, 5]
+
+    cache = CacheFitness(medias, matriz_covariancia, capacidade)
+
+    for indice in gerador.integers(6, size=40):
+        bloco = carteiras[indice]
+        retornos = ces_retornos(carteiras=bloco, medias=medias)
+        riscos = ces_riscos(carteiras=bloco, matriz_covariancia=matriz_covariancia)
+
+        for obtido, esperado in zip(cache.avaliar(bloco),
+                                    (retornos, riscos, ces_fitnesses(retornos, riscos))):
+            np.testing.assert_allclose(obtido, esperado, rtol=1e-12)
+
+    assert cache.estatisticas()["tamanho"] <= capacidade
+    if capacidade > carteiras.shape[0] * carteiras.shape[1]:
+        # cada carteira distinta é avaliada uma única vez
+        assert cache.falhas == carteiras.shape[0] * carteiras.shape[1] - 3
+
+
+def test_cache_float32_limita_precisao(gerar_variacoes):
+    """Em float32 a chave usa a resolução do float32, e os valores seguem a avaliação."""
+
+    variacoes = gerar_variacoes(qtd_acoes=12).astype(np.float32)
+    medias = variacoes.mean(axis=0).to_numpy()
+    matriz_covariancia = estimar_covariancia_amostral(variacoes, np.float32)
+
+    gerador = np.random.default_rng(1)
+    carteiras = gerador.random((30, medias.shape[0]))
+    # pesos no centro das casas do float32, longe das fronteiras do arredondamento
+    carteiras = np.round(carteiras / carteiras.sum(axis=1, keepdims=True), 6).astype(np.float32)
+
+    cache = CacheFitness(medias, matriz_covariancia, casas_decimais=10)
+    assert cache.casas_decimais == np.finfo(np.float32).precision
+
+    # uma perturbação no último bit do float32 cai na mesma chave; uma acima da
+    # resolução, não
+    vizinhas = np.nextafter(carteiras, np.float32(1))
+    distantes = carteiras + np.float32(1e-4)
+    retornos, riscos, fitnesses = cache.avaliar(np.concatenate([carteiras, vizinhas,
+                                                                distantes]))
+    assert cache.falhas == 2 * carteiras.shape[0]
+
+    retornos_diretos = ces_retornos(carteiras=distantes, medias=medias)
+    riscos_diretos = ces_riscos(carteiras=distantes, matriz_covariancia=matriz_covariancia)
+    np.testing.assert_allclose(retornos[-30:], retornos_diretos, rtol=1e-6)
+    np.testing.assert_allclose(riscos[-30:], riscos_diretos, rtol=1e-6)
+    np.testing.assert_allclose(fitnesses[-30:], ces_fitnesses(retornos_diretos, riscos_diretos),
+                               rtol=1e-6)
+
+    # em float64 a precisão pedida é mantida
+    assert CacheFitness(medias.astype(np.float64), matriz_covariancia.astype(np.float64),
+                        casas_decimais=10).casas_decimais == 10
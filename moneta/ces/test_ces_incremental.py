@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+from ag.ag_numpy import (montar_descendentes, montar_descendentes_incremental,
+                         sortear_genes_lote)
+from ag.motores import MotorNumpy
+from ces.ces import ces_riscos
+from ces.ces_incremental import ces_produtos_covariancia
+from ces.covariancia import estimar_covariancia_amostral, estimar_covariancia_fatorial
+from modelo.moneta import moneta_ag
+
+
+@pytest.mark.parametrize("modelo_covariancia", ["amostral", "fatorial"])
+def test_descendentes_incrementais_iguais_a_reavaliacao(gerar_variacoes, modelo_covariancia):
+    """Os riscos e os produtos Σw atualizados em O(n) são os da reavaliação completa."""
+
+    variacoes = gerar_variacoes(qtd_acoes=10)
+    matriz_covariancia = estimar_covariancia_fatorial(variacoes, 3) \
+        if modelo_covariancia == "fatorial" else estimar_covariancia_amostral(variacoes)
+
+    gerador = np.random.default_rng(3)
+    qtd_pares, qtd_genes = 6, variacoes.shape[1]
+    populacao = gerador.random((2 * qtd_pares, qtd_genes))
+    populacao /= populacao.sum(axis=1, keepdims=True)
+    pais, maes = populacao[:qtd_pares], populacao[qtd_pares:]
+
+    als = gerador.random((2, qtd_pares))
+    genes_um = sortear_genes_lote(2 * qtd_pares, qtd_genes, gerador)
+    genes_dois = sortear_genes_lote(2 * qtd_pares, qtd_genes, gerador)
+
+    descendentes, riscos, produtos = montar_descendentes_incremental(
+        pais, maes, ces_riscos(pais, matriz_covariancia), ces_riscos(maes, matriz_covariancia),
+        ces_produtos_covariancia(pais, matriz_covariancia),
+        ces_produtos_covariancia(maes, matriz_covariancia),
+        matriz_covariancia, als, genes_um, genes_dois)
+
+    np.testing.assert_array_equal(descendentes,
+                                  montar_descendentes(pais, maes, als, genes_um, genes_dois))
+    np.testing.assert_allclose(riscos, ces_riscos(descendentes, matriz_covariancia),
+                               rtol=1e-10)
+    np.testing.assert_allclose(produtos,
+                               ces_produtos_covariancia(descendentes, matriz_covariancia),
+                               rtol=1e-10, atol=1e-15)
+
+
+@pytest.mark.parametrize("modo", ["estacionario", "geracional"])
+def test_risco_incremental_reproduz_moneta_ag(gerar_variacoes, modo):
+    """Com a mesma semente, o risco incremental leva à mesma carteira da reavaliação."""
+
+    variacoes = gerar_variacoes(qtd_acoes=12)
+
+    carteira = moneta_ag(variacoes, qtd_iteracoes=5, qtd_epocas=20, motor=MotorNumpy(modo),
+                         seed=7)
+    carteira_incremental = moneta_ag(variacoes, qtd_iteracoes=5, qtd_epocas=20, seed=7,
+                                     motor=MotorNumpy(modo, risco_incremental=True))
+
+    assert carteira.name == carteira_incremental.name
+    np.testing.assert_array_equal(carteira.to_numpy(), carteira_incremental.to_numpy())
@@ -0,0 +1,21 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def gerar_variacoes():
+    """
+    Fixture que gera painéis pequenos de variações correlacionadas (um fator comum
+    mais um ruído próprio), no formato do formata_cotacoes.
+    """
+
+    def gerar(qtd_acoes: int = 8, qtd_periodos: int = 120, seed: int = 0) -> pd.DataFrame:
+        gerador = np.random.default_rng(seed)
+        fator = gerador.normal(0.0, 0.01, size=(qtd_periodos, 1))
+        exposicoes = gerador.normal(1.0, 0.3, size=(1, qtd_acoes))
+        variacoes = fator @ exposicoes + gerador.normal(0.0005, 0.01, size=qtd_acoes) + \
+            gerador.normal(0.0, 0.015, size=(qtd_periodos, qtd_acoes))
+        return pd.DataFrame(variacoes, columns=[f"ACAO{i}" for i in range(qtd_acoes)])
+
+    return gerar
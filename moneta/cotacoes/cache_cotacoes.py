@@ -0,0 +1,266 @@
+import os
+import json
+import warnings
+from datetime import datetime
+from pathlib import Path
+import pandas as pd
+
+# pasta padrão do cache de cotações (a variável de ambiente MONETA_CACHE_COTACOES muda a pasta)
+PASTA_CACHE_PADRAO = Path(os.environ.get("MONETA_CACHE_COTACOES",
+                                         Path.home() / ".cache" / "moneta" / "cotacoes"))
+
+# dias a mais baixados em cada lado de uma lacuna, para que ela se sobreponha ao cache
+# em pelo menos um pregão
+DIAS_SOBREPOSICAO = 7
+
+
+class CacheCotacoes:
+    """
+    Cache local das cotações: um arquivo Parquet por símbolo (coluna 'Adj Close', índice
+    'Date') e um índice JSON com o intervalo de datas [inicio, fim) já buscado de cada
+    símbolo. Uma busca lê o cache e baixa apenas as lacunas antes e depois do intervalo
+    coberto, então o intervalo de cada símbolo continua contíguo. O dia de hoje nunca
+    entra na cobertura, porque a cotação do dia ainda muda.
+
+    Uma lacuna baixada sem nenhuma cotação (antes da estreia da ação, depois do seu
+    cancelamento ou em feriados) também passa a ser coberta, para não ser baixada de
+    novo a cada busca; por isso a função de download deve lançar uma exceção quando a
+    rede falha, em vez de devolver cotações vazias.
+
+    As cotações ajustadas (dividendos e desdobramentos) mudam o histórico inteiro. Cada
+    lacuna é baixada com uma data de sobreposição com o cache e, se o preço da
+    sobreposição mudou, o histórico guardado é reescalado pela mesma razão.
+    """
+
+    def __init__(self, pasta=None):
+        """
+        Args:
+        - pasta: pasta dos arquivos do cache (None usa PASTA_CACHE_PADRAO)
+        """
+
+        self.pasta = Path(pasta) if pasta is not None else PASTA_CACHE_PADRAO
+        self.caminho_indice = self.pasta / "cobertura.json"
+        self._cobertura = None
+
+    def caminho(self, simbolo: str) -> Path:
+        """
+        Retorna o caminho do arquivo Parquet de um símbolo.
+
+        Args:
+        - simbolo: símbolo (ticker) da ação
+
+        Returns:
+        - Path: caminho do arquivo
+        """
+
+        return self.pasta / f"{simbolo.replace('/', '_')}.parquet"
+
+    @property
+    def cobertura(self) -> dict:
+        """Dicionário {simbolo: (inicio, fim)} com o intervalo já buscado de cada símbolo."""
+
+        if self._cobertura is None:
+            self._cobertura = {}
+            if self.caminho_indice.exists():
+                with open(self.caminho_indice) as arquivo:
+                    self._cobertura = {simbolo: (pd.Timestamp(inicio), pd.Timestamp(fim))
+                                       for simbolo, (inicio, fim) in json.load(arquivo).items()}
+        return self._cobertura
+
+    def ler(self, simbolo: str) -> pd.Series:
+        """
+        Lê as cotações guardadas de um símbolo.
+
+        Args:
+        - simbolo: símbolo (ticker) da ação
+
+        Returns:
+        - pd.Series: cotações do símbolo (vazia se ele não está no cache)
+        """
+
+        caminho = self.caminho(simbolo)
+        if not caminho.exists():
+            return pd.Series(dtype="float64", index=pd.DatetimeIndex([], name="Date"),
+                             name=simbolo)
+
+        return pd.read_parquet(caminho)["Adj Close"].rename(simbolo)
+
+    def salvar(self, simbolo: str, cotacoes: pd.Series, inicio: pd.Timestamp,
+               fim: pd.Timestamp):
+        """
+        Guarda as cotações de um símbolo e atualiza o intervalo coberto por elas na
+        memória; o índice em disco só é gravado pelo salvar_cobertura.
+
+        Args:
+        - simbolo: símbolo (ticker) da ação
+        - cotacoes: cotações do símbolo
+        - inicio: primeira data coberta
+        - fim: data seguinte à última data coberta
+        """
+
+        self.pasta.mkdir(parents=True, exist_ok=True)
+
+        # grava em um arquivo temporário e troca de uma vez, para que uma interrupção
+        # nunca deixe um arquivo pela metade
+        caminho = self.caminho(simbolo)
+        temporario = caminho.with_name(caminho.name + ".tmp")
+        cotacoes.rename("Adj Close").rename_axis("Date").to_frame().to_parquet(temporario)
+        os.replace(temporario, caminho)
+
+        self.cobertura[simbolo] = (inicio, fim)
+
+    def salvar_cobertura(self):
+        """
+        Grava o índice de cobertura de todos os símbolos (uma vez por busca). Os arquivos
+        das cotações são gravados antes, então uma interrupção no meio da busca deixa o
+        índice antigo, que só cobre cotações que já estão no disco.
+        """
+
+        self.pasta.mkdir(parents=True, exist_ok=True)
+
+        temporario = self.caminho_indice.with_name(self.caminho_indice.name + ".tmp")
+        with open(temporario, "w") as arquivo:
+            json.dump({simbolo: [inicio.strftime("%Y-%m-%d"), fim.strftime("%Y-%m-%d")]
+                       for simbolo, (inicio, fim) in self.cobertura.items()},
+                      arquivo, indent=1, sort_keys=True)
+        os.replace(temporario, self.caminho_indice)
+
+    def lacunas(self, simbolo: str, inicio: pd.Timestamp,
+                fim: pd.Timestamp) -> list:
+        """
+        Calcula os intervalos de [inicio, fim) que ainda não estão no cache.
+
+        Args:
+        - simbolo: símbolo (ticker) da ação
+        - inicio: primeira data pedida
+        - fim: data seguinte à última data pedida
+
+        Returns:
+        - list: lista de tuplas (inicio, fim), no máximo uma antes e uma depois do
+          intervalo coberto. As lacunas vão até o intervalo coberto (mesmo que o
+          pedido não encoste nele), para que a cobertura continue contígua
+        """
+
+        if simbolo not in self.cobertura:
+            return [(inicio, fim)] if inicio < fim else []
+
+        inicio_coberto, fim_coberto = self.cobertura[simbolo]
+        lacunas = []
+        if inicio < inicio_coberto:
+            lacunas.append((inicio, inicio_coberto))
+        if fim > fim_coberto:
+            lacunas.append((fim_coberto, fim))
+        return lacunas
+
+    def buscar(self, simbolos: list, data_inicio, data_fim, baixar=None,
+               offline: bool = False) -> pd.DataFrame:
+        """
+        Busca as cotações de [data_inicio, data_fim) pelo cache, baixando apenas as
+        lacunas. Símbolos com a mesma lacuna são baixados juntos, em uma só chamada.
+
+        Args:
+        - simbolos: lista com os símbolos (tickers) das ações
+        - data_inicio: primeira data (str 'aaaa-mm-dd', date ou datetime)
+        - data_fim: data final, exclusiva como no yf.download
+        - baixar: função baixar(simbolos, data_inicio, data_fim) -> pd.DataFrame (uma
+          coluna por símbolo) usada nas lacunas; obrigatória fora do modo offline
+        - offline: se True, nunca baixa nada e usa apenas o que está no cache
+
+        Returns:
+        - pd.DataFrame: cotações com uma coluna por símbolo (colunas vazias para os
+          símbolos sem nenhuma cotação)
+        """
+
+        inicio, fim = pd.Timestamp(data_inicio), pd.Timestamp(data_fim)
+
+        # a cotação de hoje (e a de datas futuras) ainda pode mudar e não é coberta
+        hoje = pd.Timestamp(datetime.today().date())
+
+        lacunas_simbolos = {} if offline else \
+            {simbolo: self.lacunas(simbolo, inicio, min(fim, hoje)) for simbolo in simbolos}
+
+        if not offline and baixar is None:
+            raise ValueError("Fora do modo offline é necessário informar a função 'baixar'.")
+
+        # agrupa os símbolos pelas lacunas, para baixar cada lacuna uma só vez
+        grupos = {}
+        for simbolo, lacunas in lacunas_simbolos.items():
+            for lacuna in lacunas:
+                grupos.setdefault(lacuna, []).append(simbolo)
+
+        baixadas = {}
+        for (inicio_lacuna, fim_lacuna), simbolos_lacuna in grupos.items():
+            # a lacuna é estendida para os lados do cache, para que haja pelo menos uma
+            # data de sobreposição que revele mudanças de ajuste
+            sobreposicao = pd.Timedelta(days=DIAS_SOBREPOSICAO) \
+                if any(simbolo in self.cobertura for simbolo in simbolos_lacuna) \
+                else pd.Timedelta(0)
+            inicio_download = inicio_lacuna - sobreposicao
+            fim_download = min(fim_lacuna + sobreposicao, hoje)
+
+            cotacoes = baixar(simbolos_lacuna, inicio_download.strftime("%Y-%m-%d"),
+                              fim_download.strftime("%Y-%m-%d"))
+            if isinstance(cotacoes, pd.Series):
+                cotacoes = cotacoes.to_frame(simbolos_lacuna[0])
+
+            for simbolo in simbolos_lacuna:
+                novas = cotacoes[simbolo].dropna() if simbolo in cotacoes.columns \
+                    else pd.Series(dtype="float64")
+                baixadas.setdefault(simbolo, []).append((inicio_lacuna, fim_lacuna, novas))
+
+        for simbolo, blocos in baixadas.items():
+            self._incorporar(simbolo, blocos)
+
+        if baixadas:
+            self.salvar_cobertura()
+
+        colunas = {}
+        for simbolo in simbolos:
+            cotacoes = self.ler(simbolo)
+            colunas[simbolo] = cotacoes.loc[(cotacoes.index >= inicio) &
+                                            (cotacoes.index < fim)]
+
+            if offline and self.lacunas(simbolo, inicio, min(fim, hoje)):
+                warnings.warn(f"O cache não cobre todo o período pedido para '{simbolo}'; "
+                              "no modo offline as datas ausentes ficam de fora.")
+
+        cotacoes = pd.DataFrame(colunas, columns=list(simbolos))
+        cotacoes.index.name = "Date"
+
+        return cotacoes.sort_index()
+
+    def _incorporar(self, simbolo: str, blocos: list):
+        """
+        Junta as cotações baixadas de um símbolo às guardadas, reescala o histórico
+        guardado quando o ajuste das cotações mudou e atualiza a cobertura.
+
+        Args:
+        - simbolo: símbolo (ticker) da ação
+        - blocos: lista de tuplas (inicio_lacuna, fim_lacuna, cotacoes)
+        """
+
+        guardadas = self.ler(simbolo)
+        inicio_coberto, fim_coberto = self.cobertura.get(simbolo, (None, None))
+
+        for inicio_lacuna, fim_lacuna, novas in blocos:
+            sobreposicao = guardadas.index.intersection(novas.index)
+            if len(sobreposicao) > 0:
+                # razão entre o preço novo e o guardado na data de sobreposição mais recente
+                data = sobreposicao[-1]
+                razao = novas.loc[data] / guardadas.loc[data]
+                if abs(razao - 1) > 1e-9:
+                    guardadas = guardadas * razao
+
+            # as cotações novas prevalecem nas datas repetidas
+            guardadas = pd.concat([guardadas[~guardadas.index.isin(novas.index)], novas])
+
+            # a lacuna fica coberta mesmo sem cotações: o período não tem pregões da ação
+            inicio_coberto = inicio_lacuna if inicio_coberto is None \
+                else min(inicio_coberto, inicio_lacuna)
+            fim_coberto = fim_lacuna if fim_coberto is None \
+                else max(fim_coberto, fim_lacuna)
+
+        guardadas = guardadas.sort_index().astype("float64")
+        guardadas.index = pd.DatetimeIndex(guardadas.index, name="Date")
+
+        self.salvar(simbolo, guardadas, inicio_coberto, fim_coberto)
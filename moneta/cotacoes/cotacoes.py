@@ -1,9 +1,16 @@
-import yfinance as yf
 from datetime import datetime, timedelta
 import pandas as pd
+import numpy as np
+from scipy.cluster.hierarchy import linkage, fcluster
+from scipy.spatial.distance import squareform
+from cotacoes.cache_cotacoes import CacheCotacoes, PASTA_CACHE_PADRAO
+from cotacoes.provedores import ProvedorCotacoes, ProvedorYfinance
 
-def busca_cotacoes(simbolos: list, intervalo: str, 
-                   **kwargs) -> pd.DataFrame:
+CRITERIOS_CLUSTER = ["media", "sharpe", "volatilidade"]
+
+def busca_cotacoes(simbolos: list, intervalo: str, usar_cache: bool = True,
+                   offline: bool = False, pasta_cache=None,
+                   provedor: ProvedorCotacoes = None, **kwargs) -> pd.DataFrame:
 
     """
     Função que busca as variações periódicas das ações
@@ -11,12 +18,31 @@ def busca_cotacoes(simbolos: list, intervalo: str,
     Args:
     simbolos (list): Lista com os símbolos (tickers) das ações
     cotacoes_anteriores (int): Quantidade de cotações anteriores a serem buscadas para as variações das ações
+    usar_cache (bool): se True, as cotações passam pelo cache local em Parquet (ver
+                       cotacoes.cache_cotacoes.CacheCotacoes): o que já foi baixado é lido
+                       do disco e apenas os períodos ausentes são baixados
+    offline (bool): se True, nunca acessa a rede e usa apenas as cotações do cache
+    pasta_cache (str | Path): pasta do cache (None usa uma subpasta da pasta padrão com o
+                              nome do provedor; a pasta padrão pode ser mudada pela
+                              variável de ambiente MONETA_CACHE_COTACOES)
+    provedor (ProvedorCotacoes): fonte das cotações (ver cotacoes.provedores); None usa o
+                                 yfinance. Provedores locais, como ProvedorArquivos, são
+                                 lidos diretamente, sem passar pelo cache
     kwargs (dict): dicionário com as chaves 'cotacoes_anteriores' e 'cotacoes_segurar' OU 'data_inicio' e 'data_fim'
 
     Returns:
     variacoes (pd.DataFrame): DataFrame com as variações periódicas das ações
     """
 
+    if provedor is None:
+        provedor = ProvedorYfinance()
+
+    # o cache serve apenas para provedores remotos; os locais já são lidos do disco
+    usar_cache = usar_cache and provedor.remoto
+
+    if offline and provedor.remoto and not usar_cache:
+        raise ValueError("O modo offline exige o cache de cotações.")
+
     # data de hoje (formato datetime)
     hoje_dtm: datetime = datetime.today()
 
@@ -44,13 +70,86 @@ def busca_cotacoes(simbolos: list, intervalo: str,
         if data_inicio is None or data_fim is None:
             raise ValueError("É necessário fornecer os parametros 'cotacoes_anteriores' e 'cotacoes_segurar'.")
 
-    # busca as cotações das ações para o intervalo especificado
-    cotacoes: pd.DataFrame = yf.download(simbolos, start=data_inicio, end=data_fim)['Adj Close']
+    # as cotações são sempre diárias; o intervalo semanal é montado pelo formata_cotacoes
+    if not usar_cache:
+        cotacoes = provedor.buscar(simbolos, data_inicio, data_fim)
+    else:
+        if pasta_cache is None:
+            pasta_cache = PASTA_CACHE_PADRAO / provedor.nome
+        cotacoes = CacheCotacoes(pasta_cache).buscar(simbolos, data_inicio, data_fim,
+                                                     baixar=provedor.buscar, offline=offline)
+
+    # com um único símbolo, o formato é o mesmo do yf.download: uma Series 'Adj Close'
+    if len(simbolos) == 1:
+        return cotacoes.iloc[:, 0].rename('Adj Close')
 
     return cotacoes
 
+def filtra_clusters(variacoes: pd.DataFrame, qtd_clusters: int,
+                    criterio: str = "media", metodo_ligacao: str = "average") -> pd.DataFrame:
+
+    """
+    Função que agrupa as ações por clusterização hierárquica da matriz de correlação dos
+    retornos e mantém apenas uma ação representante por cluster. Ações muito correlacionadas
+    caem no mesmo cluster, então o conjunto final é menor e mais diverso
+
+    Args:
+    variacoes (pd.DataFrame): DataFrame com as variações periódicas das ações
+    qtd_clusters (int): quantidade máxima de clusters (e de ações mantidas)
+    criterio (str): nota usada para escolher o representante de cada cluster: 'media'
+                    (maior média de retorno), 'sharpe' (maior média / desvio padrão) ou
+                    'volatilidade' (menor desvio padrão)
+    metodo_ligacao (str): método de ligação da clusterização ('average', 'complete',
+                          'single' ou 'ward', ver scipy.cluster.hierarchy.linkage)
+
+    Returns:
+    variacoes_representantes (pd.DataFrame): DataFrame com as variações das ações representantes,
+                                             na ordem original das colunas
+    """
+
+    if criterio not in CRITERIOS_CLUSTER:
+        raise ValueError(f"O critério '{criterio}' não existe. Opções: {CRITERIOS_CLUSTER}.")
+
+    if qtd_clusters < 1:
+        raise ValueError("A quantidade de clusters deve ser pelo menos 1.")
+
+    if variacoes.shape[1] <= qtd_clusters:
+        return variacoes
+
+    valores = variacoes.to_numpy(dtype=np.float64)
+    medias = valores.mean(axis=0)
+    desvios = valores.std(axis=0, ddof=1)
+
+    # ações com cotação constante não têm correlação definida e são tratadas como
+    # descorrelacionadas das demais
+    with np.errstate(invalid="ignore", divide="ignore"):
+        correlacoes = np.corrcoef(valores, rowvar=False)
+    correlacoes = np.nan_to_num(correlacoes, nan=0.0)
+    np.fill_diagonal(correlacoes, 1.0)
+
+    # distância de correlação sqrt((1 - ρ) / 2): 0 para ações perfeitamente correlacionadas
+    # e 1 para ações perfeitamente anticorrelacionadas
+    distancias = np.sqrt(np.clip((1 - correlacoes) / 2, 0.0, 1.0))
+    ligacoes = linkage(squareform(distancias, checks=False), method=metodo_ligacao)
+    clusters = fcluster(ligacoes, t=qtd_clusters, criterion="maxclust")
+
+    if criterio == "media":
+        notas = medias
+    elif criterio == "sharpe":
+        with np.errstate(invalid="ignore", divide="ignore"):
+            notas = np.nan_to_num(medias / desvios, nan=-np.inf, posinf=np.inf, neginf=-np.inf)
+    else:
+        notas = -desvios
+
+    # o representante de cada cluster é a ação com a maior nota dentro dele
+    notas = pd.Series(notas, index=variacoes.columns)
+    representantes = notas.groupby(clusters).idxmax()
+
+    return variacoes.loc[:, variacoes.columns.isin(representantes)]
+
 def formata_cotacoes(cotacoes: pd.DataFrame, intervalo: str, 
-                     maiores_medias: int) -> pd.DataFrame:
+                     maiores_medias: int, dtype=np.float64, qtd_clusters: int = 0,
+                     criterio_cluster: str = "media") -> pd.DataFrame:
 
     """
     Função que formata as cotações das ações para variações periódicas e filtra as ações com maiores médias de retorno
@@ -59,6 +158,14 @@ def formata_cotacoes(cotacoes: pd.DataFrame, intervalo: str,
     cotacoes (pd.DataFrame): DataFrame com as cotações das ações
     intervalo (str): Intervalo de busca das variações periódicas das ações. 'd' para diário, 'w' para semanal
     maiores_medias (int): Quantidade de ações com maiores médias de retorno a serem filtradas
+    dtype: tipo numérico das variações retornadas (np.float64 ou np.float32). As variações
+           são sempre calculadas em float64; np.float32 reduz pela metade a memória das
+           variações e, por consequência, da população e da covariância no moneta_ag
+    qtd_clusters (int): se maior que 0, antes do filtro de maiores médias as ações são agrupadas
+                        pela correlação dos retornos e apenas um representante de cada um dos
+                        'qtd_clusters' clusters é mantido (ver filtra_clusters). 0 desliga o filtro
+    criterio_cluster (str): critério de escolha do representante de cada cluster
+                            ('media', 'sharpe' ou 'volatilidade')
 
     Returns:
     variacoes_intervaladas_filtradas (pd.DataFrame): DataFrame com as variações periódicas das ações filtradas
@@ -74,7 +181,13 @@ def formata_cotacoes(cotacoes: pd.DataFrame, intervalo: str,
     # calcula as variações diárias das ações e elimina as linhas com valores nulos.
     # valores nulos podem ocorrer quando a ação não possui cotação em um determinado dia
     variacoes_intervaladas: pd.DataFrame = \
-        cotacoes_intervaladas.pct_change().dropna()    
+        cotacoes_intervaladas.pct_change().dropna().astype(dtype)
+
+    if qtd_clusters > 0:
+        # mantém apenas uma ação representante por grupo de ações correlacionadas
+        variacoes_intervaladas = filtra_clusters(variacoes_intervaladas,
+                                                 qtd_clusters=qtd_clusters,
+                                                 criterio=criterio_cluster)
 
     if maiores_medias > 0:
         # filtra as maiores médias de retorno pelo intervalo escolhido
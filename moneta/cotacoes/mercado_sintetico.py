@@ -0,0 +1,224 @@
+import zlib
+import numpy as np
+import pandas as pd
+from cotacoes.provedores import ProvedorCotacoes
+
+# pregões por ano, usados para converter as taxas anuais em diárias
+PREGOES_ANO = 252
+
+# símbolo padrão do índice sintético; todo símbolo que começa com '^' (como os índices
+# do Yahoo Finance) é gerado como um índice
+SIMBOLO_INDEX_SINTETICO = "^SINT"
+
+# volatilidades anuais dos fatores: o primeiro é o mercado e os demais são setoriais
+VOLATILIDADE_MERCADO = 0.18
+VOLATILIDADE_FATORES = 0.08
+
+
+def simbolos_sinteticos(qtd_acoes: int) -> list:
+    """
+    Função que gera os símbolos das ações sintéticas ('SINT00000', 'SINT00001', ...)
+
+    Args:
+    - qtd_acoes: quantidade de ações
+
+    Returns:
+    - list: lista com os símbolos
+    """
+
+    return [f"SINT{i:05d}" for i in range(qtd_acoes)]
+
+
+def sortear_choques(gerador: np.random.Generator, tamanho, graus_liberdade: float = None
+                    ) -> np.ndarray:
+    """
+    Função que sorteia choques de variância 1: t de Student com 'graus_liberdade' graus
+    de liberdade (caudas pesadas) ou normais, quando 'graus_liberdade' é None
+
+    Args:
+    - gerador: gerador de números aleatórios (np.random.Generator)
+    - tamanho: formato do array sorteado
+    - graus_liberdade: graus de liberdade da t de Student (maior que 2)
+
+    Returns:
+    - np.ndarray: choques sorteados
+    """
+
+    if graus_liberdade is None:
+        return gerador.standard_normal(tamanho)
+
+    # a variância da t é gl / (gl - 2); o fator leva a variância para 1
+    return gerador.standard_t(graus_liberdade, tamanho) * \
+        np.sqrt((graus_liberdade - 2) / graus_liberdade)
+
+
+class ProvedorSintetico(ProvedorCotacoes):
+    """
+    Provedor de cotações de um mercado sintético, para testar o Moneta em escala sem
+    acessar a rede. Os preços seguem um movimento browniano geométrico correlacionado por
+    fatores: o log-retorno diário de cada ação é a soma das exposições a 'qtd_fatores'
+    fatores comuns (o primeiro é o mercado) com um ruído próprio, e os choques seguem uma
+    t de Student (caudas pesadas). Parte das ações estreia depois do início do mercado ou
+    tem lacunas curtas sem cotação (NaN), como nos dados reais. Os símbolos que começam
+    com '^' são índices: seguem o fator de mercado, com pouco ruído e sem lacunas.
+
+    Qualquer símbolo pode ser pedido (inclusive os de simbolos.py). Cada símbolo tem a sua
+    própria sequência aleatória, derivada da semente e do nome, então o preço de um
+    símbolo em uma data não depende dos demais símbolos nem do período pedido, e a mesma
+    semente sempre gera o mesmo mercado. A série inteira de cada símbolo é gerada na
+    primeira busca e fica em memória (cerca de 40 kB por símbolo em 20 anos).
+    """
+
+    nome = "sintetico"
+    remoto = False
+
+    def __init__(self, data_inicio="2010-01-01", qtd_anos: int = 20, qtd_fatores: int = 3,
+                 graus_liberdade: float = 4.0, prob_estreia: float = 0.05,
+                 prob_lacunas: float = 0.05, seed=None):
+        """
+        Args:
+        - data_inicio: primeira data do mercado (aaaa-mm-dd)
+        - qtd_anos: duração do mercado, em anos de PREGOES_ANO dias úteis
+        - qtd_fatores: quantidade de fatores comuns (pelo menos 1, o mercado)
+        - graus_liberdade: graus de liberdade da t de Student dos choques (maior que 2;
+          None usa choques normais)
+        - prob_estreia: probabilidade de uma ação estrear depois da primeira data
+        - prob_lacunas: probabilidade de uma ação ter de 1 a 3 lacunas de até 10 pregões
+        - seed: semente do mercado (int ou np.random.SeedSequence)
+        """
+
+        if qtd_fatores < 1:
+            raise ValueError("O mercado sintético precisa de pelo menos 1 fator (o mercado).")
+        if graus_liberdade is not None and graus_liberdade <= 2:
+            raise ValueError("Os graus de liberdade precisam ser maiores que 2.")
+
+        self.datas = pd.bdate_range(data_inicio, periods=int(qtd_anos * PREGOES_ANO),
+                                    name="Date")
+        self.graus_liberdade = graus_liberdade
+        self.prob_estreia = prob_estreia
+        self.prob_lacunas = prob_lacunas
+        self.semente = seed if isinstance(seed, np.random.SeedSequence) \
+            else np.random.SeedSequence(seed)
+
+        # volatilidades diárias dos fatores
+        self.volatilidades_fatores = np.full(qtd_fatores, VOLATILIDADE_FATORES)
+        self.volatilidades_fatores[0] = VOLATILIDADE_MERCADO
+        self.volatilidades_fatores /= np.sqrt(PREGOES_ANO)
+
+        # os fatores são comuns a todos os símbolos e têm a sua própria sequência
+        gerador = np.random.default_rng(self._sequencia(0))
+        self.fatores = sortear_choques(gerador, (len(self.datas), qtd_fatores),
+                                       graus_liberdade) * self.volatilidades_fatores
+
+        self._precos = {}
+
+    def _sequencia(self, *chave) -> np.random.SeedSequence:
+        """Sequência de sementes filha da semente do mercado com a chave 'chave'."""
+
+        return np.random.SeedSequence(self.semente.entropy,
+                                      spawn_key=self.semente.spawn_key + chave)
+
+    def gerar_precos(self, simbolo: str) -> np.ndarray:
+        """
+        Gera (ou recupera da memória) os preços de um símbolo em todas as datas do mercado.
+
+        Args:
+        - simbolo: símbolo (ticker) da ação ou do índice (começando com '^')
+
+        Returns:
+        - np.ndarray: array (qtd_datas,) com os preços (NaN nas datas sem cotação)
+        """
+
+        if simbolo in self._precos:
+            return self._precos[simbolo]
+
+        gerador = np.random.default_rng(self._sequencia(1, zlib.crc32(simbolo.encode())))
+        qtd_datas, qtd_fatores = self.fatores.shape
+        indice = simbolo.startswith("^")
+
+        # exposições aos fatores, volatilidade própria e retorno esperado (anuais)
+        exposicoes = np.zeros(qtd_fatores)
+        if indice:
+            exposicoes[0] = 1.0
+            volatilidade_propria = 0.02
+            retorno_esperado = 0.06
+        else:
+            exposicoes[0] = gerador.normal(1.0, 0.3)
+            exposicoes[1:] = gerador.normal(0.0, 0.5, size=qtd_fatores - 1)
+            volatilidade_propria = gerador.uniform(0.15, 0.45)
+            retorno_esperado = gerador.normal(0.08, 0.10)
+        volatilidade_propria /= np.sqrt(PREGOES_ANO)
+
+        choques = self.fatores @ exposicoes + volatilidade_propria * \
+            sortear_choques(gerador, qtd_datas, self.graus_liberdade)
+
+        # no GBM, o log-retorno esperado é a deriva menos metade da variância
+        variancia = ((exposicoes * self.volatilidades_fatores) ** 2).sum() + \
+            volatilidade_propria ** 2
+        log_retornos = retorno_esperado / PREGOES_ANO - variancia / 2 + choques
+
+        preco_inicial = 100.0 if indice else gerador.lognormal(np.log(30.0), 0.8)
+        precos = preco_inicial * np.exp(np.cumsum(log_retornos))
+
+        if not indice:
+            if gerador.random() < self.prob_estreia:
+                # a ação só passa a ter cotações a partir da estreia
+                precos[:gerador.integers(1, qtd_datas)] = np.nan
+            if gerador.random() < self.prob_lacunas:
+                for _ in range(gerador.integers(1, 4)):
+                    inicio = gerador.integers(qtd_datas)
+                    precos[inicio:inicio + gerador.integers(1, 11)] = np.nan
+
+        self._precos[simbolo] = precos
+        return precos
+
+    def buscar(self, simbolos: list, data_inicio: str, data_fim: str,
+               intervalo: str = "d") -> pd.DataFrame:
+        """
+        Gera as cotações diárias do mercado sintético (ver ProvedorCotacoes.buscar). O
+        período pedido é recortado das datas do mercado; o intervalo semanal é montado
+        depois pelo formata_cotacoes.
+        """
+
+        linha_inicio, linha_fim = self.datas.searchsorted([pd.Timestamp(data_inicio),
+                                                          pd.Timestamp(data_fim)])
+
+        precos = np.empty((linha_fim - linha_inicio, len(simbolos)))
+        for coluna, simbolo in enumerate(simbolos):
+            precos[:, coluna] = self.gerar_precos(simbolo)[linha_inicio:linha_fim]
+
+        return pd.DataFrame(precos, index=self.datas[linha_inicio:linha_fim],
+                            columns=list(simbolos))
+
+
+def gerar_mercado_sintetico(qtd_acoes: int = 100, qtd_anos: int = 5,
+                            data_inicio="2015-01-01", seed=None,
+                            **kwargs) -> tuple[pd.DataFrame, pd.Series]:
+    """
+    Função que gera um mercado sintético completo (ver ProvedorSintetico) no formato do
+    busca_cotacoes, para os argumentos 'cotacoes' e 'cotacoes_index' do
+    moneta_backtestes. Como no rodar_backtestes, as ações com lacunas no período do
+    backteste precisam sair antes (cotacoes.dropna(axis=1))
+
+    Args:
+    - qtd_acoes: quantidade de ações (símbolos de simbolos_sinteticos)
+    - qtd_anos: duração do mercado, em anos
+    - data_inicio: primeira data do mercado (aaaa-mm-dd)
+    - seed: semente do mercado (int ou np.random.SeedSequence)
+    - kwargs: demais parâmetros do ProvedorSintetico ('qtd_fatores', 'graus_liberdade',
+      'prob_estreia' e 'prob_lacunas')
+
+    Returns:
+    - cotacoes: DataFrame (qtd_datas, qtd_acoes) com as cotações ajustadas das ações
+    - cotacoes_index: Series 'Adj Close' com as cotações do índice SIMBOLO_INDEX_SINTETICO
+    """
+
+    provedor = ProvedorSintetico(data_inicio=data_inicio, qtd_anos=qtd_anos, seed=seed,
+                                 **kwargs)
+    data_inicio, data_fim = provedor.datas[0], provedor.datas[-1] + pd.Timedelta(days=1)
+
+    cotacoes = provedor.buscar(simbolos_sinteticos(qtd_acoes), data_inicio, data_fim)
+    cotacoes_index = provedor.buscar([SIMBOLO_INDEX_SINTETICO], data_inicio,
+                                     data_fim).iloc[:, 0].rename('Adj Close')
+
+    return cotacoes, cotacoes_index
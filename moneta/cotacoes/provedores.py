@@ -0,0 +1,154 @@
+import warnings
+from abc import ABC, abstractmethod
+from pathlib import Path
+import pandas as pd
+
+# formatos de arquivo aceitos pelo ProvedorArquivos
+FORMATOS_ARQUIVOS = ["parquet", "csv"]
+
+
+class ProvedorCotacoes(ABC):
+    """
+    Interface dos provedores de cotações usados pelo busca_cotacoes. Todo provedor
+    implementa 'buscar', que devolve as cotações de fechamento ajustadas de vários
+    símbolos em um período. Provedores remotos ('remoto' True) passam pelo cache local
+    de cotações (ver cotacoes.cache_cotacoes.CacheCotacoes); provedores locais são
+    lidos diretamente. 'nome' separa a pasta do cache de cada provedor.
+    """
+
+    nome = "provedor"
+    remoto = False
+
+    @abstractmethod
+    def buscar(self, simbolos: list, data_inicio: str, data_fim: str,
+               intervalo: str = "d") -> pd.DataFrame:
+        """
+        Busca as cotações ajustadas de [data_inicio, data_fim).
+
+        Args:
+        - simbolos: lista com os símbolos (tickers) das ações
+        - data_inicio: primeira data (aaaa-mm-dd)
+        - data_fim: data final (aaaa-mm-dd), exclusiva
+        - intervalo: intervalo das cotações ('d' = diário, 'w' = semanal)
+
+        Returns:
+        - pd.DataFrame: cotações com índice de datas ('Date') e uma coluna por símbolo
+          (colunas vazias para os símbolos sem cotação). Uma falha da busca deve lançar
+          uma exceção: o cache guarda as colunas vazias como períodos sem cotação
+        """
+
+
+class ProvedorYfinance(ProvedorCotacoes):
+    """
+    Provedor que baixa as cotações do Yahoo Finance pelo yfinance (coluna 'Adj Close').
+    """
+
+    nome = "yfinance"
+    remoto = True
+
+    # intervalos do moneta para os intervalos do yfinance
+    INTERVALOS = {"d": "1d", "w": "1wk"}
+
+    def buscar(self, simbolos: list, data_inicio: str, data_fim: str,
+               intervalo: str = "d") -> pd.DataFrame:
+        """Baixa as cotações ajustadas pelo yf.download (ver ProvedorCotacoes.buscar)."""
+
+        # importado aqui para que os provedores locais funcionem sem o yfinance instalado
+        import yfinance as yf
+
+        cotacoes = yf.download(simbolos, start=data_inicio, end=data_fim,
+                               interval=self.INTERVALOS[intervalo])['Adj Close']
+
+        # com um único símbolo, o yfinance devolve uma Series
+        if isinstance(cotacoes, pd.Series):
+            cotacoes = cotacoes.to_frame(simbolos[0])
+
+        return cotacoes.reindex(columns=list(simbolos))
+
+
+class ProvedorArquivos(ProvedorCotacoes):
+    """
+    Provedor que lê as cotações de uma pasta local com um arquivo por símbolo
+    ('<SIMBOLO>.parquet' ou '<SIMBOLO>.csv'), cada um com uma coluna de datas e uma
+    coluna de preços ajustados. O layout padrão (índice 'Date' e coluna 'Adj Close') é o
+    mesmo do cache de cotações, então uma pasta de cache também serve de fonte. Cada
+    arquivo é lido uma vez e fica em memória, então as buscas seguintes (por exemplo,
+    as janelas de um treinamento) não voltam ao disco.
+    """
+
+    nome = "arquivos"
+    remoto = False
+
+    def __init__(self, pasta, formato: str = None, coluna_preco: str = "Adj Close",
+                 coluna_data: str = "Date"):
+        """
+        Args:
+        - pasta: pasta com os arquivos das cotações
+        - formato: 'parquet' ou 'csv' (None procura o parquet e depois o csv)
+        - coluna_preco: nome da coluna de preços ajustados
+        - coluna_data: nome da coluna (ou do índice) de datas
+        """
+
+        if formato is not None and formato not in FORMATOS_ARQUIVOS:
+            raise ValueError(f"O formato '{formato}' não existe. Opções: {FORMATOS_ARQUIVOS}.")
+
+        self.pasta = Path(pasta)
+        self.formatos = [formato] if formato is not None else FORMATOS_ARQUIVOS
+        self.coluna_preco = coluna_preco
+        self.coluna_data = coluna_data
+        self._cotacoes = {}
+
+    def ler(self, simbolo: str) -> pd.Series:
+        """
+        Lê (ou recupera da memória) todas as cotações de um símbolo.
+
+        Args:
+        - simbolo: símbolo (ticker) da ação
+
+        Returns:
+        - pd.Series: cotações do símbolo, ou None se não há arquivo para ele
+        """
+
+        if simbolo in self._cotacoes:
+            return self._cotacoes[simbolo]
+
+        cotacoes = None
+        for formato in self.formatos:
+            caminho = self.pasta / f"{simbolo.replace('/', '_')}.{formato}"
+            if not caminho.exists():
+                continue
+
+            tabela = pd.read_parquet(caminho) if formato == "parquet" else pd.read_csv(caminho)
+            if self.coluna_data in tabela.columns:
+                tabela = tabela.set_index(self.coluna_data)
+
+            cotacoes = tabela[self.coluna_preco].rename(simbolo)
+            cotacoes.index = pd.DatetimeIndex(pd.to_datetime(cotacoes.index), name="Date")
+            cotacoes = cotacoes.sort_index()
+            break
+
+        self._cotacoes[simbolo] = cotacoes
+        return cotacoes
+
+    def buscar(self, simbolos: list, data_inicio: str, data_fim: str,
+               intervalo: str = "d") -> pd.DataFrame:
+        """
+        Lê as cotações dos arquivos (ver ProvedorCotacoes.buscar). Os arquivos guardam
+        cotações diárias; o intervalo semanal é montado depois pelo formata_cotacoes.
+        """
+
+        inicio, fim = pd.Timestamp(data_inicio), pd.Timestamp(data_fim)
+
+        colunas = {}
+        for simbolo in simbolos:
+            cotacoes = self.ler(simbolo)
+            if cotacoes is None:
+                warnings.warn(f"Não há arquivo de cotações para '{simbolo}' em {self.pasta}.")
+                continue
+            colunas[simbolo] = cotacoes.loc[(cotacoes.index >= inicio) &
+                                            (cotacoes.index < fim)]
+
+        cotacoes = pd.DataFrame(colunas, columns=list(simbolos))
+        cotacoes.index.name = "Date"
+
+        return cotacoes.sort_index()
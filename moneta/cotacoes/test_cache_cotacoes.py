@@ -0,0 +1,144 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from cotacoes.cache_cotacoes import CacheCotacoes, DIAS_SOBREPOSICAO
+
+
+class BaixarFalso:
+    """
+    Download falso: cotações fixas em dias úteis, com a estreia de cada símbolo, um
+    fator de ajuste que pode mudar entre as buscas e o registro de cada chamada.
+    """
+
+    def __init__(self, estreias: dict):
+        datas = pd.bdate_range("2019-01-01", "2021-12-31", name="Date")
+        gerador = np.random.default_rng(0)
+        self.precos = pd.DataFrame(
+            {simbolo: np.where(datas >= pd.Timestamp(estreia),
+                               50 * np.exp(np.cumsum(gerador.normal(0, 0.01, len(datas)))),
+                               np.nan)
+             for simbolo, estreia in estreias.items()}, index=datas)
+        self.ajuste = 1.0
+        self.chamadas = []
+
+    def __call__(self, simbolos, data_inicio, data_fim):
+        self.chamadas.append((tuple(simbolos), data_inicio, data_fim))
+        precos = self.precos.loc[(self.precos.index >= data_inicio) &
+                                 (self.precos.index < data_fim), list(simbolos)]
+        return precos * self.ajuste
+
+
+@pytest.fixture
+def baixar():
+    return BaixarFalso({"AAA": "2019-01-01", "BBB": "2019-01-01", "NOVA": "2020-06-01"})
+
+
+def test_lacunas(tmp_path):
+    """Sem cobertura a lacuna é o pedido inteiro; com cobertura, só o que está fora dela."""
+
+    cache = CacheCotacoes(tmp_path)
+    inicio, fim = pd.Timestamp("2020-01-01"), pd.Timestamp("2020-07-01")
+
+    assert cache.lacunas("AAA", inicio, fim) == [(inicio, fim)]
+
+    cache.cobertura["AAA"] = (pd.Timestamp("2020-03-01"), pd.Timestamp("2020-05-01"))
+    assert cache.lacunas("AAA", inicio, fim) == [(inicio, pd.Timestamp("2020-03-01")),
+                                                  (pd.Timestamp("2020-05-01"), fim)]
+    assert cache.lacunas("AAA", pd.Timestamp("2020-03-10"), pd.Timestamp("2020-04-10")) == []
+    # um pedido depois da cobertura vai até ela, para a cobertura continuar contígua
+    assert cache.lacunas("AAA", pd.Timestamp("2020-06-01"), fim) == \
+        [(pd.Timestamp("2020-05-01"), fim)]
+
+
+def test_busca_incremental_junta_lacunas(tmp_path, baixar):
+    """A segunda busca baixa apenas a lacuna nova, e o resultado é o da fonte."""
+
+    cache = CacheCotacoes(tmp_path)
+    cache.buscar(["AAA", "BBB"], "2020-03-01", "2020-05-01", baixar=baixar)
+    assert len(baixar.chamadas) == 1
+
+    # o mesmo período sai do disco, mesmo em uma nova instância do cache
+    CacheCotacoes(tmp_path).buscar(["AAA", "BBB"], "2020-03-01", "2020-05-01", baixar=baixar)
+    assert len(baixar.chamadas) == 1
+
+    cotacoes = CacheCotacoes(tmp_path).buscar(["AAA", "BBB"], "2020-01-01", "2020-05-01",
+                                              baixar=baixar)
+
+    # os dois símbolos têm a mesma lacuna e são baixados juntos, com a sobreposição
+    sobreposicao = pd.Timedelta(days=DIAS_SOBREPOSICAO)
+    assert baixar.chamadas[1] == (("AAA", "BBB"),
+                                  (pd.Timestamp("2020-01-01") - sobreposicao).strftime("%Y-%m-%d"),
+                                  (pd.Timestamp("2020-03-01") + sobreposicao).strftime("%Y-%m-%d"))
+    esperado = baixar.precos.loc["2020-01-01":"2020-04-30", ["AAA", "BBB"]]
+    pd.testing.assert_frame_equal(cotacoes, esperado, check_freq=False)
+
+
+def test_reescala_historico_quando_ajuste_muda(tmp_path, baixar):
+    """Um novo ajuste (dividendo) na sobreposição reescala todo o histórico guardado."""
+
+    cache = CacheCotacoes(tmp_path)
+    cache.buscar(["AAA"], "2020-01-01", "2020-03-01", baixar=baixar)
+
+    baixar.ajuste = 0.5
+    cotacoes = cache.buscar(["AAA"], "2020-01-01", "2020-06-01", baixar=baixar)
+
+    esperado = baixar.precos.loc["2020-01-01":"2020-05-31", ["AAA"]] * 0.5
+    pd.testing.assert_frame_equal(cotacoes, esperado, check_freq=False)
+
+
+def test_periodo_sem_cotacoes_fica_coberto(tmp_path, baixar):
+    """O período antes da estreia é coberto mesmo vazio e não é baixado de novo."""
+
+    cache = CacheCotacoes(tmp_path)
+    cotacoes = cache.buscar(["NOVA"], "2020-01-01", "2020-03-01", baixar=baixar)
+    assert cotacoes["NOVA"].isna().all()
+
+    cache.buscar(["NOVA"], "2020-01-01", "2020-03-01", baixar=baixar)
+    CacheCotacoes(tmp_path).buscar(["NOVA"], "2020-01-01", "2020-03-01", baixar=baixar)
+    assert len(baixar.chamadas) == 1
+
+    # depois da estreia, apenas a lacuna nova é baixada e as cotações aparecem
+    cotacoes = cache.buscar(["NOVA"], "2020-01-01", "2020-08-01", baixar=baixar)
+    assert len(baixar.chamadas) == 2
+    pd.testing.assert_series_equal(cotacoes["NOVA"].dropna(),
+                                   baixar.precos.loc["2020-06-01":"2020-07-31", "NOVA"],
+                                   check_freq=False)
+
+
+def test_offline_usa_apenas_o_cache(tmp_path, baixar):
+    """No modo offline nada é baixado, e um período fora do cache gera um aviso."""
+
+    cache = CacheCotacoes(tmp_path)
+    cache.buscar(["AAA"], "2020-03-01", "2020-05-01", baixar=baixar)
+
+    cotacoes = CacheCotacoes(tmp_path).buscar(["AAA"], "2020-03-01", "2020-05-01",
+                                              offline=True)
+    pd.testing.assert_frame_equal(cotacoes, baixar.precos.loc["2020-03-01":"2020-04-30",
+                                                              ["AAA"]], check_freq=False)
+
+    with pytest.warns(UserWarning, match="não cobre"):
+        cotacoes = CacheCotacoes(tmp_path).buscar(["AAA", "BBB"], "2020-01-01",
+                                                  "2020-05-01", offline=True)
+    assert cotacoes.index.min() == pd.Timestamp("2020-03-02")
+    assert cotacoes["BBB"].isna().all()
+    assert len(baixar.chamadas) == 1
+
+
+def test_indice_gravado_uma_vez_por_busca(tmp_path, baixar, monkeypatch):
+    """Buscar vários símbolos grava o índice uma única vez, sem arquivos temporários."""
+
+    cache = CacheCotacoes(tmp_path)
+    gravacoes = []
+    salvar_cobertura = cache.salvar_cobertura
+    monkeypatch.setattr(cache, "salvar_cobertura",
+                        lambda: gravacoes.append(1) or salvar_cobertura())
+
+    cache.buscar(["AAA", "BBB", "NOVA"], "2020-03-01", "2020-05-01", baixar=baixar)
+    cache.buscar(["AAA", "BBB", "NOVA"], "2020-03-01", "2020-05-01", baixar=baixar)
+
+    assert len(gravacoes) == 1
+    assert not list(tmp_path.glob("*.tmp"))
+    assert CacheCotacoes(tmp_path).cobertura == cache.cobertura
@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+import pytest
+from cotacoes.cotacoes import filtra_clusters
+
+
+def test_colunas_perfeitamente_correlacionadas_no_mesmo_cluster():
+    """Cada grupo de ações perfeitamente correlacionadas fica com um só representante."""
+
+    gerador = np.random.default_rng(0)
+    bases = gerador.normal(0.0, 0.01, size=(200, 3))
+    variacoes = pd.DataFrame({
+        "A1": bases[:, 0], "A2": 2 * bases[:, 0] + 0.001, "A3": 0.8 * bases[:, 0] - 0.0005,
+        "B1": bases[:, 1] + 0.002, "B2": 0.5 * bases[:, 1],
+        "C1": bases[:, 2]})
+
+    for criterio, esperados in [("media", ["A2", "B1", "C1"]),
+                                ("volatilidade", ["A3", "B2", "C1"])]:
+        filtradas = filtra_clusters(variacoes, qtd_clusters=3, criterio=criterio)
+        assert list(filtradas.columns) == sorted(esperados)
+        pd.testing.assert_frame_equal(filtradas, variacoes[sorted(esperados)])
+
+
+@pytest.mark.parametrize("qtd_clusters", [1, 3, 5, 9])
+def test_qtd_clusters_limita_colunas(gerar_variacoes, qtd_clusters):
+    """Nunca sobram mais colunas que clusters, e sem excesso de colunas nada muda."""
+
+    variacoes = gerar_variacoes(qtd_acoes=9)
+
+    filtradas = filtra_clusters(variacoes, qtd_clusters=qtd_clusters, criterio="sharpe")
+
+    assert 1 <= filtradas.shape[1] <= qtd_clusters
+    assert set(filtradas.columns) <= set(variacoes.columns)
+    if qtd_clusters >= variacoes.shape[1]:
+        pd.testing.assert_frame_equal(filtradas, variacoes)
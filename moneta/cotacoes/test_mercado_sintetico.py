@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+from cotacoes.mercado_sintetico import (ProvedorSintetico, gerar_mercado_sintetico,
+                                        simbolos_sinteticos)
+
+
+def test_mesma_semente_mesmos_precos():
+    """A mesma semente gera o mesmo mercado; outra semente, outro mercado."""
+
+    simbolos = simbolos_sinteticos(20) + ["^SINT"]
+
+    cotacoes = ProvedorSintetico(qtd_anos=2, seed=3).buscar(simbolos, "2010-01-01",
+                                                             "2011-06-01")
+    repetidas = ProvedorSintetico(qtd_anos=2, seed=3).buscar(simbolos, "2010-01-01",
+                                                              "2011-06-01")
+    outras = ProvedorSintetico(qtd_anos=2, seed=4).buscar(simbolos, "2010-01-01",
+                                                           "2011-06-01")
+
+    pd.testing.assert_frame_equal(cotacoes, repetidas)
+    assert not np.allclose(cotacoes.fillna(0).to_numpy(), outras.fillna(0).to_numpy())
+
+
+def test_precos_independem_dos_demais_simbolos_e_do_periodo():
+    """O preço de um símbolo em uma data não muda com os outros símbolos nem com o período."""
+
+    cotacoes = ProvedorSintetico(qtd_anos=3, seed=7).buscar(
+        ["PETR4.SA", "VALE3.SA", "^BVSP"], "2010-01-01", "2012-12-31")
+
+    # outra instância, com outra ordem de geração, outros símbolos e outro período
+    provedor = ProvedorSintetico(qtd_anos=3, seed=7)
+    provedor.buscar(simbolos_sinteticos(5), "2011-01-01", "2011-02-01")
+    recorte = provedor.buscar(["^BVSP", "ITUB4.SA", "PETR4.SA"], "2011-03-01", "2011-09-01")
+
+    pd.testing.assert_frame_equal(recorte[["PETR4.SA", "^BVSP"]],
+                                  cotacoes.loc["2011-03-01":"2011-08-31",
+                                               ["PETR4.SA", "^BVSP"]])
+
+
+def test_sem_estreias_nem_lacunas_nao_ha_nan():
+    """Com prob_estreia=0 e prob_lacunas=0, nenhuma cotação fica vazia."""
+
+    cotacoes, cotacoes_index = gerar_mercado_sintetico(qtd_acoes=200, qtd_anos=2, seed=1,
+                                                       prob_estreia=0, prob_lacunas=0)
+
+    assert not cotacoes.isna().any().any()
+    assert not cotacoes_index.isna().any()
+    assert np.all(cotacoes.to_numpy() > 0)
+
+    # com as probabilidades padrão, parte das ações estreia depois ou tem lacunas
+    cotacoes, _ = gerar_mercado_sintetico(qtd_acoes=200, qtd_anos=2, seed=1)
+    assert cotacoes.isna().any().any()
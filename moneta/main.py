@@ -1,7 +1,10 @@
+import os
 import streamlit as st
 from paginas.moneta import pagina_moneta
 from paginas.backtestes import pagina_backtestes
 from simbolos import simbolos
+from cotacoes.provedores import ProvedorArquivos
+from cotacoes.mercado_sintetico import ProvedorSintetico
 
 # cria um dicionário com as páginas disponíveis com os nomes das páginas como chave 
 # e as funções como valor
@@ -13,6 +16,17 @@ paginas = {
 paises = {"Brasil": "BR", "EUA": "US"}
 intervalos = {"Diário": "d", "Semanal": "w"}
 
+# com a variável de ambiente MONETA_PASTA_COTACOES, as cotações são lidas de uma pasta
+# local (um arquivo CSV ou Parquet por símbolo) em vez de baixadas do yfinance
+pasta_cotacoes = os.environ.get("MONETA_PASTA_COTACOES")
+provedor = ProvedorArquivos(pasta_cotacoes) if pasta_cotacoes else None
+
+# com a variável de ambiente MONETA_MERCADO_SINTETICO (a semente), as cotações vêm de um
+# mercado sintético, sem acessar a rede
+semente_sintetica = os.environ.get("MONETA_MERCADO_SINTETICO")
+if semente_sintetica:
+    provedor = ProvedorSintetico(seed=int(semente_sintetica))
+
 def main():
 
     # Título da página
@@ -23,7 +37,7 @@ def main():
                                               options=paginas.keys())
 
     # Chama/invoca a página desejada
-    paginas[modelo_selecionado](simbolos, paises, intervalos)
+    paginas[modelo_selecionado](simbolos, paises, intervalos, provedor=provedor)
      
 
 if __name__ == "__main__":
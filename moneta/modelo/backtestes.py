@@ -1,14 +1,19 @@
 from utilidades.gerais import (gerar_data, jungir_retornos, 
-                               gerar_carteira_aleatoria)
+                               gerar_carteira_aleatoria, gerar_geradores_filhos)
 
-from modelo.moneta import moneta_ag
+from modelo.moneta import moneta_otimizar, moneta_ag_lote, PARAMETROS_AG_LOTE
 from math import log2
 from cotacoes.cotacoes import busca_cotacoes, formata_cotacoes
 import pandas as pd
+import numpy as np
 
 def moneta_backtestes(data_inicial_bt, data_final_bt, 
                       intervalo, cotacoes_anteriores, cotacoes_segurar, maiores_medias,
-                      qtd_bebados, cotacoes, cotacoes_index) -> dict:
+                      qtd_bebados, cotacoes, cotacoes_index, seed=None,
+                      parametros_ag: dict = None, dtype=np.float64,
+                      metodo: str = "ag", qtd_clusters: int = 0,
+                      criterio_cluster: str = "media", partida_quente: bool = False,
+                      em_lote: bool = False) -> dict:
     
     """
     Função que executa o backteste do Moneta para uma configuração de parâmetros
@@ -23,10 +28,45 @@ def moneta_backtestes(data_inicial_bt, data_final_bt,
     qtd_bebados (int): quantidade de carteiras aleatórias para comparar com o Moneta
     cotacoes (pd.DataFrame): DataFrame com as cotações das ações
     cotacoes_index (pd.DataFrame): DataFrame com as cotações do índice
+    seed (int | np.random.SeedSequence | np.random.Generator): semente do backteste.
+        Cada rodada do Moneta recebe geradores filhos independentes, então o
+        backteste inteiro é reprodutível
+    parametros_ag (dict): parâmetros extras repassados ao moneta_ag em cada rodada
+        (por exemplo, as regras de parada antecipada 'epocas_estagnacao',
+        'tolerancia_melhoria' e 'tempo_maximo', ou o 'modelo_covariancia')
+    dtype: precisão das variações usadas pelo Moneta em cada rodada (np.float64 ou
+        np.float32); os retornos das carteiras no período de teste ficam em float64
+    metodo (str): método de otimização de cada rodada ('ag', 'gradiente', 'hibrido',
+        'cmaes' ou 'recozimento', ver moneta_otimizar). O 'gradiente' é determinístico
+        e leva milissegundos por janela, o que acelera backtestes com centenas de rodadas
+    qtd_clusters (int): se maior que 0, cada rodada mantém apenas uma ação representante
+        por cluster de ações correlacionadas antes do filtro de maiores médias
+        (ver formata_cotacoes)
+    criterio_cluster (str): critério de escolha do representante de cada cluster
+        ('media', 'sharpe' ou 'volatilidade')
+    partida_quente (bool): se True, a população final de cada rodada do Moneta entra na
+        população inicial da rodada seguinte (alinhada pelo nome das ações), então
+        janelas consecutivas partem de um estado quase convergido e precisam de
+        menos épocas (métodos 'ag' e 'hibrido'; na CMA-ES e no recozimento, a melhor
+        carteira da rodada anterior é o ponto de partida da busca)
+    em_lote (bool): se True, as variações de todas as janelas são montadas primeiro e as
+        carteiras de todas as rodadas saem de uma única chamada ao moneta_ag_lote, que
+        evolui as populações de todas as janelas juntas (apenas no método 'ag', sem
+        partida a quente; 'parametros_ag' é repassado ao moneta_ag_lote e só pode ter
+        os parâmetros de modelo.moneta.PARAMETROS_AG_LOTE)
 
     Returns:
     dict: dicionário com os resultados do backteste
     """
+
+    if em_lote and (metodo != "ag" or partida_quente):
+        raise ValueError("O backteste em lote exige o método 'ag', sem partida a quente.")
+
+    parametros_nao_suportados = [parametro for parametro in (parametros_ag or {})
+                                 if parametro not in PARAMETROS_AG_LOTE]
+    if em_lote and parametros_nao_suportados:
+        raise ValueError("O backteste em lote não suporta os parâmetros do AG "
+                         f"{parametros_nao_suportados}. Opções: {PARAMETROS_AG_LOTE}.")
     
     resultados_moneta = []
     resultados_index = []
@@ -36,7 +76,19 @@ def moneta_backtestes(data_inicial_bt, data_final_bt,
     data_rodar_moneta = data_inicial_bt
 
     todas_acoes = cotacoes.columns
-    
+
+    # população final da rodada anterior, usada na partida a quente
+    populacao_anterior = None
+
+    # sequência de sementes do backteste; cada rodada do Moneta deriva dela os seus
+    # geradores (um para o AG e um para os bebados)
+    sequencia_sementes = seed if isinstance(seed, np.random.Generator) \
+        else np.random.SeedSequence(seed)
+
+    # primeiro monta as datas e as variações de todas as rodadas; as carteiras só
+    # são otimizadas depois, rodada a rodada ou todas juntas no modo em lote
+    rodadas = []
+
     while data_rodar_moneta < data_final_bt:
 
         # data_inicial_moneta é a data inicial dos dados que serão usados para rodar o Moneta
@@ -58,13 +110,49 @@ def moneta_backtestes(data_inicial_bt, data_final_bt,
         # formata as cotações para o intervalo e quantidade de maiores médias móveis
         variacoes_rodar_moneta = formata_cotacoes(cotacoes=cotacoes_rodar_moneta, 
                                                   intervalo=intervalo, 
-                                                  maiores_medias=maiores_medias)
+                                                  maiores_medias=maiores_medias,
+                                                  dtype=dtype,
+                                                  qtd_clusters=qtd_clusters,
+                                                  criterio_cluster=criterio_cluster)
+
+        rodadas.append((data_rodar_moneta, data_final_testar_carteira,
+                        variacoes_rodar_moneta))
+
+        # atualiza a data para rodar o Moneta
+        data_rodar_moneta = gerar_data(data_final_testar_carteira, 1, 
+                                        intervalo, "posterior")
+
+    if em_lote:
+        # um único AG para todas as janelas, com um gerador próprio derivado da semente
+        gerador_lote, = gerar_geradores_filhos(sequencia_sementes, 1)
+        carteiras_lote = moneta_ag_lote([variacoes for _, _, variacoes in rodadas],
+                                        seed=gerador_lote, **(parametros_ag or {}))
+
+    for rodada, (data_rodar_moneta, data_final_testar_carteira,
+                 variacoes_rodar_moneta) in enumerate(rodadas):
         
         # resgata as ações presentes no DataFrame de variações
         acoes = variacoes_rodar_moneta.columns
 
+        # geradores independentes para o AG e para os bebados desta rodada
+        gerador_moneta, gerador_bebados = gerar_geradores_filhos(sequencia_sementes, 2)
+
         # roda o Moneta para otimizar a carteira
-        carteira = moneta_ag(variacoes=variacoes_rodar_moneta)
+        parametros_rodada = dict(parametros_ag or {})
+        if partida_quente:
+            parametros_rodada["retornar_populacao"] = True
+            if populacao_anterior is not None:
+                parametros_rodada["cromossomos_semente"] = populacao_anterior
+
+        if em_lote:
+            carteira = carteiras_lote[rodada]
+        else:
+            carteira = moneta_otimizar(variacoes=variacoes_rodar_moneta, metodo=metodo,
+                                       seed=gerador_moneta, **parametros_rodada)
+
+        if partida_quente:
+            carteira, detalhes_rodada = carteira
+            populacao_anterior = detalhes_rodada["populacao"]
 
         # resgata o retorno esperado da carteira e retira a função exponencial com o logaritmo
         retorno_esperado = log2(carteira.loc["Retornos"])
@@ -133,7 +221,8 @@ def moneta_backtestes(data_inicial_bt, data_final_bt,
 
             # gera uma carteira aleatória com todas as ações disponíveis no DataFrame de cotações
             # de entrada
-            carteira_aleatoria = gerar_carteira_aleatoria(acoes=todas_acoes, seed=None)
+            carteira_aleatoria = gerar_carteira_aleatoria(acoes=todas_acoes,
+                                                          seed=gerador_bebados)
             acoes_aleatorias = carteira_aleatoria.index
 
             # resgata as cotações que serão usadas para testar as carteiras aleatórias
@@ -163,11 +252,11 @@ def moneta_backtestes(data_inicial_bt, data_final_bt,
         # para cada rodada do Moneta
         resultados_bebados.append(bebados)
 
-        # atualiza a data para rodar o Moneta
-        data_rodar_moneta = gerar_data(data_final_testar_carteira, 1, 
-                                        intervalo, "posterior")
-        
-        print(f"Rodando Backteste do Moneta: {data_rodar_moneta}")
+        # o progresso mostra a data da próxima rodada do Moneta
+        proxima_data_rodar_moneta = gerar_data(data_final_testar_carteira, 1,
+                                               intervalo, "posterior")
+
+        print(f"Rodando Backteste do Moneta: {proxima_data_rodar_moneta}")
     
     # após todas as iterações (carteiras) do Moneta, calcula os retornos acumulados
     # no período inteiro de backteste do moneta
@@ -216,7 +305,11 @@ def rodar_backtestes(acoes_selecionadas,
                     data_inicial_bt, data_final_bt, 
                     intervalo, cotacoes_anteriores, 
                     cotacoes_segurar, maiores_medias, qtd_bebados,
-                    simbolo_index) -> dict:
+                    simbolo_index, seed=None, parametros_ag: dict = None,
+                    dtype=np.float64, metodo: str = "ag", qtd_clusters: int = 0,
+                    criterio_cluster: str = "media", partida_quente: bool = False,
+                    em_lote: bool = False, offline: bool = False,
+                    provedor=None) -> dict:
     
     """
     Função que executa as preparações necessárias para rodar os backtestes do Moneta
@@ -231,6 +324,18 @@ def rodar_backtestes(acoes_selecionadas,
     maiores_medias (int): quantidade de maiores médias móveis para considerar na carteira para cada rodada do moneta
     qtd_bebados (int): quantidade de carteiras aleatórias para comparar com o Moneta
     simbolo_index (str): símbolo do índice a ser usado para comparar com o Moneta
+    seed (int | np.random.SeedSequence | np.random.Generator): semente do backteste
+    parametros_ag (dict): parâmetros extras repassados ao moneta_ag em cada rodada
+    dtype: precisão das variações usadas pelo Moneta (np.float64 ou np.float32)
+    metodo (str): método de otimização de cada rodada ('ag', 'gradiente', 'hibrido',
+        'cmaes' ou 'recozimento')
+    qtd_clusters (int): quantidade de clusters de ações correlacionadas (0 = sem filtro)
+    criterio_cluster (str): critério de escolha do representante de cada cluster
+    partida_quente (bool): se True, cada rodada do Moneta parte da população final da anterior
+    em_lote (bool): se True, as carteiras de todas as rodadas saem de um único moneta_ag_lote
+    offline (bool): se True, as cotações vêm apenas do cache local, sem acessar a rede
+    provedor (ProvedorCotacoes): fonte das cotações (None usa o yfinance, ver
+        cotacoes.provedores)
     """
     
     # encontra a menor data para buscar as cotações que serão usadas em todos os backtestes
@@ -245,7 +350,9 @@ def rodar_backtestes(acoes_selecionadas,
     cotacoes = busca_cotacoes(simbolos=acoes_selecionadas,
                             intervalo=intervalo,
                             data_inicio=data_minima.strftime("%Y-%m-%d"),
-                            data_fim=data_maxima.strftime("%Y-%m-%d"))
+                            data_fim=data_maxima.strftime("%Y-%m-%d"),
+                            offline=offline,
+                            provedor=provedor)
     
     # qualquer ação que não tenha dados retornados será removida do DataFrame de cotações
     cotacoes.dropna(axis=1, inplace=True)
@@ -254,7 +361,9 @@ def rodar_backtestes(acoes_selecionadas,
     cotacoes_index = busca_cotacoes(simbolos=[simbolo_index],
                                     intervalo=intervalo,
                                     data_inicio=data_minima.strftime("%Y-%m-%d"),
-                                    data_fim=data_maxima.strftime("%Y-%m-%d"))
+                                    data_fim=data_maxima.strftime("%Y-%m-%d"),
+                                    offline=offline,
+                                    provedor=provedor)
     
     # qualquer dado dentro das cotações do índice que não tenha sido retornado será removido
     cotacoes_index.dropna(axis=0, inplace=True)
@@ -270,6 +379,12 @@ def rodar_backtestes(acoes_selecionadas,
     # chama a função que executa os backtestes do Moneta
     resultados_backtestes = moneta_backtestes(data_inicial_bt, data_final_bt, 
                                               intervalo, cotacoes_anteriores, cotacoes_segurar, 
-                                              maiores_medias, qtd_bebados, cotacoes, cotacoes_index)
+                                              maiores_medias, qtd_bebados, cotacoes, cotacoes_index,
+                                              seed=seed, parametros_ag=parametros_ag,
+                                              dtype=dtype, metodo=metodo,
+                                              qtd_clusters=qtd_clusters,
+                                              criterio_cluster=criterio_cluster,
+                                              partida_quente=partida_quente,
+                                              em_lote=em_lote)
 
     return resultados_backtestes
\ No newline at end of file
@@ -1,11 +1,84 @@
+import warnings
 import pandas as pd
 import numpy as np
-from ag.ag import (gerar_cromossomos_base, roda_do_acaso, crossover,
-                   mutacao_um, mutacao_dois, gerar_nova_geracao)
+from ag.ag_numpy import (executar_ag_janelas, cromossomo_para_series,
+                         populacao_para_dataframe)
+from ag.motores import MotorNumpy
+from ag.convergencia import CriterioParada, HistoricoAG
+from ag.perfilador import Perfilador, PERFILADOR_NULO
+from ces.ces import ces_retornos, ces_riscos, ces_fitnesses
+from ces.covariancia import (MODELOS_COVARIANCIA, estimar_covariancia_amostral,
+                             estimar_covariancia_fatorial)
+from otimizacao.gradiente import otimizar_gradiente, otimizar_fronteira
+from otimizacao.cmaes import otimizar_cmaes
+from otimizacao.recozimento import otimizar_recozimento
+
+DTYPES = [np.float64, np.float32]
+METODOS = ["gradiente", "ag", "hibrido", "cmaes", "recozimento"]
+
+# otimizadores alternativos ao AG: recebem (medias, matriz_covariancia, seed=..., **parametros)
+# e retornam (pesos, qtd_avaliacoes)
+OTIMIZADORES = {"cmaes": otimizar_cmaes, "recozimento": otimizar_recozimento}
+METRICAS = ["Retornos", "Riscos", "Fitnesses"]
+
+# parâmetros do AG aceitos pelo moneta_ag_lote (os demais só existem no moneta_ag)
+PARAMETROS_AG_LOTE = ["qtd_iteracoes", "qtd_epocas", "qtd_croms_populacao_geral", "selecao",
+                      "tamanho_torneio", "dtype", "epocas_estagnacao", "tolerancia_melhoria",
+                      "tempo_maximo", "modelo_covariancia", "qtd_fatores", "perfilador"]
+
+
+def alinhar_carteiras(carteiras, acoes: list) -> np.ndarray:
+
+    """
+    Função que alinha carteiras conhecidas (por exemplo, a população final de uma
+    execução anterior do moneta_ag) às ações de uma nova execução
+
+    Args:
+    carteiras (pd.DataFrame | pd.Series | np.ndarray): DataFrame com uma carteira por
+              linha e as ações nas colunas, Series com uma única carteira (ações no
+              índice) ou array (qtd_carteiras, qtd_acoes) já na ordem de 'acoes'.
+              As colunas 'Retornos', 'Riscos' e 'Fitnesses' são ignoradas; se houver
+              'Fitnesses', as carteiras são ordenadas da melhor para a pior
+    acoes (list): ações da nova execução, na ordem das colunas das variações
+
+    Returns:
+    np.ndarray: array (qtd_carteiras, qtd_acoes) com as carteiras alinhadas: ações
+                ausentes nas carteiras recebem peso 0, ações que não estão em 'acoes'
+                são descartadas, pesos negativos viram 0 e cada carteira é normalizada
+                para somar 1. Carteiras que ficam sem nenhum peso são descartadas
+    """
+
+    if isinstance(carteiras, pd.Series):
+        carteiras = carteiras.to_frame().T
+
+    if isinstance(carteiras, pd.DataFrame):
+        if "Fitnesses" in carteiras.columns:
+            carteiras = carteiras.sort_values("Fitnesses", ascending=False, kind="stable")
+
+        pesos = carteiras.drop(columns=METRICAS, errors="ignore") \
+                         .reindex(columns=acoes, fill_value=0.0) \
+                         .to_numpy(dtype=np.float64)
+    else:
+        pesos = np.atleast_2d(np.asarray(carteiras, dtype=np.float64))
+
+        if pesos.shape[1] != len(acoes):
+            raise ValueError("As carteiras em array devem ter um peso para cada ação.")
+
+    pesos = np.maximum(np.nan_to_num(pesos, nan=0.0), 0.0)
+    somas = pesos.sum(axis=1)
+
+    return pesos[somas > 0] / somas[somas > 0, np.newaxis]
+
+def moneta_ag(variacoes: pd.DataFrame,
+              qtd_iteracoes = 10, qtd_epocas = 40, qtd_croms_populacao_geral = 40,
+              motor: MotorNumpy = None, selecao: str = "roleta",
+              tamanho_torneio: int = 3, seed=None,
+              retornar_detalhes: bool = False, epocas_estagnacao: int = None,
+              tolerancia_melhoria: float = 0.0, tempo_maximo: float = None,
+              modelo_covariancia: str = "amostral", qtd_fatores: int = 5, dtype=None,
+              perfilador: Perfilador = None, cromossomos_semente=None,
+              retornar_populacao: bool = False):
 
-def moneta_ag(variacoes: pd.DataFrame, 
-              qtd_iteracoes = 10, qtd_epocas = 40, qtd_croms_populacao_geral = 40):
-    
     """
     Função que executa o algoritmo genético para otimização de carteiras do moneta
 
@@ -14,90 +87,463 @@ def moneta_ag(variacoes: pd.DataFrame,
     qtd_iteracoes (int): quantidade de iterações para cada época
     qtd_epocas (int): quantidade de épocas
     qtd_croms_populacao_geral (int): quantidade de cromossomos na população inicial
+    motor (ag.motores.MotorNumpy): motor do algoritmo genético, com as suas opções
+                   (ver ag.motores). None usa MotorNumpy() (modo 'estacionario').
+                   MotorNumpy mantém a população em arrays contíguos, nos modos
+                   'estacionario' ou 'geracional', com risco incremental, cache de
+                   fitnesses ou operadores adaptativos; MotorPandas é a implementação
+                   original com DataFrames; MotorNumba compila o laço do modo
+                   estacionário; MotorIlhas evolui subpopulações em processos com
+                   migração; MotorReinicios evolui populações independentes em um
+                   tensor; MotorEsparso limita a quantidade de ações de cada
+                   cromossomo. Para uma mesma semente, MotorNumpy() e MotorPandas()
+                   produzem a mesma carteira. Cada motor aceita apenas as opções que
+                   suporta, e as opções abaixo que um motor não suporta geram um
+                   ValueError
+    selecao (str): método de seleção dos pais: 'roleta' (proporcional ao fitness),
+                   'torneio' ou 'sus' (amostragem universal estocástica)
+    tamanho_torneio (int): quantidade de cromossomos em cada torneio
+    seed (int | np.random.SeedSequence | np.random.Generator): semente da execução.
+                   Com a mesma semente o resultado é sempre o mesmo, sem depender
+                   (nem alterar) o estado global do np.random
+    retornar_detalhes (bool): se True, retorna também um dicionário com detalhes da
+                              execução ('reinicios': DataFrame com o melhor cromossomo
+                              e as estatísticas de fitness de cada reinício;
+                              'historico': ag.convergencia.HistoricoAG com o melhor
+                              fitness, o fitness médio e a diversidade de cada época;
+                              'cache': contadores de acertos e falhas do cache;
+                              'operadores': estatísticas dos operadores adaptativos;
+                              'perfil': DataFrame do perfilador, se informado)
+    epocas_estagnacao (int): para o AG após esta quantidade de épocas seguidas sem
+                             melhoria do melhor fitness (None executa todas as épocas;
+                             não suportado por MotorPandas e MotorIlhas)
+    tolerancia_melhoria (float): melhoria relativa mínima do melhor fitness para que
+                                 uma época não conte como estagnação
+    tempo_maximo (float): tempo máximo de execução do AG, em segundos
+    modelo_covariancia (str): 'amostral' usa a covariância amostral densa (n×n);
+                              'fatorial' usa um modelo de 'qtd_fatores' fatores (PCA)
+                              mais variâncias idiossincráticas, com risco em O(nk)
+                              (indicado para universos de centenas de ações; não
+                              suportado por MotorPandas e MotorNumba)
+    qtd_fatores (int): quantidade de fatores do modelo 'fatorial', limitada a
+                       min(qtd_acoes, qtd_periodos - 1) das variações
+    dtype: precisão do motor numpy (np.float64 ou np.float32). None usa o tipo das
+           variações (float32 quando o formata_cotacoes recebeu dtype=np.float32).
+           Em float32, as variações, a covariância, a população e os produtos Σw
+           ocupam metade da memória; os retornos, riscos e fitnesses (um valor por
+           cromossomo) continuam acumulados em float64. MotorPandas e MotorNumba
+           sempre calculam em float64
+    perfilador (ag.perfilador.Perfilador): se informado, acumula o tempo e a quantidade
+                  de chamadas de cada etapa do AG ('selecao', 'crossover', 'mutacao_um',
+                  'mutacao_dois', 'avaliacao', 'substituicao', ...), consultáveis com
+                  perfilador.para_dataframe(). Os motores em lote medem 'descendentes'
+                  (crossover e mutações juntos); ilhas e numba medem apenas 'evolucao'.
+                  Sem perfilador, cada etapa custa uma chamada de método vazia
+    cromossomos_semente (pd.DataFrame | pd.Series | np.ndarray): carteiras que entram na
+                  população inicial no lugar dos piores cromossomos, como a
+                  'populacao' final de uma execução anterior (partida a quente) ou a
+                  carteira do gradiente (moneta_otimizar no modo 'hibrido'). DataFrames
+                  e Series são alinhados às ações pelo nome (ver alinhar_carteiras);
+                  arrays devem estar na ordem das colunas de 'variacoes'. Carteiras
+                  repetidas são descartadas e no máximo metade da população é semeada
+                  (as primeiras carteiras, que são as melhores quando há a coluna
+                  'Fitnesses'); a outra metade continua aleatória. Apenas no MotorNumpy
+    retornar_populacao (bool): se True, inclui nos detalhes a 'populacao' final (DataFrame
+                  com uma carteira por linha, da melhor para a pior), que pode ser
+                  passada como 'cromossomos_semente' na execução seguinte; os detalhes
+                  passam a ser retornados mesmo com 'retornar_detalhes' False
 
     Returns:
     pd.Series: cromossomo com a melhor carteira otimizada
+    dict: detalhes da execução (apenas se 'retornar_detalhes' ou 'retornar_populacao'
+          for True)
     """
 
-    # resgata as ações presentes no DataFrame de variações 
+    if motor is None:
+        motor = MotorNumpy()
+
+    nome_motor = type(motor).__name__
+    usar_parada = epocas_estagnacao is not None or tempo_maximo is not None
+
+    # cada opção comum é conferida uma única vez contra o que o motor suporta; as
+    # opções próprias de cada motor já foram validadas no seu construtor
+    if selecao not in motor.selecoes:
+        raise ValueError(f"O {nome_motor} não suporta a seleção '{selecao}'. "
+                         f"Opções: {motor.selecoes}.")
+
+    if modelo_covariancia not in MODELOS_COVARIANCIA:
+        raise ValueError(f"O modelo de covariância '{modelo_covariancia}' não existe. "
+                         f"Opções: {MODELOS_COVARIANCIA}.")
+
+    if modelo_covariancia == "fatorial" and not motor.suporta_fatorial:
+        raise ValueError(f"O {nome_motor} não suporta o modelo de covariância 'fatorial'.")
+
+    if usar_parada and not motor.suporta_parada:
+        raise ValueError(f"O {nome_motor} não suporta a parada antecipada.")
+
+    if cromossomos_semente is not None and not motor.suporta_sementes:
+        raise ValueError(f"O {nome_motor} não suporta cromossomos semente.")
+
+    # o tipo das variações é usado quando a precisão não é informada
+    dtype = np.dtype(dtype) if dtype is not None else np.result_type(*variacoes.dtypes)
+
+    if dtype not in DTYPES:
+        raise ValueError(f"O dtype '{dtype}' não é suportado. Opções: float64 ou float32.")
+
+    if motor.dtype_fixo is not None:
+        dtype = np.dtype(motor.dtype_fixo)
+
+    if perfilador is None:
+        perfilador = PERFILADOR_NULO
+
+    # resgata as ações presentes no DataFrame de variações
     acoes = list(variacoes.columns)
 
-    # calcula a média e a matriz de covariância das variações
-    medias = variacoes.mean(axis=0)
-    matriz_covariancia = variacoes.cov()
-
-    # gera os cromossomos iniciais da população
-    cromossomos = gerar_cromossomos_base(qtd_croms_populacao_geral, acoes, medias, 
-                                         matriz_covariancia)
-
-    for _ in range(qtd_epocas):
-
-        # sorteia 6 cromossomos para a roda do acaso
-        indices_cromossomos_sorteados = \
-            np.random.choice(cromossomos.index, size=6, replace=False)
-
-        # resgata os cromossomos sorteados da população
-        cromossomos_sorteados = cromossomos.loc[indices_cromossomos_sorteados]
-
-        for _ in range(qtd_iteracoes):
-
-            # RODA DO ACASO -------------------------------------
-            # retorna os cromossomos pai e mãe sorteados
-            cromossomo_pai, cromossomo_mae = roda_do_acaso(cromossomos_sorteados)
-            
-            # RODA DO ACASO -------------------------------------
-
-            # CROSSOVER -----------------------------------------
-            # retorna os cromossomos filhos
-            cromossomo_filho_um = crossover(acoes, cromossomo_pai, cromossomo_mae)
-            cromossomo_filho_dois = crossover(acoes, cromossomo_pai, cromossomo_mae)
-
-            # CROSSOVER -----------------------------------------
-
-            # MUTAÇÃO DO TIPO 1 ---------------------------------
-            # retorna os cromossomos mutantes do tipo um
-            mutante_um = mutacao_um(acoes, cromossomo_filho_um)
-            mutante_dois = mutacao_um(acoes, cromossomo_filho_dois)
-            # MUTAÇÃO DO TIPO 1 ---------------------------------
-
-            # MUTAÇÃO DO TIPO 2 ---------------------------------
-            # retorna os cromossomos mutantes do tipo dois
-            mutante_tres, mutante_quatro = mutacao_dois(acoes, cromossomo_filho_um)
-            mutante_cinco, mutante_seis = mutacao_dois(acoes, cromossomo_filho_dois)
-            # MUTAÇÃO DO TIPO 2 --------------------------------
-
-            # GERAÇÃO DA NOVA GERAÇÃO --------------------------
-            # retorna a nova geração de cromossomos filhos/mutantes
-            df_nova_geracao = gerar_nova_geracao(acoes, medias, matriz_covariancia, 
-                                                 cromossomo_filho_um, cromossomo_filho_dois, 
-                                                 mutante_um, mutante_dois, mutante_tres, 
-                                                 mutante_quatro, mutante_cinco, mutante_seis)
-            # GERAÇÃO DA NOVA GERAÇÃO --------------------------
-
-            # recupera o indice do cromossomo com o pior fitness entre os 'pais'
-            nome_cromossomo_ruim = cromossomos_sorteados["Fitnesses"].idxmin()
-
-            # recupera o indice do cromossomo com o melhor fitness entre os 'filhos/mutantes'
-            nome_cromossomo_bom = df_nova_geracao["Fitnesses"].idxmax()
-            
-            # recupera o fitness do pior pai e do melhor filho
-            fitness_pior_pai = cromossomos_sorteados.loc[nome_cromossomo_ruim].loc["Fitnesses"]
-            fitness_melhor_filho = df_nova_geracao.loc[nome_cromossomo_bom].loc["Fitnesses"]
-
-            # se o fitness do melhor filho for maior que o fitness do pior pai
-            # então o cromossomo do pior pai é substituído pelo cromossomo do melhor filho
-            if fitness_melhor_filho > fitness_pior_pai:
-                cromossomos_sorteados.loc[nome_cromossomo_ruim] = \
-                    df_nova_geracao.loc[nome_cromossomo_bom].values
-        
-        # atualiza a população com os cromossomos sorteados iterados/melhorados
-        cromossomos.loc[indices_cromossomos_sorteados] = \
-            cromossomos_sorteados.values
-
-    # recupera o indice do cromossomo com o melhor fitness
-    indice_melhor_cromossomo = cromossomos["Fitnesses"].idxmax()
+    if cromossomos_semente is not None:
+        # as carteiras semente são alinhadas pelo nome das ações e as repetidas são
+        # descartadas. Uma população convergida tem poucas carteiras distintas, então
+        # no máximo metade da população é semeada e a outra metade continua aleatória
+        # para manter a diversidade
+        cromossomos_semente = alinhar_carteiras(cromossomos_semente, acoes)
+        _, primeiras = np.unique(np.round(cromossomos_semente, 10), axis=0, return_index=True)
+        cromossomos_semente = cromossomos_semente[np.sort(primeiras)]
+        cromossomos_semente = cromossomos_semente[:max(qtd_croms_populacao_geral // 2, 1)]
+
+        if cromossomos_semente.shape[0] == 0:
+            warnings.warn("Nenhuma carteira semente tem peso nas ações das variações; "
+                          "a população inicial será aleatória.")
+            cromossomos_semente = None
+
+    # calcula a média das variações; o motor trabalha apenas com arrays, e os
+    # rótulos das ações só voltam na saída
+    medias = variacoes.mean(axis=0).to_numpy(dtype=dtype)
+
+    with perfilador.etapa("covariancia"):
+        if modelo_covariancia == "fatorial":
+            # a matriz n×n não é montada; o risco sai das cargas dos fatores em O(nk). Com
+            # poucas ações ou poucos períodos (uma janela curta de backteste), usa o
+            # máximo de fatores que as variações comportam
+            qtd_fatores = min(qtd_fatores, variacoes.shape[1], variacoes.shape[0] - 1)
+            matriz_covariancia = estimar_covariancia_fatorial(variacoes, qtd_fatores, dtype)
+        else:
+            matriz_covariancia = estimar_covariancia_amostral(variacoes, dtype)
+
+    parada = CriterioParada(epocas_estagnacao, tolerancia_melhoria, tempo_maximo) \
+        if usar_parada else None
+
+    # o histórico só é montado quando os detalhes são pedidos
+    historico = HistoricoAG(qtd_epocas) if retornar_detalhes and motor.suporta_parada \
+        else None
+
+    cromossomos, retornos, riscos, fitnesses, detalhes = \
+        motor.executar(medias, matriz_covariancia,
+                       qtd_iteracoes, qtd_epocas, qtd_croms_populacao_geral,
+                       selecao=selecao, tamanho_torneio=tamanho_torneio, seed=seed,
+                       parada=parada, historico=historico, perfilador=perfilador,
+                       cromossomos_semente=cromossomos_semente)
+
+    if perfilador is not PERFILADOR_NULO:
+        detalhes["perfil"] = perfilador.para_dataframe()
+
+    if historico is not None:
+        historico.motivo_parada = parada.motivo if parada is not None else None
+        detalhes["historico"] = historico
+
+    if retornar_populacao:
+        detalhes["populacao"] = populacao_para_dataframe(acoes, cromossomos,
+                                                         retornos, riscos, fitnesses)
+
+    # recupera a posição do cromossomo com o melhor fitness
+    indice_melhor_cromossomo = int(np.argmax(fitnesses))
 
     # recupera o cromossomo com o melhor fitness após todas as épocas/iterações
-    melhor_cromossomo = cromossomos.loc[indice_melhor_cromossomo]
+    melhor_cromossomo = cromossomo_para_series(acoes,
+                                               cromossomos[indice_melhor_cromossomo],
+                                               retornos[indice_melhor_cromossomo],
+                                               riscos[indice_melhor_cromossomo],
+                                               fitnesses[indice_melhor_cromossomo],
+                                               nome=indice_melhor_cromossomo)
+
+    return (melhor_cromossomo, detalhes) \
+        if retornar_detalhes or retornar_populacao else melhor_cromossomo
+
+
+def moneta_ag_lote(lista_de_variacoes: list, qtd_iteracoes = 10, qtd_epocas = 40,
+                   qtd_croms_populacao_geral = 40, selecao: str = "roleta",
+                   tamanho_torneio: int = 3, seed=None, dtype=None,
+                   epocas_estagnacao: int = None, tolerancia_melhoria: float = 0.0,
+                   tempo_maximo: float = None, modelo_covariancia: str = "amostral",
+                   qtd_fatores: int = 5, perfilador: Perfilador = None) -> list:
+
+    """
+    Função que executa o algoritmo genético do moneta para várias janelas de uma vez,
+    como as rodadas de um backteste. Em vez de chamar o moneta_ag uma vez por janela
+    (um laço Python por janela), as médias e as matrizes de covariância de todas as
+    janelas são empilhadas e as populações evoluem juntas no modo geracional (ver
+    ag.ag_numpy.executar_ag_janelas). Janelas com ações diferentes são completadas
+    com ações de preenchimento, que nunca recebem peso.
+
+    Args:
+    lista_de_variacoes (list): lista de DataFrames com as variações periódicas das ações
+                               de cada janela (cada uma com pelo menos 2 ações)
+    qtd_iteracoes (int): quantidade de pares de pais (iterações) em cada época
+    qtd_epocas (int): quantidade de épocas
+    qtd_croms_populacao_geral (int): quantidade de cromossomos na população de cada janela
+    selecao (str): método de seleção dos pais: 'roleta', 'torneio' ou 'sus'
+    tamanho_torneio (int): quantidade de cromossomos em cada torneio
+    seed (int | np.random.SeedSequence | np.random.Generator): semente da execução
+    dtype: precisão do motor (np.float64 ou np.float32). None usa o tipo das variações
+    epocas_estagnacao (int): cada janela para após esta quantidade de épocas seguidas
+                             sem melhoria do seu melhor fitness (None executa todas
+                             as épocas)
+    tolerancia_melhoria (float): melhoria relativa mínima do melhor fitness para que
+                                 uma época não conte como estagnação
+    tempo_maximo (float): tempo máximo de execução do AG, em segundos
+    modelo_covariancia (str): 'amostral' ou 'fatorial' (ver moneta_ag). O motor em
+                              lote exige matrizes densas, então o modelo fatorial de
+                              cada janela é montado como matriz n×n
+    qtd_fatores (int): quantidade de fatores do modelo 'fatorial', limitada a
+                       min(qtd_acoes, qtd_periodos - 1) de cada janela
+    perfilador (ag.perfilador.Perfilador): se informado, acumula o tempo de cada etapa
+
+    Returns:
+    list: um pd.Series por janela, na ordem de 'lista_de_variacoes', com a melhor
+          carteira (ações da janela + 'Retornos', 'Riscos' e 'Fitnesses')
+    """
+
+    if len(lista_de_variacoes) == 0:
+        return []
+
+    if any(variacoes.shape[1] < 2 for variacoes in lista_de_variacoes):
+        raise ValueError("Cada janela deve ter pelo menos 2 ações.")
+
+    dtype = np.dtype(dtype) if dtype is not None else \
+        np.result_type(*[tipo for variacoes in lista_de_variacoes for tipo in variacoes.dtypes])
+
+    if dtype not in DTYPES:
+        raise ValueError(f"O dtype '{dtype}' não é suportado. Opções: float64 ou float32.")
+
+    if modelo_covariancia not in MODELOS_COVARIANCIA:
+        raise ValueError(f"O modelo de covariância '{modelo_covariancia}' não existe. "
+                         f"Opções: {MODELOS_COVARIANCIA}.")
+
+    if perfilador is None:
+        perfilador = PERFILADOR_NULO
+
+    qtd_janelas = len(lista_de_variacoes)
+    qtd_genes_janelas = np.array([variacoes.shape[1] for variacoes in lista_de_variacoes])
+    qtd_genes = int(qtd_genes_janelas.max())
+
+    # as estatísticas de cada janela ocupam os primeiros genes; o resto fica zerado
+    medias = np.zeros((qtd_janelas, qtd_genes), dtype=dtype)
+    matrizes_covariancia = np.zeros((qtd_janelas, qtd_genes, qtd_genes), dtype=dtype)
+
+    with perfilador.etapa("covariancia"):
+        for janela, variacoes in enumerate(lista_de_variacoes):
+            qtd_acoes = variacoes.shape[1]
+            medias[janela, :qtd_acoes] = variacoes.mean(axis=0).to_numpy(dtype=dtype)
+            if modelo_covariancia == "fatorial":
+                qtd_fatores_janela = min(qtd_fatores, qtd_acoes, variacoes.shape[0] - 1)
+                matrizes_covariancia[janela, :qtd_acoes, :qtd_acoes] = \
+                    estimar_covariancia_fatorial(variacoes, qtd_fatores_janela, dtype).densa()
+            else:
+                matrizes_covariancia[janela, :qtd_acoes, :qtd_acoes] = \
+                    estimar_covariancia_amostral(variacoes, dtype)
+
+    # um critério por janela: cada uma para quando o seu melhor fitness estagna
+    paradas = [CriterioParada(epocas_estagnacao, tolerancia_melhoria, tempo_maximo)
+               for _ in range(qtd_janelas)] \
+        if epocas_estagnacao is not None or tempo_maximo is not None else None
+
+    cromossomos, retornos, riscos, fitnesses = \
+        executar_ag_janelas(medias, matrizes_covariancia, qtd_genes_janelas,
+                            qtd_iteracoes, qtd_epocas, qtd_croms_populacao_geral,
+                            selecao=selecao, tamanho_torneio=tamanho_torneio, seed=seed,
+                            paradas=paradas, perfilador=perfilador)
+
+    # o melhor cromossomo de cada janela volta com os rótulos das ações da janela
+    melhores = np.argmax(fitnesses, axis=1)
+    carteiras = []
+    for janela, variacoes in enumerate(lista_de_variacoes):
+        melhor = melhores[janela]
+        carteiras.append(cromossomo_para_series(variacoes.columns,
+                                                cromossomos[janela, melhor,
+                                                            :variacoes.shape[1]],
+                                                retornos[janela, melhor],
+                                                riscos[janela, melhor],
+                                                fitnesses[janela, melhor],
+                                                nome=int(melhor)))
+
+    return carteiras
+
+
+def moneta_otimizar(variacoes: pd.DataFrame, metodo: str = "gradiente", seed=None,
+                    qtd_iteracoes_gradiente: int = 1000, tolerancia_gradiente: float = 1e-10,
+                    modelo_covariancia: str = "amostral", qtd_fatores: int = 5,
+                    **parametros_ag):
+
+    """
+    Função que otimiza a carteira do Moneta pelo método escolhido
+
+    Args:
+    variacoes (pd.DataFrame): DataFrame com as variações periódicas das ações
+    metodo (str): 'gradiente' maximiza o fitness por gradiente projetado no simplex
+                  (determinístico, em milissegundos); 'ag' roda o moneta_ag;
+                  'hibrido' roda o moneta_ag com a carteira do gradiente semeada
+                  na população inicial; 'cmaes' (otimizacao.cmaes.otimizar_cmaes) e
+                  'recozimento' (otimizacao.recozimento.otimizar_recozimento) são
+                  buscas alternativas ao AG, limitadas por 'qtd_avaliacoes_max'
+    seed (int | np.random.SeedSequence | np.random.Generator): semente do AG, da
+                  CMA-ES ou do recozimento
+    qtd_iteracoes_gradiente (int): quantidade máxima de iterações do gradiente
+    tolerancia_gradiente (float): o gradiente para quando nenhum peso muda mais que este valor
+    modelo_covariancia (str): 'amostral' ou 'fatorial' (ver moneta_ag)
+    qtd_fatores (int): quantidade de fatores do modelo 'fatorial'
+    **parametros_ag: parâmetros repassados ao moneta_ag nos métodos 'ag' e 'hibrido'
+                     (no método 'gradiente', apenas 'retornar_detalhes' e
+                     'retornar_populacao' são usados). No 'hibrido', a carteira do
+                     gradiente entra antes dos 'cromossomos_semente' informados. Nos
+                     métodos 'cmaes' e 'recozimento', a primeira carteira de
+                     'cromossomos_semente' (a melhor, numa 'populacao') vira os
+                     'pesos_iniciais' da busca, e os demais parâmetros além de
+                     'retornar_detalhes' e 'retornar_populacao' vão para o otimizador
+                     (por exemplo, 'qtd_avaliacoes_max')
+
+    Returns:
+    pd.Series: cromossomo com a melhor carteira otimizada, no mesmo formato do moneta_ag
+    dict: detalhes da execução (apenas se 'retornar_detalhes' ou 'retornar_populacao' for
+          True); inclui 'iteracoes_gradiente' nos métodos 'gradiente' e 'hibrido',
+          'avaliacoes' (carteiras avaliadas) nos métodos 'gradiente', 'cmaes' e
+          'recozimento' e 'avaliacoes_gradiente' no 'hibrido'. Nos métodos sem
+          população, a 'populacao' tem apenas a carteira otimizada
+    """
+
+    if metodo not in METODOS:
+        raise ValueError(f"O método '{metodo}' não existe. Opções: {METODOS}.")
+
+    if metodo == "ag":
+        return moneta_ag(variacoes, seed=seed, modelo_covariancia=modelo_covariancia,
+                         qtd_fatores=qtd_fatores, **parametros_ag)
+
+    # o gradiente e os otimizadores alternativos trabalham em float64, com o mesmo
+    # modelo de covariância do AG
+    medias = variacoes.mean(axis=0).to_numpy(dtype=np.float64)
+
+    if modelo_covariancia == "fatorial":
+        # limitada ao máximo de fatores que as variações comportam (ver moneta_ag)
+        qtd_fatores = min(qtd_fatores, variacoes.shape[1], variacoes.shape[0] - 1)
+        matriz_covariancia = estimar_covariancia_fatorial(variacoes, qtd_fatores)
+    else:
+        matriz_covariancia = estimar_covariancia_amostral(variacoes)
+
+    retornar_populacao = parametros_ag.get("retornar_populacao", False)
+    retornar_detalhes = parametros_ag.get("retornar_detalhes", False) or retornar_populacao
+
+    if metodo in OTIMIZADORES:
+        parametros_otimizador = {chave: valor for chave, valor in parametros_ag.items()
+                                 if chave not in ("retornar_detalhes", "retornar_populacao",
+                                                  "cromossomos_semente")}
+
+        sementes = parametros_ag.get("cromossomos_semente")
+        if sementes is not None:
+            sementes = alinhar_carteiras(sementes, list(variacoes.columns))
+            if sementes.shape[0] > 0:
+                parametros_otimizador["pesos_iniciais"] = sementes[0]
+
+        pesos, qtd_avaliacoes = OTIMIZADORES[metodo](medias, matriz_covariancia, seed=seed,
+                                                     **parametros_otimizador)
+        detalhes = {"avaliacoes": qtd_avaliacoes}
+    else:
+        pesos, qtd_iteracoes, qtd_avaliacoes = otimizar_gradiente(medias, matriz_covariancia,
+                                                                  qtd_iteracoes_gradiente,
+                                                                  tolerancia_gradiente)
+        detalhes = {"iteracoes_gradiente": qtd_iteracoes, "avaliacoes": qtd_avaliacoes}
+
+    if metodo == "hibrido":
+        # a carteira do gradiente vem antes das sementes informadas (partida a quente)
+        sementes = parametros_ag.pop("cromossomos_semente", None)
+        cromossomos_semente = pesos[np.newaxis] if sementes is None else \
+            np.vstack([pesos, alinhar_carteiras(sementes, list(variacoes.columns))])
+
+        resultado = moneta_ag(variacoes, seed=seed, modelo_covariancia=modelo_covariancia,
+                              qtd_fatores=qtd_fatores,
+                              cromossomos_semente=cromossomos_semente, **parametros_ag)
+        if retornar_detalhes:
+            resultado[1]["iteracoes_gradiente"] = qtd_iteracoes
+            resultado[1]["avaliacoes_gradiente"] = qtd_avaliacoes
+        return resultado
+
+    carteira = pesos[np.newaxis]
+    retorno = ces_retornos(carteiras=carteira, medias=medias)
+    risco = ces_riscos(carteiras=carteira, matriz_covariancia=matriz_covariancia)
+    fitness = ces_fitnesses(retornos=retorno, riscos=risco)
+
+    melhor_cromossomo = cromossomo_para_series(list(variacoes.columns), pesos, retorno[0],
+                                               risco[0], fitness[0], nome=0)
+
+    if retornar_populacao:
+        detalhes["populacao"] = melhor_cromossomo.to_frame().T
+
+    return (melhor_cromossomo, detalhes) if retornar_detalhes else melhor_cromossomo
+
+
+def moneta_fronteira(variacoes: pd.DataFrame, aversoes_risco=None, qtd_pontos: int = 20,
+                     qtd_iteracoes: int = 5000, tolerancia: float = 1e-10,
+                     modelo_covariancia: str = "amostral", qtd_fatores: int = 5) -> pd.DataFrame:
+
+    """
+    Função que calcula a fronteira eficiente das ações em uma única chamada: as médias
+    e a covariância são estimadas uma vez e as carteiras de todas as aversões ao
+    risco λ (máximo de w·μ - λ w'Σw) são otimizadas juntas, em lote
+
+    Args:
+    variacoes (pd.DataFrame): DataFrame com as variações periódicas das ações
+    aversoes_risco (array-like): aversões ao risco (positivas) dos pontos da fronteira;
+                                 None usa 'qtd_pontos' valores em escala geométrica,
+                                 proporcionais à razão média|μ| / média(variâncias),
+                                 da carteira de maior retorno até a de menor risco
+    qtd_pontos (int): quantidade de pontos da fronteira quando 'aversoes_risco' é None
+    qtd_iteracoes (int): quantidade máxima de iterações do gradiente
+    tolerancia (float): o gradiente para quando nenhum peso muda mais que este valor
+    modelo_covariancia (str): 'amostral' ou 'fatorial' (ver moneta_ag)
+    qtd_fatores (int): quantidade de fatores do modelo 'fatorial'
+
+    Returns:
+    pd.DataFrame: uma linha por ponto da fronteira (índice 'aversao_risco', da maior
+                  para a menor aversão), com os pesos das ações e as colunas
+                  'Retornos', 'Riscos' e 'Fitnesses'
+    """
+
+    if modelo_covariancia not in MODELOS_COVARIANCIA:
+        raise ValueError(f"O modelo de covariância '{modelo_covariancia}' não existe. "
+                         f"Opções: {MODELOS_COVARIANCIA}.")
+
+    medias = variacoes.mean(axis=0).to_numpy(dtype=np.float64)
+
+    if modelo_covariancia == "fatorial":
+        # limitada ao máximo de fatores que as variações comportam (ver moneta_ag)
+        qtd_fatores = min(qtd_fatores, variacoes.shape[1], variacoes.shape[0] - 1)
+        matriz_covariancia = estimar_covariancia_fatorial(variacoes, qtd_fatores)
+    else:
+        matriz_covariancia = estimar_covariancia_amostral(variacoes)
+
+    if aversoes_risco is None:
+        variancias = variacoes.var(axis=0).to_numpy(dtype=np.float64)
+        escala = np.abs(medias).mean() / variancias.mean()
+        aversoes_risco = np.geomspace(1e4, 1e0, qtd_pontos) * escala
+
+    aversoes_risco = np.asarray(aversoes_risco, dtype=np.float64)
+    pesos, _ = otimizar_fronteira(medias, matriz_covariancia, aversoes_risco,
+                                  qtd_iteracoes, tolerancia)
+
+    retornos = ces_retornos(carteiras=pesos, medias=medias)
+    riscos = ces_riscos(carteiras=pesos, matriz_covariancia=matriz_covariancia)
+    fitnesses = ces_fitnesses(retornos=retornos, riscos=riscos)
+
+    fronteira = pd.DataFrame(pesos, columns=variacoes.columns,
+                             index=pd.Index(aversoes_risco, name="aversao_risco"))
+    fronteira["Retornos"] = retornos
+    fronteira["Riscos"] = riscos
+    fronteira["Fitnesses"] = fitnesses
 
-    return melhor_cromossomo
\ No newline at end of file
+    return fronteira
\ No newline at end of file
@@ -0,0 +1,26 @@
+from datetime import timedelta
+import numpy as np
+import pandas as pd
+from modelo.backtestes import moneta_backtestes
+
+
+def test_progresso_mostra_a_proxima_rodada(gerar_variacoes, capsys):
+    """Cada rodada imprime a data em que a rodada seguinte do Moneta começa."""
+
+    datas = pd.bdate_range("2020-01-01", periods=300)
+    variacoes = gerar_variacoes(qtd_acoes=6, qtd_periodos=len(datas))
+    cotacoes = pd.DataFrame(50 * np.exp(np.cumsum(variacoes.to_numpy(), axis=0)),
+                            index=datas, columns=variacoes.columns)
+    cotacoes_index = cotacoes.mean(axis=1).rename("Adj Close")
+
+    data_inicial_bt = datas[150].to_pydatetime()
+    data_final_bt = datas[-1].to_pydatetime()
+
+    resultados = moneta_backtestes(data_inicial_bt, data_final_bt, "d", 100, 30, 0, 2,
+                                   cotacoes, cotacoes_index, seed=0, metodo="gradiente")
+
+    # cada rodada segura a carteira por 30 dias e a seguinte começa no dia depois
+    inicios = [data_inicial_bt + timedelta(days=31) * rodada
+               for rodada in range(1, len(resultados["dados"]) + 1)]
+    assert capsys.readouterr().out.splitlines() == \
+        [f"Rodando Backteste do Moneta: {inicio}" for inicio in inicios]
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+from modelo.moneta import alinhar_carteiras, moneta_ag
+
+
+def test_alinhar_carteiras_entre_universos():
+    """
+    Ações que saíram são descartadas, ações novas recebem peso 0, cada carteira volta a
+    somar 1 e as carteiras ficam da melhor para a pior.
+    """
+
+    populacao = pd.DataFrame(
+        {"A": [0.5, 0.1, 1.0], "B": [0.2, 0.6, 0.0], "C": [0.3, 0.3, 0.0],
+         "Retornos": [1.01, 1.02, 1.03], "Riscos": [1e-4, 2e-4, 3e-4],
+         "Fitnesses": [100.0, 300.0, 200.0]})
+
+    pesos = alinhar_carteiras(populacao, ["C", "NOVA", "B"])
+
+    # a carteira só com 'A' fica sem peso e é descartada
+    np.testing.assert_allclose(pesos, [[0.3 / 0.9, 0.0, 0.6 / 0.9],
+                                       [0.3 / 0.5, 0.0, 0.2 / 0.5]])
+
+    # uma Series é uma carteira só, e pesos negativos ou NaN viram 0
+    carteira = pd.Series({"A": 0.4, "B": -0.1, "C": np.nan, "D": 0.6, "Fitnesses": 9.0})
+    np.testing.assert_allclose(alinhar_carteiras(carteira, ["D", "B", "A"]),
+                               [[0.6, 0.0, 0.4]])
+
+    with pytest.raises(ValueError):
+        alinhar_carteiras(np.ones((2, 3)), ["A", "B"])
+
+
+def test_partida_quente_realinha_populacao(gerar_variacoes):
+    """A população de um universo entra, realinhada, na população inicial de outro."""
+
+    variacoes = gerar_variacoes(qtd_acoes=8)
+    _, detalhes = moneta_ag(variacoes, qtd_iteracoes=5, qtd_epocas=10,
+                            qtd_croms_populacao_geral=10, seed=1, retornar_populacao=True)
+    populacao = detalhes["populacao"]
+
+    # o novo universo perde duas ações, ganha uma e tem outra ordem de colunas
+    novas_variacoes = gerar_variacoes(qtd_acoes=9, seed=5).set_axis(
+        ["ACAO7", "NOVA", "ACAO2", "ACAO3", "ACAO4", "ACAO5", "ACAO6", "ACAO1", "OUTRA"],
+        axis=1)
+    acoes = list(novas_variacoes.columns)
+
+    _, detalhes_novos = moneta_ag(novas_variacoes, qtd_iteracoes=5, qtd_epocas=0,
+                                  qtd_croms_populacao_geral=10, seed=2,
+                                  cromossomos_semente=populacao, retornar_populacao=True)
+    populacao_nova = detalhes_novos["populacao"][acoes].to_numpy()
+
+    pesos_antigos = populacao.reindex(columns=acoes, fill_value=0.0).to_numpy()
+    esperadas = pesos_antigos / pesos_antigos.sum(axis=1, keepdims=True)
+    _, primeiras = np.unique(np.round(esperadas, 10), axis=0, return_index=True)
+    esperadas = esperadas[np.sort(primeiras)][:5]
+
+    # cada semente (no máximo metade da população) aparece realinhada na população
+    for semente in esperadas:
+        assert np.any(np.all(np.abs(populacao_nova - semente) < 1e-9, axis=1))
+
+    np.testing.assert_allclose(populacao_nova.sum(axis=1), 1.0)
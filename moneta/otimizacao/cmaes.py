@@ -0,0 +1,177 @@
+import numpy as np
+from ces.ces import ces_retornos, ces_riscos, ces_fitnesses
+from otimizacao.gradiente import projetar_simplex
+
+
+def softmax_simplex(pontos: np.ndarray) -> np.ndarray:
+    """
+    Função que leva cada linha de 'pontos' (em R^n) a uma carteira do simplex
+    {w >= 0, soma(w) = 1} com a softmax, w = exp(x) / soma(exp(x)). A função é suave,
+    então a busca não encontra as quinas da projeção euclidiana; um peso só se
+    aproxima de zero quando a sua coordenada vai para -infinito.
+
+    Args:
+    - pontos: array (qtd_pontos, qtd_ativos)
+
+    Returns:
+    - carteiras: array (qtd_pontos, qtd_ativos)
+    """
+
+    # o deslocamento pelo máximo de cada linha evita o estouro da exponencial
+    exponenciais = np.exp(pontos - pontos.max(axis=1, keepdims=True))
+    return exponenciais / exponenciais.sum(axis=1, keepdims=True)
+
+
+def otimizar_cmaes(medias: np.ndarray, matriz_covariancia: np.ndarray,
+                   qtd_avaliacoes_max: int = 20000, tamanho_populacao: int = None,
+                   passo_inicial: float = 0.3, separavel: bool = None,
+                   tolerancia: float = 1e-12, pesos_iniciais: np.ndarray = None,
+                   seed=None) -> tuple[np.ndarray, int]:
+    """
+    Função que maximiza o fitness do Moneta com a estratégia evolutiva CMA-ES
+    (Hansen, 2016). A busca acontece em R^n e cada ponto x vira a carteira
+    softmax_simplex(x), então toda amostra é uma carteira válida. A busca parte da
+    carteira de pesos iguais (x = 0), ou de 'pesos_iniciais', e, a cada geração,
+    avalia 'tamanho_populacao'
+    carteiras em um único bloco; a média, o passo e a matriz de covariância da
+    distribuição de busca andam na direção das melhores. A seleção usa apenas a
+    ordem dos fitnesses, então a escala do fitness não importa. A projeção
+    euclidiana (projetar_simplex) zera pesos exatamente, mas as suas quinas fazem a
+    CMA-ES convergir cedo demais para carteiras concentradas.
+
+    Args:
+    - medias: array com as médias dos retornos dos ativos
+    - matriz_covariancia: array com a matriz de covariância (ou modelo fatorial)
+    - qtd_avaliacoes_max: quantidade máxima de carteiras avaliadas
+    - tamanho_populacao: carteiras por geração (None usa 4 + 3 ln(n))
+    - passo_inicial: desvio inicial da busca, nas coordenadas da softmax
+    - separavel: se True, usa uma covariância diagonal (sep-CMA-ES, O(n) por amostra
+      em vez de O(n²) e sem autodecomposição); None liga acima de 100 ativos
+    - tolerancia: a busca para quando o passo em todas as direções fica abaixo deste valor
+    - pesos_iniciais: carteira em torno da qual a busca começa (None começa com pesos
+      iguais). Os pesos nulos recebem um piso pequeno, para que os ativos possam voltar
+    - seed: semente (int, np.random.SeedSequence ou np.random.Generator)
+
+    Returns:
+    - pesos: array (qtd_ativos,) com a melhor carteira encontrada
+    - qtd_avaliacoes: quantidade de carteiras avaliadas
+    """
+
+    gerador = np.random.default_rng(seed)
+    medias = np.asarray(medias, dtype=np.float64)
+    qtd_ativos = medias.shape[0]
+
+    if separavel is None:
+        separavel = qtd_ativos > 100
+
+    lambda_ = tamanho_populacao or 4 + int(3 * np.log(qtd_ativos))
+    mu = lambda_ // 2
+
+    # pesos de recombinação das mu melhores amostras
+    pesos_recombinacao = np.log(mu + 0.5) - np.log(np.arange(1, mu + 1))
+    pesos_recombinacao /= pesos_recombinacao.sum()
+    mu_efetivo = 1 / (pesos_recombinacao ** 2).sum()
+
+    # constantes de adaptação do passo (cs, amortecimento) e da covariância (cc, c1, cmu)
+    cc = (4 + mu_efetivo / qtd_ativos) / (qtd_ativos + 4 + 2 * mu_efetivo / qtd_ativos)
+    cs = (mu_efetivo + 2) / (qtd_ativos + mu_efetivo + 5)
+    c1 = 2 / ((qtd_ativos + 1.3) ** 2 + mu_efetivo)
+    cmu = 2 * (mu_efetivo - 2 + 1 / mu_efetivo) / ((qtd_ativos + 2) ** 2 + mu_efetivo)
+    if separavel:
+        # a covariância diagonal tem n parâmetros e aprende (n + 2) / 3 vezes mais rápido
+        c1 *= (qtd_ativos + 2) / 3
+        cmu *= (qtd_ativos + 2) / 3
+    cmu = min(1 - c1, cmu)
+    amortecimento = 1 + 2 * max(0.0, np.sqrt((mu_efetivo - 1) / (qtd_ativos + 1)) - 1) + cs
+    norma_esperada = np.sqrt(qtd_ativos) * (1 - 1 / (4 * qtd_ativos) +
+                                            1 / (21 * qtd_ativos ** 2))
+
+    if pesos_iniciais is None:
+        media_busca = np.zeros(qtd_ativos)
+    else:
+        # inversa da softmax (a menos de uma constante), com um piso nos pesos nulos
+        pesos_iniciais = projetar_simplex(np.asarray(pesos_iniciais, dtype=np.float64))
+        media_busca = np.log(pesos_iniciais + 1e-3 / qtd_ativos)
+    passo = passo_inicial
+    caminho_passo = np.zeros(qtd_ativos)
+    caminho_covariancia = np.zeros(qtd_ativos)
+
+    # covariância da busca: C = B diag(D²) B' (no modo separável, B é a identidade
+    # e só o vetor C = D² é guardado)
+    escalas = np.ones(qtd_ativos)
+    if separavel:
+        covariancia_busca = np.ones(qtd_ativos)
+    else:
+        covariancia_busca = np.eye(qtd_ativos)
+        autovetores = np.eye(qtd_ativos)
+        geracao_autodecomposicao = 0
+
+    melhores_pesos = softmax_simplex(media_busca[np.newaxis])[0]
+    melhor_fitness = -np.inf
+    qtd_avaliacoes = 0
+    geracao = 0
+
+    while qtd_avaliacoes + lambda_ <= qtd_avaliacoes_max:
+        geracao += 1
+
+        # amostras y ~ N(0, C) e pontos x = m + passo * y
+        normais = gerador.standard_normal((lambda_, qtd_ativos))
+        desvios = normais * escalas if separavel else (normais * escalas) @ autovetores.T
+        carteiras = softmax_simplex(media_busca + passo * desvios)
+
+        retornos = ces_retornos(carteiras=carteiras, medias=medias)
+        riscos = ces_riscos(carteiras=carteiras, matriz_covariancia=matriz_covariancia)
+        fitnesses = ces_fitnesses(retornos=retornos, riscos=riscos)
+        qtd_avaliacoes += lambda_
+
+        ordem = np.argsort(-fitnesses, kind="stable")[:mu]
+        if fitnesses[ordem[0]] > melhor_fitness:
+            melhor_fitness = fitnesses[ordem[0]]
+            melhores_pesos = carteiras[ordem[0]]
+
+        desvios_selecionados = desvios[ordem]
+        desvio_medio = pesos_recombinacao @ desvios_selecionados
+        media_busca = media_busca + passo * desvio_medio
+
+        # caminho do passo, com o desvio médio "branqueado" por C^(-1/2)
+        if separavel:
+            branqueado = desvio_medio / escalas
+        else:
+            branqueado = autovetores @ ((autovetores.T @ desvio_medio) / escalas)
+        caminho_passo = (1 - cs) * caminho_passo + \
+            np.sqrt(cs * (2 - cs) * mu_efetivo) * branqueado
+
+        norma_caminho = np.linalg.norm(caminho_passo)
+        hsig = norma_caminho / np.sqrt(1 - (1 - cs) ** (2 * geracao)) / norma_esperada < \
+            1.4 + 2 / (qtd_ativos + 1)
+
+        caminho_covariancia = (1 - cc) * caminho_covariancia + \
+            hsig * np.sqrt(cc * (2 - cc) * mu_efetivo) * desvio_medio
+
+        # atualização de posto um (caminho) e de posto mu (amostras selecionadas)
+        correcao_hsig = (1 - hsig) * cc * (2 - cc)
+        if separavel:
+            covariancia_busca = (1 - c1 - cmu) * covariancia_busca + \
+                c1 * (caminho_covariancia ** 2 + correcao_hsig * covariancia_busca) + \
+                cmu * (pesos_recombinacao @ desvios_selecionados ** 2)
+            escalas = np.sqrt(covariancia_busca)
+        else:
+            covariancia_busca = (1 - c1 - cmu) * covariancia_busca + \
+                c1 * (np.outer(caminho_covariancia, caminho_covariancia) +
+                      correcao_hsig * covariancia_busca) + \
+                cmu * (desvios_selecionados.T * pesos_recombinacao) @ desvios_selecionados
+
+        passo *= np.exp((cs / amortecimento) * (norma_caminho / norma_esperada - 1))
+
+        # a autodecomposição O(n³) é refeita apenas a cada algumas gerações
+        if not separavel and \
+                geracao - geracao_autodecomposicao > lambda_ / (c1 + cmu) / qtd_ativos / 10:
+            geracao_autodecomposicao = geracao
+            covariancia_busca = np.triu(covariancia_busca) + np.triu(covariancia_busca, 1).T
+            autovalores, autovetores = np.linalg.eigh(covariancia_busca)
+            escalas = np.sqrt(np.maximum(autovalores, 1e-300))
+
+        if passo * escalas.max() < tolerancia:
+            break
+
+    return melhores_pesos, qtd_avaliacoes
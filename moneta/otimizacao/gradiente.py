@@ -0,0 +1,205 @@
+import numpy as np
+from ces.ces_incremental import ces_produtos_covariancia
+from ces.covariancia import CovarianciaFatorial
+
+# piso do risco (w'Σw) no objetivo: com ativos de variância zero, uma carteira sem
+# risco teria log(0) = -inf e um gradiente NaN
+RISCO_MINIMO = 1e-12
+
+
+def projetar_simplex(pontos: np.ndarray) -> np.ndarray:
+    """
+    Função que projeta (distância euclidiana) cada linha de 'pontos' no simplex
+    {w >= 0, soma(w) = 1}, isto é, no conjunto das carteiras sem venda a descoberto.
+    Usa o algoritmo por ordenação de Duchi et al. (2008), em O(n log n) por linha.
+
+    Args:
+    - pontos: array (qtd_ativos,) ou (qtd_pontos, qtd_ativos)
+
+    Returns:
+    - projecoes: array com o mesmo formato de 'pontos'
+    """
+
+    linhas = np.atleast_2d(pontos)
+    qtd_ativos = linhas.shape[1]
+
+    ordenados = -np.sort(-linhas, axis=1)
+    acumulados = np.cumsum(ordenados, axis=1) - 1
+    posicoes = np.arange(1, qtd_ativos + 1)
+
+    # rho é a última posição (nos valores ordenados) que continua positiva após o deslocamento
+    positivos = ordenados - acumulados / posicoes > 0
+    rho = qtd_ativos - 1 - np.argmax(positivos[:, ::-1], axis=1)
+    deslocamentos = acumulados[np.arange(linhas.shape[0]), rho] / (rho + 1)
+
+    projecoes = np.maximum(linhas - deslocamentos[:, np.newaxis], 0.0)
+
+    return projecoes.reshape(np.shape(pontos))
+
+
+def objetivo_log_fitness(pesos: np.ndarray, medias: np.ndarray,
+                         matriz_covariancia: np.ndarray) -> tuple[float, np.ndarray]:
+    """
+    Função que calcula o logaritmo do fitness do Moneta, log(2 ** (w·μ) / w'Σw) =
+    ln(2) w·μ - ln(w'Σw), e o seu gradiente ln(2) μ - 2 Σw / w'Σw. Maximizar o
+    logaritmo equivale a maximizar o fitness. Abaixo de RISCO_MINIMO o risco conta
+    como o piso, constante, e sai do gradiente.
+
+    Args:
+    - pesos: array (qtd_ativos,) com os pesos da carteira
+    - medias: array com as médias dos retornos dos ativos
+    - matriz_covariancia: array com a matriz de covariância (ou modelo fatorial)
+
+    Returns:
+    - valor: logaritmo do fitness da carteira
+    - gradiente: array (qtd_ativos,) com o gradiente do logaritmo do fitness
+    """
+
+    produto = ces_produtos_covariancia(pesos, matriz_covariancia)
+    risco = abs(float(pesos @ produto))
+
+    if risco < RISCO_MINIMO:
+        return np.log(2) * float(pesos @ medias) - np.log(RISCO_MINIMO), np.log(2) * medias
+
+    valor = np.log(2) * float(pesos @ medias) - np.log(risco)
+    gradiente = np.log(2) * medias - 2 * produto / risco
+
+    return valor, gradiente
+
+
+def otimizar_gradiente(medias: np.ndarray, matriz_covariancia: np.ndarray,
+                       qtd_iteracoes_max: int = 1000, tolerancia: float = 1e-10,
+                       pesos_iniciais: np.ndarray = None) -> tuple[np.ndarray, int, int]:
+    """
+    Função que maximiza o fitness do Moneta por gradiente projetado no simplex: a
+    cada iteração a carteira anda na direção do gradiente do logaritmo do fitness
+    e é projetada de volta nas carteiras válidas. O tamanho do passo é ajustado
+    por busca com retrocesso (o passo dobra quando é aceito e cai pela metade
+    enquanto a melhoria fica abaixo da prevista). É determinística: a partir dos
+    mesmos pesos iniciais chega sempre à mesma carteira.
+
+    Args:
+    - medias: array com as médias dos retornos dos ativos
+    - matriz_covariancia: array com a matriz de covariância (ou modelo fatorial)
+    - qtd_iteracoes_max: quantidade máxima de iterações
+    - tolerancia: a otimização para quando nenhum peso muda mais que este valor
+    - pesos_iniciais: carteira inicial (None começa com pesos iguais)
+
+    Returns:
+    - pesos: array (qtd_ativos,) com a carteira otimizada
+    - qtd_iteracoes: quantidade de iterações executadas
+    - qtd_avaliacoes: quantidade de avaliações do objetivo (carteiras avaliadas),
+      incluindo as dos passos recusados na busca com retrocesso
+    """
+
+    qtd_ativos = medias.shape[0]
+    medias = np.asarray(medias, dtype=np.float64)
+
+    pesos = np.full(qtd_ativos, 1 / qtd_ativos) if pesos_iniciais is None \
+        else projetar_simplex(np.asarray(pesos_iniciais, dtype=np.float64))
+
+    valor, gradiente = objetivo_log_fitness(pesos, medias, matriz_covariancia)
+    qtd_avaliacoes = 1
+    passo = 1.0
+    iteracao = 0
+
+    for iteracao in range(1, qtd_iteracoes_max + 1):
+
+        # busca com retrocesso: aceita o passo quando o ganho supera o modelo quadrático
+        while True:
+            candidatos = projetar_simplex(pesos + passo * gradiente)
+            diferenca = candidatos - pesos
+            valor_candidatos, gradiente_candidatos = \
+                objetivo_log_fitness(candidatos, medias, matriz_covariancia)
+            qtd_avaliacoes += 1
+
+            if valor_candidatos >= valor + gradiente @ diferenca - \
+                    (diferenca @ diferenca) / (2 * passo) or passo < 1e-20:
+                break
+            passo /= 2
+
+        pesos, valor, gradiente = candidatos, valor_candidatos, gradiente_candidatos
+
+        if np.abs(diferenca).max() <= tolerancia:
+            break
+
+        passo *= 2
+
+    return pesos, iteracao, qtd_avaliacoes
+
+
+def limitante_autovalor(matriz_covariancia: np.ndarray) -> float:
+    """
+    Função que retorna um limitante superior do maior autovalor da matriz de
+    covariância, usado como constante de Lipschitz do gradiente. No modelo fatorial
+    o limitante é o maior autovalor de B'B (k×k) mais a maior variância idiossincrática.
+
+    Args:
+    - matriz_covariancia: array com a matriz de covariância (ou modelo fatorial)
+
+    Returns:
+    - float: limitante superior do maior autovalor
+    """
+
+    if isinstance(matriz_covariancia, CovarianciaFatorial):
+        cargas = matriz_covariancia.cargas
+        return float(np.linalg.eigvalsh(cargas.T @ cargas)[-1] +
+                     matriz_covariancia.variancias_especificas.max())
+
+    return float(np.linalg.eigvalsh(matriz_covariancia)[-1])
+
+
+def otimizar_fronteira(medias: np.ndarray, matriz_covariancia: np.ndarray,
+                       aversoes_risco: np.ndarray, qtd_iteracoes_max: int = 5000,
+                       tolerancia: float = 1e-10) -> tuple[np.ndarray, int]:
+    """
+    Função que calcula, de uma só vez, as carteiras da fronteira eficiente: para
+    cada aversão ao risco λ, maximiza w·μ - λ w'Σw no simplex. Todas as carteiras
+    andam juntas em um único array (qtd_pontos, qtd_ativos), com gradiente projetado
+    acelerado (FISTA) e passo 1 / (2 λ autovalor_max) de cada ponto.
+
+    Args:
+    - medias: array com as médias dos retornos dos ativos
+    - matriz_covariancia: array com a matriz de covariância (ou modelo fatorial)
+    - aversoes_risco: array (qtd_pontos,) com as aversões ao risco (positivas)
+    - qtd_iteracoes_max: quantidade máxima de iterações
+    - tolerancia: a otimização para quando nenhum peso de nenhum ponto muda mais que
+      este valor
+
+    Returns:
+    - pesos: array (qtd_pontos, qtd_ativos) com as carteiras da fronteira
+    - qtd_iteracoes: quantidade de iterações executadas
+    """
+
+    aversoes_risco = np.asarray(aversoes_risco, dtype=np.float64)
+
+    if np.any(aversoes_risco <= 0):
+        raise ValueError("As aversões ao risco devem ser positivas.")
+
+    medias = np.asarray(medias, dtype=np.float64)
+    qtd_ativos = medias.shape[0]
+
+    passos = 1 / (2 * aversoes_risco * limitante_autovalor(matriz_covariancia))
+    passos = passos[:, np.newaxis]
+    aversoes_risco = aversoes_risco[:, np.newaxis]
+
+    pesos = np.full((aversoes_risco.shape[0], qtd_ativos), 1 / qtd_ativos)
+    extrapolados = pesos.copy()
+    momento = 1.0
+    iteracao = 0
+
+    for iteracao in range(1, qtd_iteracoes_max + 1):
+
+        gradientes = medias - 2 * aversoes_risco * \
+            ces_produtos_covariancia(extrapolados, matriz_covariancia)
+        pesos_novos = projetar_simplex(extrapolados + passos * gradientes)
+
+        if np.abs(pesos_novos - pesos).max() <= tolerancia:
+            pesos = pesos_novos
+            break
+
+        momento_novo = (1 + np.sqrt(1 + 4 * momento ** 2)) / 2
+        extrapolados = pesos_novos + ((momento - 1) / momento_novo) * (pesos_novos - pesos)
+        pesos, momento = pesos_novos, momento_novo
+
+    return pesos, iteracao
@@ -0,0 +1,148 @@
+import numpy as np
+from ces.ces_incremental import ces_produtos_covariancia, ces_riscos_transferencia
+from otimizacao.gradiente import projetar_simplex
+
+
+def sortear_transferencias(pesos: np.ndarray, tamanho_passo: float,
+                           gerador: np.random.Generator) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Função que sorteia um movimento para cada cadeia: uma fração do peso de um ativo
+    de origem (sorteado proporcionalmente ao peso, então sempre tem peso) passa para
+    um ativo de destino diferente (sorteado uniformemente). A fração segue uma
+    exponencial de média 'tamanho_passo', limitada a 1; a fração 1 zera a origem, o
+    que permite ao recozimento descartar ativos.
+
+    Args:
+    - pesos: array (qtd_cadeias, qtd_ativos) com as carteiras atuais
+    - tamanho_passo: fração média do peso da origem transferida
+    - gerador: gerador de números aleatórios (np.random.Generator)
+
+    Returns:
+    - genes_sorteados: array (qtd_cadeias, 2) com o ativo de destino e o de origem
+    - deltas: array (qtd_cadeias,) com o peso transferido
+    """
+
+    qtd_cadeias, qtd_ativos = pesos.shape
+    linhas = np.arange(qtd_cadeias)
+
+    # roleta sobre os pesos de cada cadeia para a origem
+    acumulados = np.cumsum(pesos, axis=1)
+    sorteios = gerador.random(qtd_cadeias) * acumulados[:, -1]
+    origens = np.minimum((acumulados <= sorteios[:, np.newaxis]).sum(axis=1), qtd_ativos - 1)
+
+    # o deslocamento entre 1 e qtd_ativos - 1 garante que o destino seja outro ativo
+    destinos = (origens + gerador.integers(1, qtd_ativos, size=qtd_cadeias)) % qtd_ativos
+
+    fracoes = np.minimum(gerador.exponential(tamanho_passo, size=qtd_cadeias), 1.0)
+    deltas = fracoes * pesos[linhas, origens]
+
+    return np.stack([destinos, origens], axis=1), deltas
+
+
+def otimizar_recozimento(medias: np.ndarray, matriz_covariancia: np.ndarray,
+                         qtd_avaliacoes_max: int = 20000, qtd_cadeias: int = 4,
+                         temperatura_inicial: float = None, razao_temperaturas: float = 1e-4,
+                         tamanho_passo: float = 0.3, intervalo_recalculo: int = 500,
+                         pesos_iniciais: np.ndarray = None,
+                         seed=None) -> tuple[np.ndarray, int]:
+    """
+    Função que maximiza o fitness do Moneta por recozimento simulado (simulated
+    annealing). As carteiras andam sobre o próprio simplex: cada movimento transfere
+    peso de um ativo para outro (ver sortear_transferencias), então a soma dos pesos
+    continua 1 e nenhum peso fica negativo. O risco e o produto Σw são atualizados
+    em O(n) (ces_riscos_transferencia), como no risco incremental do AG. Um
+    movimento que muda o logaritmo do fitness em Δ é aceito com probabilidade
+    min(1, exp(Δ / T)), e a temperatura T cai geometricamente da inicial até
+    'razao_temperaturas' vezes ela. 'qtd_cadeias' cadeias independentes andam
+    juntas em um único array, o que divide o custo do laço Python entre elas; com
+    o mesmo total de avaliações, menos cadeias (mais longas) chegam mais perto do ótimo.
+
+    Args:
+    - medias: array com as médias dos retornos dos ativos
+    - matriz_covariancia: array com a matriz de covariância (ou modelo fatorial)
+    - qtd_avaliacoes_max: quantidade máxima de carteiras avaliadas (somando as cadeias)
+    - qtd_cadeias: quantidade de cadeias independentes
+    - temperatura_inicial: temperatura do início (None calibra a temperatura para que
+      metade dos movimentos de piora mediana de um primeiro lote seja aceita)
+    - razao_temperaturas: temperatura final / temperatura inicial
+    - tamanho_passo: fração média do peso da origem transferida em cada movimento
+    - intervalo_recalculo: a cada quantos passos o risco e Σw são recalculados do zero,
+      para que os erros de arredondamento das atualizações não se acumulem
+    - pesos_iniciais: carteira de partida de todas as cadeias (None começa com pesos iguais)
+    - seed: semente (int, np.random.SeedSequence ou np.random.Generator)
+
+    Returns:
+    - pesos: array (qtd_ativos,) com a melhor carteira encontrada
+    - qtd_avaliacoes: quantidade de carteiras avaliadas
+    """
+
+    gerador = np.random.default_rng(seed)
+    medias = np.asarray(medias, dtype=np.float64)
+    qtd_ativos = medias.shape[0]
+
+    if qtd_ativos < 2:
+        raise ValueError("O recozimento simulado exige pelo menos 2 ativos.")
+
+    # todas as cadeias partem da mesma carteira
+    carteira_inicial = np.full(qtd_ativos, 1 / qtd_ativos) if pesos_iniciais is None \
+        else projetar_simplex(np.asarray(pesos_iniciais, dtype=np.float64))
+    pesos = np.tile(carteira_inicial, (qtd_cadeias, 1))
+    produtos = ces_produtos_covariancia(pesos, matriz_covariancia)
+    riscos = np.abs((pesos * produtos).sum(axis=1))
+    expoentes = pesos @ medias
+    log_fitnesses = np.log(2) * expoentes - np.log(riscos)
+    qtd_avaliacoes = qtd_cadeias
+
+    melhores_pesos = pesos[0].copy()
+    melhor_log_fitness = log_fitnesses[0]
+
+    qtd_passos = max((qtd_avaliacoes_max - qtd_avaliacoes) // qtd_cadeias, 0)
+    temperatura = temperatura_inicial
+    fator_resfriamento = razao_temperaturas ** (1 / max(qtd_passos - 1, 1))
+
+    for passo in range(qtd_passos):
+
+        genes_sorteados, deltas = sortear_transferencias(pesos, tamanho_passo, gerador)
+        destinos, origens = genes_sorteados[:, 0], genes_sorteados[:, 1]
+
+        riscos_candidatos, produtos_candidatos = \
+            ces_riscos_transferencia(riscos, produtos, matriz_covariancia,
+                                     genes_sorteados, deltas)
+        expoentes_candidatos = expoentes + deltas * (medias[destinos] - medias[origens])
+        variacoes = np.log(2) * expoentes_candidatos - np.log(riscos_candidatos) - \
+            log_fitnesses
+        qtd_avaliacoes += qtd_cadeias
+
+        if temperatura is None:
+            # a piora mediana do primeiro lote é aceita com probabilidade 1/2
+            pioras = -variacoes[variacoes < 0]
+            temperatura = np.median(pioras) / np.log(2) if pioras.size else 1.0
+            temperatura = max(temperatura, np.finfo(np.float64).tiny)
+
+        with np.errstate(over="ignore"):
+            aceitos = gerador.random(qtd_cadeias) < np.exp(variacoes / temperatura)
+
+        linhas = np.flatnonzero(aceitos)
+        pesos[linhas, destinos[linhas]] += deltas[linhas]
+        pesos[linhas, origens[linhas]] -= deltas[linhas]
+        # a origem esvaziada por inteiro volta a zero exatamente
+        pesos[linhas, origens[linhas]] = np.maximum(pesos[linhas, origens[linhas]], 0.0)
+        produtos[linhas] = produtos_candidatos[linhas]
+        riscos[linhas] = riscos_candidatos[linhas]
+        expoentes[linhas] = expoentes_candidatos[linhas]
+        log_fitnesses[linhas] += variacoes[linhas]
+
+        if (passo + 1) % intervalo_recalculo == 0:
+            produtos = ces_produtos_covariancia(pesos, matriz_covariancia)
+            riscos = np.abs((pesos * produtos).sum(axis=1))
+            expoentes = pesos @ medias
+            log_fitnesses = np.log(2) * expoentes - np.log(riscos)
+
+        melhor_cadeia = np.argmax(log_fitnesses)
+        if log_fitnesses[melhor_cadeia] > melhor_log_fitness:
+            melhor_log_fitness = log_fitnesses[melhor_cadeia]
+            melhores_pesos = pesos[melhor_cadeia].copy()
+
+        temperatura *= fator_resfriamento
+
+    return melhores_pesos, qtd_avaliacoes
@@ -0,0 +1,111 @@
+import numpy as np
+import pytest
+from otimizacao.gradiente import (projetar_simplex, objetivo_log_fitness,
+                                  otimizar_gradiente, otimizar_fronteira, RISCO_MINIMO)
+from ces.covariancia import estimar_covariancia_amostral, estimar_covariancia_fatorial
+
+
+@pytest.mark.parametrize("ponto, projecao", [
+    ([0.3, 0.7], [0.3, 0.7]),
+    ([2.0, 0.0], [1.0, 0.0]),
+    ([1.0, 1.0, 1.0], [1 / 3, 1 / 3, 1 / 3]),
+    ([0.6, 0.6, -1.0], [0.5, 0.5, 0.0]),
+    ([1.2, 0.1, -0.3], [1.0, 0.0, 0.0]),
+    ([0.5, 0.3, 0.0, -2.0], [17 / 30, 11 / 30, 2 / 30, 0.0]),
+])
+def test_projetar_simplex_conhecidas(ponto, projecao):
+    """Projeções calculadas à mão, em uma linha e empilhadas em um bloco."""
+
+    np.testing.assert_allclose(projetar_simplex(np.array(ponto)), projecao, atol=1e-15)
+    np.testing.assert_allclose(projetar_simplex(np.array([ponto, ponto])),
+                               [projecao, projecao], atol=1e-15)
+
+
+def test_projetar_simplex_e_a_mais_proxima():
+    """A projeção fica no simplex e é mais próxima do ponto que outras carteiras."""
+
+    gerador = np.random.default_rng(0)
+    pontos = gerador.normal(size=(50, 6))
+    projecoes = projetar_simplex(pontos)
+
+    assert np.all(projecoes >= 0)
+    np.testing.assert_allclose(projecoes.sum(axis=1), 1.0)
+
+    carteiras = gerador.dirichlet(np.ones(6), size=200)
+    for ponto, projecao in zip(pontos, projecoes):
+        distancias = np.linalg.norm(carteiras - ponto, axis=1)
+        assert np.linalg.norm(projecao - ponto) <= distancias.min() + 1e-12
+
+
+def test_gradiente_solucao_conhecida():
+    """Sem retornos, o máximo é a carteira de variância mínima: pesos ∝ 1/σ²."""
+
+    variancias = np.array([1.0, 2.0, 4.0, 8.0]) * 1e-4
+
+    pesos, _, _ = otimizar_gradiente(np.zeros(4), np.diag(variancias), tolerancia=1e-14)
+
+    esperados = (1 / variancias) / (1 / variancias).sum()
+    np.testing.assert_allclose(pesos, esperados, atol=1e-8)
+
+
+@pytest.mark.parametrize("modelo_covariancia", ["amostral", "fatorial"])
+def test_gradiente_chega_a_ponto_kkt(gerar_variacoes, modelo_covariancia):
+    """
+    No ponto final, o gradiente é igual (e máximo) nos ativos da carteira e não é maior
+    fora dela: as condições de KKT do simplex.
+    """
+
+    variacoes = gerar_variacoes(qtd_acoes=10)
+    medias = variacoes.mean(axis=0).to_numpy()
+    matriz_covariancia = estimar_covariancia_fatorial(variacoes, 3) \
+        if modelo_covariancia == "fatorial" else estimar_covariancia_amostral(variacoes)
+
+    pesos, qtd_iteracoes, qtd_avaliacoes = otimizar_gradiente(medias, matriz_covariancia,
+                                                              qtd_iteracoes_max=5000,
+                                                              tolerancia=1e-13)
+    _, gradiente = objetivo_log_fitness(pesos, medias, matriz_covariancia)
+
+    assert qtd_iteracoes < 5000 and qtd_avaliacoes > qtd_iteracoes
+    np.testing.assert_allclose(pesos.sum(), 1.0)
+    na_carteira = pesos > 1e-8
+    assert na_carteira.sum() >= 2
+    maximo = gradiente.max()
+    np.testing.assert_allclose(gradiente[na_carteira], maximo, atol=1e-5)
+    assert np.all(gradiente[~na_carteira] <= maximo + 1e-5)
+
+
+def test_objetivo_com_risco_zero_e_finito():
+    """Uma carteira sem risco (ativo de variância zero) tem objetivo e gradiente finitos."""
+
+    medias = np.array([0.001, 0.002, 0.0])
+    matriz_covariancia = np.diag([1e-4, 2e-4, 0.0])
+
+    valor, gradiente = objetivo_log_fitness(np.array([0.0, 0.0, 1.0]), medias,
+                                            matriz_covariancia)
+
+    assert valor == pytest.approx(-np.log(RISCO_MINIMO))
+    assert np.all(np.isfinite(gradiente))
+
+    pesos, _, _ = otimizar_gradiente(medias, matriz_covariancia)
+    assert np.all(np.isfinite(pesos))
+    np.testing.assert_allclose(pesos.sum(), 1.0)
+
+
+def test_fronteira_risco_cresce_com_menor_aversao(gerar_variacoes):
+    """Com menos aversão ao risco, as carteiras da fronteira têm mais risco e mais retorno."""
+
+    variacoes = gerar_variacoes(qtd_acoes=10)
+    medias = variacoes.mean(axis=0).to_numpy()
+    matriz_covariancia = estimar_covariancia_amostral(variacoes)
+    aversoes_risco = np.geomspace(1e3, 1e-1, 9)
+
+    pesos, _ = otimizar_fronteira(medias, matriz_covariancia, aversoes_risco)
+
+    assert np.all(pesos >= 0)
+    np.testing.assert_allclose(pesos.sum(axis=1), 1.0)
+
+    riscos = np.einsum("pi,ij,pj->p", pesos, matriz_covariancia, pesos)
+    retornos = pesos @ medias
+    assert np.all(np.diff(riscos) >= -1e-12)
+    assert np.all(np.diff(retornos) >= -1e-12)
+    assert riscos[-1] > riscos[0]
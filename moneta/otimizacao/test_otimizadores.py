@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+import otimizacao.cmaes as cmaes
+import otimizacao.recozimento as recozimento
+from ces.ces import ces_retornos, ces_riscos, ces_fitnesses
+from ces.covariancia import estimar_covariancia_amostral
+
+# função de cada motor que avalia as carteiras candidatas, usada para contá-las
+AVALIACOES = {"cmaes": (cmaes, "ces_riscos"),
+              "recozimento": (recozimento, "ces_riscos_transferencia")}
+
+
+@pytest.fixture
+def problema(gerar_variacoes):
+    variacoes = gerar_variacoes(qtd_acoes=10)
+    return variacoes.mean(axis=0).to_numpy(), estimar_covariancia_amostral(variacoes)
+
+
+def otimizar(motor: str, medias, matriz_covariancia, **parametros):
+    if motor == "cmaes":
+        return cmaes.otimizar_cmaes(medias, matriz_covariancia, **parametros)
+    return recozimento.otimizar_recozimento(medias, matriz_covariancia, **parametros)
+
+
+@pytest.mark.parametrize("motor, parametros_motor", [
+    ("cmaes", {"separavel": False}), ("cmaes", {"separavel": True}), ("recozimento", {})],
+    ids=["cmaes", "sep-cmaes", "recozimento"])
+def test_carteira_valida_e_reprodutivel(problema, motor, parametros_motor):
+    """Pesos não negativos somando 1, a mesma carteira para a mesma semente."""
+
+    medias, matriz_covariancia = problema
+    parametros = {"qtd_avaliacoes_max": 3000, "seed": 5, **parametros_motor}
+
+    pesos, qtd_avaliacoes = otimizar(motor, medias, matriz_covariancia, **parametros)
+    pesos_repetidos, _ = otimizar(motor, medias, matriz_covariancia, **parametros)
+    pesos_outra_semente, _ = otimizar(motor, medias, matriz_covariancia,
+                                      **{**parametros, "seed": 6})
+
+    assert pesos.shape == medias.shape
+    assert np.all(pesos >= 0)
+    np.testing.assert_allclose(pesos.sum(), 1.0)
+    np.testing.assert_array_equal(pesos, pesos_repetidos)
+    assert not np.array_equal(pesos, pesos_outra_semente)
+
+    # a busca melhora a carteira de pesos iguais, o ponto de partida
+    carteiras = np.vstack([pesos, np.full_like(pesos, 1 / pesos.shape[0])])
+    retornos = ces_retornos(carteiras=carteiras, medias=medias)
+    fitnesses = ces_fitnesses(retornos, ces_riscos(carteiras=carteiras,
+                                                   matriz_covariancia=matriz_covariancia))
+    assert fitnesses[0] > fitnesses[1]
+
+
+@pytest.mark.parametrize("qtd_avaliacoes_max", [10, 500, 1003])
+@pytest.mark.parametrize("motor", ["cmaes", "recozimento"])
+def test_respeita_qtd_avaliacoes_max(problema, monkeypatch, motor, qtd_avaliacoes_max):
+    """As carteiras avaliadas, contadas na função de avaliação, não passam do limite."""
+
+    medias, matriz_covariancia = problema
+    modulo, nome = AVALIACOES[motor]
+    avaliar = getattr(modulo, nome)
+    contagem = []
+
+    def avaliar_contando(*args, **kwargs):
+        resultado = avaliar(*args, **kwargs)
+        contagem.append(np.shape(resultado[0] if motor == "recozimento" else resultado)[0])
+        return resultado
+
+    monkeypatch.setattr(modulo, nome, avaliar_contando)
+
+    _, qtd_avaliacoes = otimizar(motor, medias, matriz_covariancia,
+                                 qtd_avaliacoes_max=qtd_avaliacoes_max, seed=0)
+
+    # o recozimento avalia também a carteira de partida de cada uma das 4 cadeias
+    qtd_avaliadas = sum(contagem) + (4 if motor == "recozimento" else 0)
+    assert qtd_avaliadas == qtd_avaliacoes
+    assert qtd_avaliacoes <= qtd_avaliacoes_max
@@ -5,7 +5,7 @@ import pandas as pd
 import plotly.graph_objects as go
 from utilidades.performance_tracker import PerformanceTracker
 
-def pagina_backtestes(simbolos, paises, intervalos):
+def pagina_backtestes(simbolos, paises, intervalos, provedor=None):
 
     # cria o título da página
     st.title(body="Modelo Backtestes")
@@ -103,6 +103,67 @@ def pagina_backtestes(simbolos, paises, intervalos):
                                     value=5,
                                     max_value=100,
                                     step=1)
+    st.sidebar.divider()
+    # ---------------------------------------------------
+
+    # cria um widget 'slider' para selecionar a quantidade de clusters de ações
+    # correlacionadas: em cada rodada, apenas uma ação representante de cada cluster
+    # segue para o modelo
+    qtd_clusters = st.sidebar.slider(
+        label="Selecione a quantidade de clusters de ações correlacionadas (0 = sem filtro)",
+        min_value=0,
+        value=0,
+        max_value=50,
+        step=1
+    )
+    criterios_cluster = {"Maior média": "media", "Maior Sharpe": "sharpe",
+                         "Menor volatilidade": "volatilidade"}
+    criterio_cluster = "Maior média"
+    if qtd_clusters > 0:
+        criterio_cluster = st.sidebar.selectbox(label="Selecione o critério do representante",
+                                                options=list(criterios_cluster.keys()))
+    st.sidebar.divider()
+    # ---------------------------------------------------
+
+    # cria um widget 'selectbox' para o método de otimização da carteira
+    metodos = {"Algoritmo genético": "ag",
+               "Gradiente projetado": "gradiente",
+               "Híbrido (gradiente + AG)": "hibrido",
+               "CMA-ES": "cmaes",
+               "Recozimento simulado": "recozimento"}
+    metodo = st.sidebar.selectbox(label="Selecione o método de otimização",
+                                  options=list(metodos.keys()))
+    st.sidebar.divider()
+    # ---------------------------------------------------
+
+    # cria um widget 'selectbox' para o modelo da matriz de covariância: a amostral
+    # ou a fatorial (PCA), mais rápida para muitas ações
+    modelos_covariancia = {"Amostral": "amostral", "Fatorial (PCA)": "fatorial"}
+    modelo_covariancia = st.sidebar.selectbox(label="Selecione o modelo de covariância",
+                                              options=list(modelos_covariancia.keys()))
+    qtd_fatores = 5
+    if modelos_covariancia[modelo_covariancia] == "fatorial":
+        qtd_fatores = st.sidebar.slider(label="Selecione a quantidade de fatores",
+                                        min_value=1,
+                                        max_value=20,
+                                        value=5)
+    st.sidebar.divider()
+    # ---------------------------------------------------
+
+    # cria um widget 'checkbox' para que cada janela do backteste parta da
+    # população final da janela anterior
+    partida_quente = st.sidebar.checkbox(label="Partir da população da janela anterior")
+    st.sidebar.divider()
+    # ---------------------------------------------------
+
+    # cria um widget 'number_input' para a semente aleatória (0 = sem semente),
+    # para que uma mesma configuração possa ser reproduzida
+    semente = st.sidebar.number_input(label="Semente aleatória (0 = sem semente)",
+                                      min_value=0,
+                                      value=0,
+                                      step=1)
+    st.sidebar.divider()
+    # ---------------------------------------------------
 
     # cria um botão para rodar os backtestes
     botao = st.sidebar.button(label="Rodar Backtestes")
@@ -123,7 +184,15 @@ def pagina_backtestes(simbolos, paises, intervalos):
                 cotacoes_segurar=qtd_cotacoes_segurar,
                 maiores_medias=qtd_maiores_medias,
                 qtd_bebados=qtd_bebados,
-                simbolo_index=simbolo_index
+                simbolo_index=simbolo_index,
+                seed=int(semente) or None,
+                parametros_ag={"modelo_covariancia": modelos_covariancia[modelo_covariancia],
+                               "qtd_fatores": qtd_fatores},
+                metodo=metodos[metodo],
+                qtd_clusters=qtd_clusters,
+                criterio_cluster=criterios_cluster[criterio_cluster],
+                partida_quente=partida_quente,
+                provedor=provedor
             )
         
         # resgada os patrimônios acumulados do moneta, do índice e dos bebados
@@ -1,11 +1,13 @@
 import streamlit as st
 from cotacoes.cotacoes import busca_cotacoes, formata_cotacoes
-from modelo.moneta import moneta_ag
+from modelo.moneta import moneta_otimizar, moneta_fronteira
 from utilidades.gerais import gera_df_carteira, obter_data_vender
 import plotly.graph_objects as go
+import numpy as np
 from datetime import datetime
 
-def pagina_moneta(simbolos: dict, paises: dict, intervalos: dict) -> None:
+def pagina_moneta(simbolos: dict, paises: dict, intervalos: dict,
+                  provedor=None) -> None:
 
     """
     Página que contém a aplicação do modelo Moneta.
@@ -14,6 +16,7 @@ def pagina_moneta(simbolos: dict, paises: dict, intervalos: dict) -> None:
     simbolos (dict): Dicionário com os símbolos das ações de cada país.
     paises (dict): Dicionário com os países disponíveis.
     intervalos (dict): Dicionário com os intervalos disponíveis.
+    provedor (ProvedorCotacoes): fonte das cotações (None usa o yfinance).
 
     Returns:
     None
@@ -119,6 +122,70 @@ def pagina_moneta(simbolos: dict, paises: dict, intervalos: dict) -> None:
     st.sidebar.divider()
     # ---------------------------------------------------
 
+    # cria um widget 'slider' para selecionar a quantidade de clusters de ações
+    # correlacionadas: apenas uma ação representante de cada cluster segue para o modelo
+    qtd_clusters = st.sidebar.slider(
+        label="Selecione a quantidade de clusters de ações correlacionadas (0 = sem filtro)",
+        min_value=0,
+        value=0,
+        max_value=50,
+        step=1
+    )
+    criterios_cluster = {"Maior média": "media", "Maior Sharpe": "sharpe",
+                         "Menor volatilidade": "volatilidade"}
+    criterio_cluster = "Maior média"
+    if qtd_clusters > 0:
+        criterio_cluster = st.sidebar.selectbox(label="Selecione o critério do representante",
+                                                options=list(criterios_cluster.keys()))
+    st.sidebar.divider()
+    # ---------------------------------------------------
+
+    # cria um widget 'selectbox' para o método de otimização da carteira
+    metodos = {"Algoritmo genético": "ag",
+               "Gradiente projetado": "gradiente",
+               "Híbrido (gradiente + AG)": "hibrido",
+               "CMA-ES": "cmaes",
+               "Recozimento simulado": "recozimento"}
+    metodo = st.sidebar.selectbox(label="Selecione o método de otimização",
+                                  options=list(metodos.keys()))
+    st.sidebar.divider()
+    # ---------------------------------------------------
+
+    # cria um widget 'selectbox' para o modelo da matriz de covariância: a amostral
+    # ou a fatorial (PCA), mais rápida para muitas ações
+    modelos_covariancia = {"Amostral": "amostral", "Fatorial (PCA)": "fatorial"}
+    modelo_covariancia = st.sidebar.selectbox(label="Selecione o modelo de covariância",
+                                              options=list(modelos_covariancia.keys()))
+    qtd_fatores = 5
+    if modelos_covariancia[modelo_covariancia] == "fatorial":
+        qtd_fatores = st.sidebar.slider(label="Selecione a quantidade de fatores",
+                                        min_value=1,
+                                        max_value=20,
+                                        value=5)
+    st.sidebar.divider()
+    # ---------------------------------------------------
+
+    # cria um widget 'checkbox' para calcular e mostrar a fronteira eficiente
+    # das ações selecionadas junto com a carteira final
+    flag_fronteira = st.sidebar.checkbox(label="Mostrar fronteira eficiente")
+    st.sidebar.divider()
+    # ---------------------------------------------------
+
+    # cria um widget 'checkbox' para partir da população final da última execução
+    # (guardada na sessão), o que faz o modelo convergir com menos épocas
+    flag_partida_quente = st.sidebar.checkbox(label="Partir da população da última execução")
+    st.sidebar.divider()
+    # ---------------------------------------------------
+
+    # cria um widget 'number_input' para a semente aleatória (0 = sem semente),
+    # para que uma mesma configuração possa ser reproduzida
+    semente = st.sidebar.number_input(label="Semente aleatória (0 = sem semente)",
+                                      min_value=0,
+                                      value=0,
+                                      step=1)
+    st.sidebar.divider()
+    # ---------------------------------------------------
+
     # cria um botão para rodar o modelo
     botao = st.sidebar.button(label="Rodar Moneta")
 
@@ -128,7 +195,8 @@ def pagina_moneta(simbolos: dict, paises: dict, intervalos: dict) -> None:
         cotacoes = busca_cotacoes(simbolos=acoes_selecionadas,
                                   cotacoes_anteriores=qtd_cotacoes_anteriores,
                                   cotacoes_segurar=0,
-                                  intervalo=intervalos[intervalo])
+                                  intervalo=intervalos[intervalo],
+                                  provedor=provedor)
         
         # acima, o 'cotacoes_segurar' é 0, pois o modelo vai rodar com dados atuais
         # e não em um backtest
@@ -141,10 +209,34 @@ def pagina_moneta(simbolos: dict, paises: dict, intervalos: dict) -> None:
         print("Formatando as cotações das ações selecionadas para variações...")
         variacoes = formata_cotacoes(cotacoes=cotacoes,
                                      intervalo=intervalos[intervalo],
-                                     maiores_medias=qtd_maiores_medias)
+                                     maiores_medias=qtd_maiores_medias,
+                                     qtd_clusters=qtd_clusters,
+                                     criterio_cluster=criterios_cluster[criterio_cluster])
         
         print("Rodando o modelo Moneta com as variações formatadas...")
-        carteira_otima = moneta_ag(variacoes=variacoes)
+        # a população da última execução é alinhada às ações atuais pelo nome
+        populacao_anterior = st.session_state.get("populacao_moneta") \
+            if flag_partida_quente else None
+
+        carteira_otima, detalhes = \
+            moneta_otimizar(variacoes=variacoes, metodo=metodos[metodo],
+                            seed=int(semente) or None,
+                            modelo_covariancia=modelos_covariancia[modelo_covariancia],
+                            qtd_fatores=min(qtd_fatores, variacoes.shape[1],
+                                            len(variacoes) - 1),
+                            cromossomos_semente=populacao_anterior,
+                            retornar_populacao=True)
+
+        # guarda a população final para a próxima execução
+        st.session_state["populacao_moneta"] = detalhes["populacao"]
+
+        fronteira = None
+        if flag_fronteira:
+            print("Calculando a fronteira eficiente...")
+            fronteira = moneta_fronteira(variacoes=variacoes,
+                                         modelo_covariancia=modelos_covariancia[modelo_covariancia],
+                                         qtd_fatores=min(qtd_fatores, variacoes.shape[1],
+                                                         len(variacoes) - 1))
 
         print("Formatando a carteira ótima...")
         df_carteira = gera_df_carteira(carteira_final=carteira_otima,
@@ -206,5 +298,30 @@ def pagina_moneta(simbolos: dict, paises: dict, intervalos: dict) -> None:
         # mostra o gráfico de pizza na tela
         st.plotly_chart(fig)
 
+        if fronteira is not None:
+            # cria um gráfico de dispersão com a fronteira eficiente (desvio padrão x
+            # retorno médio por período) e marca a carteira final sobre ela
+            fig_fronteira = go.Figure()
+            fig_fronteira.add_trace(go.Scatter(x=fronteira["Riscos"] ** 0.5,
+                                               y=np.log2(fronteira["Retornos"]),
+                                               mode="lines+markers",
+                                               name="Fronteira eficiente"))
+            fig_fronteira.add_trace(go.Scatter(x=[carteira_otima["Riscos"] ** 0.5],
+                                               y=[np.log2(carteira_otima["Retornos"])],
+                                               mode="markers",
+                                               marker={"size": 14, "symbol": "star"},
+                                               name="Carteira final"))
+
+            # formata o layout do gráfico da fronteira eficiente
+            fig_fronteira.update_layout(title="Fronteira Eficiente",
+                                        title_font_size=30,
+                                        title_font_family="Ubuntu",
+                                        title_font_color="black",
+                                        xaxis_title="Risco (desvio padrão)",
+                                        yaxis_title=f"Retorno médio ({intervalo})")
+
+            # mostra o gráfico da fronteira eficiente na tela
+            st.plotly_chart(fig_fronteira)
+
         # cria um widget 'success' para mostrar que o modelo rodou com sucesso
         st.success(":tada: Modelo Moneta rodado com sucesso!")
@@ -0,0 +1,33 @@
+import pytest
+
+pytest.importorskip("streamlit")
+pytest.importorskip("plotly")
+
+from streamlit.testing.v1 import AppTest
+
+# a página roda com o mercado sintético, sem acessar a rede
+SCRIPT_PAGINA = """
+from paginas.moneta import pagina_moneta
+from simbolos import simbolos
+from cotacoes.mercado_sintetico import ProvedorSintetico
+
+pagina_moneta(simbolos, {"Brasil": "BR", "EUA": "US"}, {"Diário": "d", "Semanal": "w"},
+              provedor=ProvedorSintetico(prob_estreia=0, prob_lacunas=0, seed=0))
+"""
+
+
+@pytest.mark.parametrize("metodo", ["Algoritmo genético", "Gradiente projetado"])
+def test_pagina_moneta_otimiza_e_mostra_carteira(metodo):
+    """Rodar o Moneta pela página otimiza a carteira e mostra a tabela e a data de venda."""
+
+    app = AppTest.from_string(SCRIPT_PAGINA, default_timeout=60).run()
+    app.sidebar.selectbox[0].select(metodo)
+    # com a fronteira eficiente
+    app.sidebar.checkbox[1].check()
+    app.sidebar.button[0].click().run()
+
+    assert not app.exception
+    assert len(app.dataframe) == 1
+    assert app.warning[0].value.startswith(":date: Vender a carteira")
+    assert [metrica.label for metrica in app.metric] == ["Valor total investir",
+                                                         "Perc total carteira"]
@@ -2,6 +2,7 @@ from itertools import product
 from datetime import date
 import numpy as np
 from utilidades.performance_tracker import PerformanceTracker
+from utilidades.gerais import gerar_geradores_filhos
 from modelo.backtestes import moneta_backtestes
 from simbolos import simbolos
 import pandas as pd
@@ -23,13 +24,36 @@ colecao_intervalos = ["d"]
 qtd_bebados = 100
 
 
-def gera_campeonatos():
+def gera_campeonatos(seed=None, em_lote=False, offline=False, provedor=None,
+                     simbolos_acoes=None, simbolo_index=None, dtype=np.float64,
+                     parametros_ag=None):
     """
+    seed: semente dos campeonatos; cada combinação de parâmetros recebe uma
+    sequência filha independente (SeedSequence.spawn), então os campeonatos podem
+    ser distribuídos entre processos sem mudar os resultados
+    em_lote: se True, as carteiras de todas as janelas de cada campeonato saem de
+    um único moneta_ag_lote em vez de um moneta_ag por janela
+    offline: se True, as cotações vêm apenas do cache local, sem acessar a rede
+    provedor: fonte das cotações (ver cotacoes.provedores); None usa o yfinance
+    simbolos_acoes, simbolo_index: ações e índice dos campeonatos (None usa os do
+    país configurado). Com um ProvedorSintetico e simbolos_sinteticos(qtd), os
+    campeonatos rodam offline em mercados de qualquer tamanho
+    dtype: precisão das variações nos campeonatos. np.float32 é opcional: a busca em
+    grade só compara carteiras, e em float32 cada avaliação move metade dos bytes (e
+    cabem mais backtestes por máquina), mas os resultados deixam de ser os do float64
+    parametros_ag: parâmetros extras do AG em cada rodada (ver moneta_backtestes); None
+    executa todas as épocas. Como o AG roda milhares de vezes no treinamento, a parada
+    antecipada é opcional, por exemplo {"epocas_estagnacao": 10,
+    "tolerancia_melhoria": 1e-6} (no modo em lote, cada janela para sozinha)
+
     Esta função gera os campeonatos de Moneta para cada combinação de parâmetros
 
     Retorna um DataFrame com os resultados dos campeonatos
     """
 
+    simbolos_acoes = acoes_ids if simbolos_acoes is None else simbolos_acoes
+    simbolo_index = index_id if simbolo_index is None else simbolo_index
+
     # data para buscar os dados para rodar todos os campeonatos
     data_inicio_buscar_dados = \
         min(colecao_comecos) - pd.Timedelta(days=max(colecao_cotacoes_anteriores))
@@ -40,18 +64,26 @@ def gera_campeonatos():
     
     # buscando os dados para as ações
     df_cotacoes = busca_cotacoes(
-            simbolos=acoes_ids,
+            simbolos=simbolos_acoes,
             intervalo="d",
             data_inicio=data_inicio_buscar_dados,
-            data_fim=data_final_buscar_dados
+            data_fim=data_final_buscar_dados,
+            offline=offline,
+            provedor=provedor
         )
 
+    # qualquer ação que não tenha dados para todo o período será removida, como
+    # no rodar_backtestes (o moneta_backtestes não aceita cotações vazias)
+    df_cotacoes.dropna(axis=1, inplace=True)
+
     # buscando os dados para o índice
     series_cotacoes_index = busca_cotacoes(
-        simbolos=[index_id],
+        simbolos=[simbolo_index],
         intervalo="d",
         data_inicio=data_inicio_buscar_dados,
-        data_fim=data_final_buscar_dados
+        data_fim=data_final_buscar_dados,
+        offline=offline,
+        provedor=provedor
     )
 
     # igualando os dados das ações com os indices, pois
@@ -74,6 +106,9 @@ def gera_campeonatos():
         )
     )
 
+    # um gerador independente para cada combinação de parâmetros
+    geradores_campeonatos = gerar_geradores_filhos(seed, len(combinacoes))
+
     # começa a rodar os campeonatos para cada combinação de parâmetros
     resultados_campeonatos = []
     for i, combinacao in enumerate(combinacoes):
@@ -103,7 +138,11 @@ def gera_campeonatos():
             maiores_medias=maiores_medias,
             qtd_bebados=qtd_bebados,
             cotacoes=df_cotacoes,
-            cotacoes_index=series_cotacoes_index
+            cotacoes_index=series_cotacoes_index,
+            seed=geradores_campeonatos[i],
+            parametros_ag=parametros_ag,
+            dtype=dtype,
+            em_lote=em_lote
         )
 
         # encontra os quartis para o patrimônio acumulado da carteira Moneta
@@ -134,7 +173,7 @@ def gera_campeonatos():
             "intervalo": intervalo,
             "q1_moneta": quartis_moneta[0], "q2_moneta": quartis_moneta[1], "q3_moneta": quartis_moneta[2],
             "patrimonio_final_moneta": resultado_campeonato["acumulados"]["moneta"].iloc[-1],
-            f"patrimonio_final_{index_id}": resultado_campeonato["acumulados"]["index"].iloc[-1],
+            f"patrimonio_final_{simbolo_index}": resultado_campeonato["acumulados"]["index"].iloc[-1],
             "sharpe_moneta": sharpe_moneta,
             "beta_moneta": beta_moneta,
             "max_drawdown_moneta": -1 * max_drawdown_moneta
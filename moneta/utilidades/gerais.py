@@ -6,20 +6,43 @@ def gerar_carteira_aleatoria(acoes, seed=None):
 
     """
     acoes: lista de ações
-    seed: semente para geração de números aleatórios
+    seed: semente (int, np.random.SeedSequence ou np.random.Generator) para geração
+    de números aleatórios. O estado global do np.random não é usado nem alterado
     Esta função gera uma carteira aleatória com pesos aleatórios para cada ação
     """
 
-    if seed:
-        np.random.seed(seed)
+    gerador = np.random.default_rng(seed)
     
-    n_acoes = np.random.randint(1, len(acoes) + 1)
+    n_acoes = gerador.integers(1, len(acoes) + 1)
 
-    acoes_escolhidas = np.random.choice(acoes, size=n_acoes, replace=False)
-    sorteio = np.random.randint(1, 101, size=n_acoes)
+    acoes_escolhidas = gerador.choice(acoes, size=n_acoes, replace=False)
+    sorteio = gerador.integers(1, 101, size=n_acoes)
     percentuais = sorteio / sorteio.sum()
     return pd.Series(percentuais, index=acoes_escolhidas)
 
+def gerar_geradores_filhos(seed, qtd_filhos: int) -> list:
+
+    """
+    Função que deriva geradores de números aleatórios independentes a partir de
+    uma única semente, com SeedSequence.spawn. Cada filho pode ser entregue a uma
+    rodada (ou a um processo) diferente e o resultado continua reprodutível
+
+    Args:
+    seed (int | np.random.SeedSequence | np.random.Generator | None): semente de origem
+    qtd_filhos (int): quantidade de geradores filhos
+
+    Returns:
+    list: lista com 'qtd_filhos' np.random.Generator independentes
+    """
+
+    if isinstance(seed, np.random.Generator):
+        return seed.spawn(qtd_filhos)
+
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+
+    return [np.random.default_rng(filha) for filha in seed.spawn(qtd_filhos)]
+
 def obter_data_vender(data_compra: str, cotacoes_segurar: int, intervalo: str) -> str:
 
     """